@@ -1,12 +1,63 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
 
 from app.schemas.stats import GlobalStatsResponse
 from app.api.v1.routes_auth import get_current_admin
+from app.core import rate_limit
+from app.core.concurrency import run_blocking
+from app.db.session import get_db, get_pool_stats
+from app.services import (
+    article_cache_service,
+    article_store_service,
+    batch_service,
+    job_service,
+    llm_cache_service,
+    llm_router_service,
+    pipeline_service,
+    search_service,
+    stats_service,
+    token_service,
+    user_service,
+    wikipedia_service,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/stats", response_model=GlobalStatsResponse, summary="Get global platform statistics")
-async def get_global_stats(current_admin = Depends(get_current_admin)):
-    # TODO: implement stats_service to compute global metrics
-    raise NotImplementedError
+async def get_global_stats(current_admin = Depends(get_current_admin), db: Session = Depends(get_db)):
+    """Totals and daily series, read from incrementally maintained counters.
+
+    Served from memory for ``admin_stats_cache_ttl_seconds``.
+    """
+
+    return await run_blocking(stats_service.get_global_stats, db)
+
+
+@router.post("/stats/rebuild", summary="Recompute the statistics counters from the tables")
+async def rebuild_stats(current_admin = Depends(get_current_admin)) -> dict:
+    """Needed only after rows were written outside the ORM (bulk loads, manual SQL)."""
+
+    await run_blocking(stats_service.rebuild_counters)
+    return {"message": "Statistics counters rebuilt"}
+
+
+@router.get("/metrics", summary="Get runtime cache and coalescing metrics")
+async def get_runtime_metrics(current_admin = Depends(get_current_admin)) -> dict:
+    return {
+        "article_cache": article_cache_service.get_stats(),
+        "article_store": article_store_service.get_stats(),
+        "search_index": search_service.get_stats(),
+        "llm_cache": llm_cache_service.get_stats(),
+        "llm_tokens": token_service.get_stats(),
+        "llm_rate_limits": rate_limit.get_stats(),
+        "llm_routing": llm_router_service.get_stats(),
+        "coalescing": {
+            "wikipedia_fetch": wikipedia_service.get_fetch_stats(),
+            "pipeline": pipeline_service.get_coalescing_stats(),
+        },
+        "jobs": job_service.get_stats(),
+        "batch": batch_service.get_stats(),
+        "db_pool": get_pool_stats(),
+        "auth_principal_cache": user_service.get_principal_cache_stats(),
+    }
@@ -1,10 +1,14 @@
-from typing import List
+import os
 
-from fastapi import APIRouter, UploadFile, File, Depends
+from fastapi import APIRouter, UploadFile, File, Depends, Query, Request
+from sqlalchemy.orm import Session
 
+from app.schemas.batch import BatchSummaryRequest, BatchTranslationRequest
 from app.schemas.article import (
     ArticleIngestRequest,
     ArticleResponse,
+    ArticleSearchResponse,
+    ArticleSearchResult,
     SummaryRequest,
     SummaryResponse,
     TranslationRequest,
@@ -14,11 +18,21 @@ from app.schemas.article import (
     WikipediaTranslationRequest,
     WikipediaTranslationResponse,
 )
-from app.services import wikipedia_service, llm_groq_service, llm_gemini_service
-from app.db.session import SessionLocal
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+from app.core.sse import sse_response
+from app.services import (
+    article_service,
+    batch_service,
+    content_store_service,
+    pdf_service,
+    pipeline_service,
+    search_service,
+)
 from app.models.article import Article
 from fastapi import HTTPException, status
-from app.api.v1.routes_auth import get_current_active_user
+from fastapi.responses import StreamingResponse
+from app.api.v1.routes_auth import get_current_active_user, get_db
 
 router = APIRouter(prefix="/articles", tags=["articles"])
 
@@ -27,27 +41,155 @@ router = APIRouter(prefix="/articles", tags=["articles"])
 async def ingest_article_from_url(
     payload: ArticleIngestRequest,
     current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
-    # TODO: call wikipedia_service to fetch and preprocess article
-    raise NotImplementedError
+    """Fetch a Wikipedia article, store its cleaned sections and index it for search.
+
+    Ingesting an article again refreshes its content and reuses its row.
+    """
+
+    try:
+        article_data, text = await pipeline_service.load_article(str(payload.url))
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+    article_id = article_service.upsert_article(db, article_data["url"], article_data["title"], "INGEST")
+    db.commit()
+    article = _get_article_or_404(db, article_id, current_user)
+
+    await content_store_service.save(article.id, article_data)
+    await search_service.index_article(article.url, article.title, text, article.id)
+
+    return ArticleResponse(
+        id=article.id,
+        url=article.url,
+        title=article.title,
+        action=article.action,
+        createdat=article.createdat,
+        metadata={"section_count": len(article_data["sections"])},
+    )
 
 
 @router.post("/ingest/pdf", response_model=ArticleResponse, summary="Ingest article from PDF upload")
 async def ingest_article_from_pdf(
+    request: Request,
     file: UploadFile = File(...),
     current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
-    # TODO: call pdf_service to extract text and preprocess
-    raise NotImplementedError
+    """Extract a PDF into sections and register it as an article.
+
+    The upload is copied to a temp file in chunks (never fully in memory),
+    pages are extracted lazily (on a process pool for large documents) and
+    the sections are saved to the processed content store, so ``/summary``
+    and ``/translate`` can use them by article id. The article is private to
+    the uploader (and admins); uploading the same file again reuses it.
+    """
+
+    # Early reject only; spool_upload enforces the limit on the bytes received
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.pdf_max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="PDF is too large")
+
+    try:
+        path = await pdf_service.spool_upload(file)
+        try:
+            article_data = await run_blocking(pdf_service.extract_text_from_pdf, path)
+            digest = await run_blocking(pdf_service.file_digest, path)
+        finally:
+            os.unlink(path)
+    except pdf_service.PdfTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
+    except pdf_service.InvalidPdfError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if article_data["title"] == "Uploaded PDF" and file.filename:
+        article_data["title"] = os.path.splitext(os.path.basename(file.filename))[0]
+
+    article_id = article_service.upsert_article(
+        db,
+        f"{article_service.UPLOAD_URL_PREFIX}{file.filename or 'document.pdf'}",
+        article_data["title"],
+        "PDF",
+        key=article_service.upload_key(digest, current_user.id),
+        uploaded_by=current_user.id,
+    )
+    db.commit()
+    article = _get_article_or_404(db, article_id, current_user)
+
+    # Not added to the search index: that is shared by every user, uploads are not
+    await content_store_service.save(article.id, article_data)
+
+    return ArticleResponse(
+        id=article.id,
+        url=article.url,
+        title=article.title,
+        action=article.action,
+        createdat=article.createdat,
+        metadata={
+            "page_count": article_data["page_count"],
+            "section_count": len(article_data["sections"]),
+        },
+    )
+
+
+@router.get("/search", response_model=ArticleSearchResponse, summary="Full-text search over ingested articles")
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1),
+    offset: int = Query(0, ge=0),
+    current_user = Depends(get_current_active_user),
+) -> ArticleSearchResponse:
+    """Rank indexed articles by BM25 against ``q``, title matches first.
+
+    Every word of ``q`` must appear (the last one may be a prefix); each
+    result carries a snippet of the body around the matched terms. Only
+    Wikipedia articles are indexed, never PDF uploads.
+    """
+
+    results = await search_service.search(q, min(limit, settings.search_max_results), offset)
+    return ArticleSearchResponse(query=q, results=[ArticleSearchResult(**result) for result in results])
+
+
+def _get_article_or_404(db: Session, article_id: int, user) -> Article:
+    article: Article | None = db.query(Article).filter(Article.id == article_id).first()
+    # Another user's upload is reported like a missing article
+    if not article or not article_service.can_read(article, user):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+    return article
+
+
+def _check_readable(db: Session, article_ids, user) -> None:
+    unreadable = article_service.unreadable_ids(db, article_ids, user)
+    if unreadable:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Articles not found: {', '.join(map(str, unreadable))}",
+        )
 
 
 @router.post("/summary", response_model=SummaryResponse, summary="Generate summary via Groq")
 async def summarize_article(
     payload: SummaryRequest,
     current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
-    # TODO: call llm_groq_service to summarize
-    raise NotImplementedError
+    """Summarize a stored article, using its processed content when available."""
+
+    article = _get_article_or_404(db, payload.article_id, current_user)
+    article_id, title = article.id, article.title
+    # Don't hold a pooled connection for the duration of the LLM call.
+    db.close()
+
+    result = await pipeline_service.summarize_stored_article(
+        article_id, title, payload.length, refresh=payload.refresh
+    )
+
+    return SummaryResponse(
+        article_id=payload.article_id,
+        summary=result["summary"],
+        cached=result["cached"],
+    )
 
 
 @router.post(
@@ -61,67 +203,173 @@ async def summarize_wikipedia_article(payload: WikipediaSummaryRequest) -> Wikip
     This endpoint:
     - fetches the article sections from Wikipedia
     - concatenates and lightly cleans the text
-    - calls Groq LLM to generate a concise summary
+    - calls Groq LLM to generate a concise summary (or serves it from the
+      LLM result cache unless ``refresh`` is set)
     """
-    
-    article_data = wikipedia_service.fetch_article_sections(str(payload.url))
-    sections = article_data.get("sections", {}) or {}
-
-    full_text_parts: List[str] = []
-    for section_text in sections.values():
-        if section_text:
-            full_text_parts.append(section_text)
 
-    full_text = "\n\n".join(full_text_parts)
-    cleaned_text = wikipedia_service.clean_wikipedia_text(full_text)
-
-    llm_result = llm_groq_service.summarize_article(cleaned_text, length=payload.length)
+    result = await pipeline_service.summarize_url(str(payload.url), payload.length, refresh=payload.refresh)
 
     return WikipediaSummaryResponse(
         url=payload.url,
-        title=article_data.get("title", ""),
+        title=result["title"],
         length=payload.length,
-        summary=llm_result.get("summary", ""),
+        summary=result["summary"],
+        cached=result["cached"],
     )
 
 
+@router.post(
+    "/summary/url/stream",
+    summary="Stream article summary from Wikipedia URL via Groq (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_wikipedia_summary(payload: WikipediaSummaryRequest) -> StreamingResponse:
+    """Server-Sent Events variant of ``/summary/url``.
+
+    Emits ``delta`` events with summary tokens as Groq produces them, then a
+    ``done`` event carrying the same fields as ``WikipediaSummaryResponse``.
+    """
+
+    async def events():
+        async for event, data in pipeline_service.stream_summary_url(
+            str(payload.url), payload.length, refresh=payload.refresh
+        ):
+            if event == "done":
+                yield event, WikipediaSummaryResponse(
+                    url=payload.url,
+                    title=data["title"],
+                    length=payload.length,
+                    summary=data["summary"],
+                    cached=data["cached"],
+                ).model_dump(mode="json")
+            else:
+                yield event, {"text": data}
+
+    return sse_response(events())
+
+
+@router.post(
+    "/summary/batch",
+    summary="Summarize many articles at once, streaming results as they complete (SSE)",
+    response_class=StreamingResponse,
+)
+async def summarize_article_batch(
+    payload: BatchSummaryRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Batch variant of ``/summary/url`` (``urls``) and ``/summary`` (``article_ids``).
+
+    Articles are fetched concurrently and summarized under the shared batch
+    budget. Emits an ``item`` event per article as it completes, holding the
+    single-item response or that item's error, then a ``done`` event with
+    counts.
+    """
+
+    _check_readable(db, payload.article_ids, current_user)
+    db.close()
+
+    items = batch_service.article_items(
+        payload.urls, payload.article_ids, "summary_url", "summary", length=payload.length, refresh=payload.refresh
+    )
+    return sse_response(batch_service.stream_batch(items))
+
+
 @router.post("/translate", response_model=TranslationResponse, summary="Translate article via Gemini")
-async def translate_article(payload: TranslationRequest):
-    """Translate an article referenced in the DB using its Wikipedia URL.
+async def translate_article(
+    payload: TranslationRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Translate an article referenced in the DB.
 
-    For now we ignore processed_content_path and re-fetch the article
-    directly from Wikipedia, so this works with the seeded data even
-    if no local processed files exist.
+    Uses the processed content saved at ingest time (e.g. PDF uploads);
+    otherwise re-fetches the article from Wikipedia by its stored title,
+    so this works with the seeded data even if no local processed files
+    exist.
     """
 
-    db = SessionLocal()
-    try:
-        article: Article | None = db.query(Article).filter(Article.id == payload.article_id).first()
-        if not article:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+    title = _get_article_or_404(db, payload.article_id, current_user).title
+    # Don't hold a pooled connection for the duration of the LLM call.
+    db.close()
 
-        # Fetch and aggregate article text from Wikipedia using the stored title
-        # (avoids URL parsing issues like malformed slugs)
-        article_data = wikipedia_service.fetch_article_sections_by_title(article.title)
-        sections = article_data.get("sections", {}) or {}
+    # Fetch by stored title (avoids URL parsing issues like malformed slugs)
+    result = await pipeline_service.translate_stored_article(
+        payload.article_id, title, payload.target_language, refresh=payload.refresh
+    )
 
-        full_text_parts: List[str] = []
-        for section_text in sections.values():
-            if section_text:
-                full_text_parts.append(section_text)
+    return TranslationResponse(
+        article_id=payload.article_id,
+        target_language=payload.target_language,
+        translated_text=result["translated_text"],
+        cached=result["cached"],
+    )
 
-        full_text = "\n\n".join(full_text_parts)
-        cleaned_text = wikipedia_service.clean_wikipedia_text(full_text)
 
-        translated = llm_gemini_service.translate_content(cleaned_text, payload.target_language)
+@router.post(
+    "/translate/stream",
+    summary="Stream translation of a stored article via Gemini (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_article_translation(
+    payload: TranslationRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Server-Sent Events variant of ``/translate``.
 
-        return TranslationResponse(
-            article_id=payload.article_id,
-            target_language=payload.target_language,
-            translated_text=translated,
-        )
-    finally:
-        db.close()
+    Emits ``delta`` events with translated text as Gemini produces it, then a
+    ``done`` event carrying the same fields as ``TranslationResponse``.
+    """
+
+    title = _get_article_or_404(db, payload.article_id, current_user).title
+    # The stream can run for a long time; release the connection first.
+    db.close()
+
+    async def events():
+        async for event, data in pipeline_service.stream_translation_stored(
+            payload.article_id, title, payload.target_language, refresh=payload.refresh
+        ):
+            if event == "done":
+                yield event, TranslationResponse(
+                    article_id=payload.article_id,
+                    target_language=payload.target_language,
+                    translated_text=data["translated_text"],
+                    cached=data["cached"],
+                ).model_dump(mode="json")
+            else:
+                yield event, {"text": data}
+
+    return sse_response(events())
+
+
+@router.post(
+    "/translate/batch",
+    summary="Translate many articles at once, streaming results as they complete (SSE)",
+    response_class=StreamingResponse,
+)
+async def translate_article_batch(
+    payload: BatchTranslationRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Batch variant of ``/translate/url`` (``urls``) and ``/translate`` (``article_ids``).
+
+    Emits ``item`` and ``done`` events like ``/summary/batch``.
+    """
+
+    _check_readable(db, payload.article_ids, current_user)
+    db.close()
+
+    items = batch_service.article_items(
+        payload.urls,
+        payload.article_ids,
+        "translation_url",
+        "translation",
+        target_language=payload.target_language,
+        refresh=payload.refresh,
+    )
+    return sse_response(batch_service.stream_batch(items))
 
 
 @router.post(
@@ -138,28 +386,51 @@ async def translate_wikipedia_article(
     This endpoint:
     - fetches the article sections from Wikipedia via URL
     - concatenates and cleans the text
-    - calls Gemini to translate into the requested language
+    - calls Gemini to translate into the requested language (or serves it
+      from the LLM result cache unless ``refresh`` is set)
     """
 
-    article_data = wikipedia_service.fetch_article_sections(str(payload.url))
-    sections = article_data.get("sections", {}) or {}
-
-    full_text_parts: List[str] = []
-    for section_text in sections.values():
-        if section_text:
-            full_text_parts.append(section_text)
-
-    full_text = "\n\n".join(full_text_parts)
-    cleaned_text = wikipedia_service.clean_wikipedia_text(full_text)
-
-    translated = llm_gemini_service.translate_content(cleaned_text, payload.target_language)
+    result = await pipeline_service.translate_url(
+        str(payload.url), payload.target_language, refresh=payload.refresh
+    )
 
     return WikipediaTranslationResponse(
         url=payload.url,
-        title=article_data.get("title", ""),
+        title=result["title"],
         target_language=payload.target_language,
-        translated_text=translated,
+        translated_text=result["translated_text"],
+        cached=result["cached"],
     )
 
 
+@router.post(
+    "/translate/url/stream",
+    summary="Stream translation of a Wikipedia article via Gemini (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_wikipedia_translation(
+    payload: WikipediaTranslationRequest,
+    current_user = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Server-Sent Events variant of ``/translate/url``.
+
+    Emits ``delta`` events with translated text as Gemini produces it, then a
+    ``done`` event carrying the same fields as ``WikipediaTranslationResponse``.
+    """
 
+    async def events():
+        async for event, data in pipeline_service.stream_translation_url(
+            str(payload.url), payload.target_language, refresh=payload.refresh
+        ):
+            if event == "done":
+                yield event, WikipediaTranslationResponse(
+                    url=payload.url,
+                    title=data["title"],
+                    target_language=payload.target_language,
+                    translated_text=data["translated_text"],
+                    cached=data["cached"],
+                ).model_dump(mode="json")
+            else:
+                yield event, {"text": data}
+
+    return sse_response(events())
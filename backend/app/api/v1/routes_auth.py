@@ -7,11 +7,11 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.security import create_access_token
-from app.db.session import SessionLocal
+from app.db.session import get_db
 from app.models.user import Role, User
 from app.schemas.auth import AuthenticatedUser, TokenPayload
 from app.schemas.user import UserCreate, UserRead
-from app.services.user_service import authenticate_user, create_user, get_user_by_username
+from app.services.user_service import Principal, authenticate_user, create_user, get_principal, get_user_by_username
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -19,14 +19,6 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def _create_token_for_user(user: User) -> str:
     expires_delta = settings.access_token_expire_minutes
     to_encode = {"sub": str(user.id), "role": user.role.value}
@@ -38,7 +30,7 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,11 +54,11 @@ async def register_user(payload: UserCreate, db: Session = Depends(get_db)):
             detail="Username already registered",
         )
 
-    user = create_user(db, payload)
+    user = await create_user(db, payload)
     return UserRead.model_validate(user)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -80,18 +72,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
 
-    user = db.get(User, int(token_data.sub))
-    if user is None:
+    if settings.auth_trust_token_claims and token_data.role is not None:
+        return Principal(id=int(token_data.sub), role=Role(token_data.role.value))
+
+    principal = get_principal(db, int(token_data.sub))
+    if principal is None:
         raise credentials_exception
-    return user
+    # Give the connection back to the pool while the handler awaits (e.g. an
+    # LLM call); the session stays usable and reconnects on its next query.
+    db.close()
+    return principal
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     # In future you could add is_active flag check here.
     return current_user
 
 
-async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     if current_user.role != Role.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.sse import sse_response
+from app.models.job import Job, JobStatus
+from app.models.user import Role, User
+from app.schemas.job import JobCreate, JobResponse
+from app.services import article_service, job_service
+from app.api.v1.routes_auth import get_current_active_user, get_db
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _get_own_job_or_404(db: Session, job_id: int, user: User) -> Job:
+    job = job_service.get_job(db, job_id)
+    if job is None or (job.userid != user.id and user.role != Role.ADMIN):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.post(
+    "",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a summary, translation or quiz job",
+)
+async def submit_job(
+    payload: JobCreate,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Queue a long-running LLM operation and return its job id immediately.
+
+    ``payload`` is the body of the matching synchronous endpoint. Poll
+    ``GET /jobs/{id}`` or subscribe to ``GET /jobs/{id}/events`` for the
+    result. Only admins can raise ``priority`` above the default; other
+    users' priorities are capped at 0.
+    """
+
+    try:
+        job_payload = job_service.validate_payload(payload.kind, payload.payload)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", "payload", *error["loc"])} for error in exc.errors()]
+        )
+    # Stored-article jobs may only use articles the caller can read
+    if "article_id" in job_payload and article_service.unreadable_ids(db, [job_payload["article_id"]], current_user):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+
+    try:
+        priority = payload.priority if current_user.role == Role.ADMIN else min(payload.priority, 0)
+        job = job_service.submit_job(db, current_user.id, payload.kind, job_payload, priority)
+    except job_service.JobQueueFullError as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc))
+
+    return JobResponse.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=JobResponse, summary="Get job status and result")
+async def get_job(
+    job_id: int,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    return JobResponse.model_validate(_get_own_job_or_404(db, job_id, current_user))
+
+
+@router.get(
+    "/{job_id}/events",
+    summary="Subscribe to job status changes (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_job_events(
+    job_id: int,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Server-Sent Events feed for a job.
+
+    Emits a ``status`` event with the job every time its status changes, and
+    a final ``done`` event once it has succeeded or failed.
+    """
+
+    _get_own_job_or_404(db, job_id, current_user)
+
+    async def events():
+        async for snapshot in job_service.watch(job_id):
+            if JobStatus(snapshot["status"]) in job_service.TERMINAL_STATUSES:
+                yield "done", snapshot
+            else:
+                yield "status", snapshot
+
+    return sse_response(events())
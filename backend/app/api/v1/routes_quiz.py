@@ -1,10 +1,12 @@
-from typing import List
-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 
+from app.core.sse import sse_response
+from app.schemas.batch import BatchQuizRequest
 from app.schemas.quiz import QuizGenerationRequest, QuizGenerationResponse, QuizAttemptCreate, QuizAttemptResponse
-from app.services import wikipedia_service, llm_gemini_service
-from app.api.v1.routes_auth import get_current_active_user
+from app.services import batch_service, job_service, pipeline_service, quiz_service
+from app.api.v1.routes_auth import get_current_active_user, get_db
 
 router = APIRouter(prefix="/quiz", tags=["quiz"])
 
@@ -18,33 +20,111 @@ async def generate_quiz(
 
     We fetch the article sections directly from Wikipedia via URL,
     clean the text, and then ask Gemini to produce a JSON quiz
-    (MCQs + short open questions with correct answers).
+    (MCQs + short open questions with correct answers). Quizzes for
+    unchanged article text are served from the LLM result cache unless
+    ``refresh`` is set. The quiz is stored with its answer key; submit
+    attempts against the returned ``quiz_id``/``article_id``.
     """
 
-    article_data = wikipedia_service.fetch_article_sections(str(payload.url))
-    sections = article_data.get("sections", {}) or {}
-
-    full_text_parts: List[str] = []
-    for section_text in sections.values():
-        if section_text:
-            full_text_parts.append(section_text)
-
-    full_text = "\n\n".join(full_text_parts)
-    cleaned_text = wikipedia_service.clean_wikipedia_text(full_text)
-
-    quiz_json = llm_gemini_service.generate_quiz(cleaned_text)
+    result = await pipeline_service.generate_quiz_for_url(str(payload.url), refresh=payload.refresh)
+    quiz_id, article_id = await quiz_service.store_quiz(str(payload.url), result["title"], result)
 
     return QuizGenerationResponse(
         url=payload.url,
-        multiple_choice=quiz_json.get("multiple_choice", []),
-        open_questions=quiz_json.get("open_questions", []),
+        multiple_choice=result["multiple_choice"],
+        open_questions=result["open_questions"],
+        cached=result["cached"],
+        quiz_id=quiz_id,
+        article_id=article_id,
     )
 
 
+@router.post(
+    "/generate/stream",
+    summary="Stream quiz questions as Gemini generates them (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_quiz(
+    payload: QuizGenerationRequest,
+    current_user = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Server-Sent Events variant of ``/generate``.
+
+    Emits a ``question`` event per question as soon as it is complete
+    (``type`` is ``multiple_choice`` or ``open_questions``, with its
+    ``index`` and the ``question``), then a ``done`` event carrying the same
+    fields as ``QuizGenerationResponse``.
+    """
+
+    async def events():
+        async for event, data in pipeline_service.stream_quiz_url(str(payload.url), refresh=payload.refresh):
+            if event == "done":
+                quiz_id, article_id = await quiz_service.store_quiz(str(payload.url), data["title"], data)
+                yield event, QuizGenerationResponse(
+                    url=payload.url,
+                    multiple_choice=data["multiple_choice"],
+                    open_questions=data["open_questions"],
+                    cached=data["cached"],
+                    quiz_id=quiz_id,
+                    article_id=article_id,
+                ).model_dump(mode="json")
+            else:
+                yield event, data
+
+    return sse_response(events())
+
+
+@router.post(
+    "/generate/batch",
+    summary="Generate quizzes for many articles at once, streaming results as they complete (SSE)",
+    response_class=StreamingResponse,
+)
+async def generate_quiz_batch(
+    payload: BatchQuizRequest,
+    current_user = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Batch variant of ``/generate``.
+
+    Emits an ``item`` event per URL as its quiz completes (the
+    ``/generate`` response or that item's error), then a ``done`` event with
+    counts.
+    """
+
+    items = [batch_service.BatchItem("quiz", {"url": str(url), "refresh": payload.refresh}) for url in payload.urls]
+    return sse_response(batch_service.stream_batch(items))
+
+
 @router.post("/attempt", response_model=QuizAttemptResponse, summary="Submit quiz attempt and compute score")
 async def submit_quiz_attempt(
     payload: QuizAttemptCreate,
     current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
-    # TODO: persist attempt in database and return score
-    raise NotImplementedError
+    """Score the multiple-choice answers against the stored answer key.
+
+    Open answers are graded in the background; until then ``score`` only
+    counts the multiple-choice points and ``grading_pending`` is true.
+    Grading jobs count toward the user's pending-job limit.
+    """
+
+    try:
+        if any(answer.strip() for answer in payload.answers_open.values()):
+            job_service.check_pending_limit(db, current_user.id)
+        attempt, mcq_total, open_total = quiz_service.submit_attempt(db, current_user.id, payload)
+    except quiz_service.QuizNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except job_service.JobQueueFullError as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc))
+
+    if attempt.gradedat is None:
+        job_service.wake_workers()
+
+    return QuizAttemptResponse(
+        attempt_id=attempt.id,
+        quiz_id=attempt.quizid,
+        score=attempt.score,
+        mcq_correct=attempt.mcqcorrect,
+        mcq_total=mcq_total,
+        open_total=open_total,
+        grading_pending=attempt.gradedat is None,
+    )
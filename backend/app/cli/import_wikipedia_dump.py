@@ -0,0 +1,49 @@
+"""Import a Wikipedia dump into the local article store.
+
+Usage (from backend/):
+    python -m app.cli.import_wikipedia_dump enwiki-latest-pages-articles.xml.bz2
+    python -m app.cli.import_wikipedia_dump articles.jsonl.bz2 --store var/wikipedia_store --limit 50000
+    python -m app.cli.import_wikipedia_dump enwiki-latest-pages-articles.xml.bz2 --index
+
+The API serves imported titles from the store once ``ARTICLE_STORE_PATH``
+points at it (the default path is used when the option is omitted).
+``--index`` also adds every page to the full-text search index behind
+``/articles/search`` (``SEARCH_INDEX_PATH``).
+"""
+
+import argparse
+import logging
+
+from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.services import wikipedia_dump_service
+
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dump", help="MediaWiki XML export or JSON Lines file, optionally .bz2")
+    parser.add_argument("--store", default=settings.article_store_path, help="store directory")
+    parser.add_argument("--limit", type=int, help="stop after this many articles")
+    parser.add_argument("--index", action="store_true", help="also add pages to the search index")
+    args = parser.parse_args()
+    if not args.store:
+        parser.error("--store is required when ARTICLE_STORE_PATH is empty")
+    if args.index and not settings.search_index_path:
+        parser.error("--index needs SEARCH_INDEX_PATH to be set")
+
+    setup_logging()
+    result = wikipedia_dump_service.import_dump(
+        args.dump,
+        args.store,
+        limit=args.limit,
+        progress=lambda stats: logger.info("[dump] %s", stats),
+        index_path=settings.search_index_path if args.index else None,
+    )
+    logger.info("[dump] Imported %s into %s: %s", args.dump, args.store, result)
+
+
+if __name__ == "__main__":
+    main()
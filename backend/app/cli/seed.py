@@ -0,0 +1,71 @@
+"""Seed the database with development data or a large generated dataset.
+
+Usage (from backend/, after ``alembic upgrade head``):
+    python -m app.cli.seed --dev
+    python -m app.cli.seed --users 1000000 --articles 200000 --attempts 10000000 --seed 42
+
+``--dev`` adds the few development accounts (admin/admin123, alice and
+zakaria with password123) when the database has no users. Otherwise users,
+articles and quiz attempts are generated in bulk (see
+``app.factories.bulk_data``); the same ``--seed``, sizes and ``--end`` date
+reproduce the same dataset. Generated users log in as ``user<id>`` with
+password123.
+"""
+
+import argparse
+import logging
+from datetime import datetime
+
+from app.core.logging_config import setup_logging
+from app.core.security import configure_password_hashing, get_password_hash
+from app.db.session import SessionLocal, engine
+from app.factories import BulkSizes, seed_bulk, seed_initial_data
+from app.factories.bulk_data import DEFAULT_PASSWORD
+
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dev", action="store_true", help="add the development accounts and articles")
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--articles", type=int, default=0)
+    parser.add_argument("--attempts", type=int, default=0)
+    parser.add_argument("--days", type=int, default=365, help="spread attempts over this many days")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="last attempt day (default: today)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+    if not args.dev and not (args.users or args.articles or args.attempts):
+        parser.error("pass --dev or at least one of --users, --articles, --attempts")
+
+    setup_logging()
+    # Hash with the rounds the API uses, so logins do not rehash seeded users
+    configure_password_hashing()
+
+    if args.dev:
+        db = SessionLocal()
+        try:
+            seed_initial_data(db)
+        finally:
+            db.close()
+        logger.info("[seed] Development data present")
+
+    sizes = BulkSizes(users=args.users, articles=args.articles, attempts=args.attempts, days=args.days)
+    if sizes.users or sizes.articles or sizes.attempts:
+        with engine.begin() as connection:
+            result = seed_bulk(
+                connection,
+                sizes,
+                get_password_hash(DEFAULT_PASSWORD),
+                seed=args.seed,
+                end=args.end,
+                batch_size=args.batch_size,
+                progress=lambda table, rows: logger.info("[seed] %s: %s rows", table, rows),
+            )
+        logger.info("[seed] Generated %s", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import asyncio
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, TypeVar
+
+from app.core.config import settings
+
+
+T = TypeVar("T")
+
+# Shared, bounded pool for blocking work (SQLite cache, PDF parsing, ...)
+# that must not run on the event loop.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.offload_max_workers,
+    thread_name_prefix="offload",
+)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the bounded offload executor."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def gather_limited(factories: Iterable[Callable[[], Awaitable[T]]], limit: int) -> List[T]:
+    """Run coroutine factories concurrently, at most ``limit`` at a time.
+
+    Results are returned in the order of ``factories``.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories))
+
+
+def shutdown_executor() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller starts the work as a task; callers arriving while it is
+    in flight await the same task and receive the same result or exception.
+    Cancelling one caller does not cancel the shared work for the others.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self._coalesced_by_group: Counter = Counter()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self.executions += 1
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            self.coalesced += 1
+            self._coalesced_by_group[key[0] if isinstance(key, tuple) else self.name] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away.
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_by_group": dict(self._coalesced_by_group),
+        }
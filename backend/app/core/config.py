@@ -10,11 +10,33 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "postgresql+psycopg2://postgres:postgres@db:5432/wikismart"
+    # Connection pool per process (ignored for SQLite); size these so that
+    # processes x (pool size + overflow) stays below Postgres max_connections
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
 
     # Auth
     jwt_secret_key: str 
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Verified users are cached by id so most requests skip the users lookup
+    auth_principal_cache_max_entries: int = 10000
+    auth_principal_cache_ttl_seconds: int = 60
+    # Trust the role claim signed into the token instead of reading the user
+    # at all; role changes and deletions then apply only once the token
+    # expires
+    auth_trust_token_claims: bool = False
+    # pbkdf2 rounds for new password hashes; when unset they are calibrated
+    # at startup to take about password_hash_target_ms. Older hashes are
+    # upgraded on login.
+    password_hash_rounds: int | None = None
+    password_hash_target_ms: float = 50.0
+    password_hash_min_rounds: int = 29000
+    # Threads dedicated to hashing/verifying passwords
+    password_hash_workers: int = 4
 
     # CORS
     cors_origins: List[str] = ["http://localhost:5173"]
@@ -26,14 +48,130 @@ class Settings(BaseSettings):
     groq_model_name: str = "llama-3.1-8b-instant"
     gemini_model_name_translation: str = "gemini-2.5-flash"
     gemini_model_name_quiz: str = "gemini-2.5-flash"
+    gemini_model_name_summary: str = "gemini-2.5-flash"
     llm_temperature: float = 0.3
     llm_max_tokens: int = 1024
-    # Safety limit for input size sent to LLMs (approx, in characters)
-    llm_max_input_chars: int = 12000
+    # Article content per LLM call, in estimated tokens (see token_service).
+    # Longer articles are split on section boundaries into chunks of this
+    # size and summarized/translated in parallel (map-reduce); quiz input is
+    # cut. Groq's free tier allows 6000 tokens per minute on
+    # llama-3.1-8b-instant, which bounds a single summary request.
+    groq_max_input_tokens: int = 3000
+    # A translation produces about as many tokens as it reads
+    gemini_translation_max_input_tokens: int = 8000
+    gemini_quiz_max_input_tokens: int = 30000
+    gemini_summary_max_input_tokens: int = 30000
+    llm_chunk_concurrency: int = 4
+    # Client-side rate limits per model (see app.core.rate_limit); tokens
+    # count input plus expected output. Defaults are the free tiers of
+    # llama-3.1-8b-instant on Groq and Gemini 2.5 Flash.
+    groq_requests_per_minute: int = 30
+    groq_tokens_per_minute: int = 6000
+    gemini_requests_per_minute: int = 10
+    gemini_tokens_per_minute: int = 250000
+    # How long an LLM call may queue for capacity and retry 429 / 5xx
+    # responses before the request fails with 429 and a Retry-After
+    llm_queue_timeout_seconds: float = 60.0
+    llm_retry_max_attempts: int = 4
+    llm_retry_base_delay_seconds: float = 0.5
+    llm_retry_max_delay_seconds: float = 20.0
+    # Questions per generated quiz; missing or invalid ones are re-asked at
+    # most quiz_max_reasks times, in one call per round
+    quiz_mcq_count: int = 5
+    quiz_open_count: int = 3
+    quiz_max_reasks: int = 1
+    # Open answers are graded by character n-gram TF-IDF similarity to the
+    # reference answer: full credit at or above grading_accept_similarity,
+    # none at or below grading_reject_similarity, linear in between. With
+    # grading_llm_escalation, answers in between are graded by the LLM.
+    # A grading job also grades up to grading_batch_size other waiting attempts.
+    grading_ngram_min: int = 3
+    grading_ngram_max: int = 5
+    grading_reject_similarity: float = 0.15
+    grading_accept_similarity: float = 0.5
+    grading_llm_escalation: bool = False
+    grading_batch_size: int = 500
+    # Provider routing per operation (see llm_router_service): providers in
+    # order of preference and a policy, one of "fallback" (try them in
+    # order), "hedged" (also start the next provider when the current one
+    # has not answered after llm_hedge_delay_seconds) or "fastest" (order
+    # them by observed latency). Inputs are chunked for the first provider.
+    llm_route_summary: List[str] = ["groq", "gemini"]
+    llm_route_translation: List[str] = ["gemini", "groq"]
+    llm_route_quiz: List[str] = ["gemini", "groq"]
+    llm_route_grading: List[str] = ["groq", "gemini"]
+    llm_policy_summary: str = "fallback"
+    llm_policy_translation: str = "fallback"
+    llm_policy_quiz: str = "fallback"
+    llm_policy_grading: str = "fallback"
+    llm_hedge_delay_seconds: float = 5.0
+    # A provider that just failed is tried last for this long
+    llm_provider_cooldown_seconds: float = 30.0
+    # Persistent cache of LLM results, bounded by total payload size
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "var/llm_cache.sqlite3"
+    llm_cache_max_bytes: int = 256 * 1024 * 1024
+
+    # Upper bound on threads used to offload blocking work from the event loop
+    offload_max_workers: int = 16
+
+    # PDF ingestion
+    pdf_max_bytes: int = 50 * 1024 * 1024
+    pdf_max_pages: int = 1000
+    # Documents with at least this many pages are extracted on a process pool
+    pdf_parallel_min_pages: int = 50
+    pdf_max_workers: int = 4
+    # Extracted/processed article content, one JSON file per article id
+    processed_content_dir: str = "var/processed"
+
+    # Background jobs (queue is the ``jobs`` table); set JOB_WORKERS=0 to
+    # run an API process that only accepts jobs
+    job_workers: int = 4
+    job_max_running_per_user: int = 2
+    job_max_pending_per_user: int = 20
+    job_timeout_seconds: float = 600.0
+    job_max_attempts: int = 3
+    job_poll_interval_seconds: float = 2.0
+
+    # Batch endpoints: items per request, items run at once per batch, and
+    # items run at once across all batches in the process (the shared LLM
+    # budget). Wikipedia fetches for queued items run ahead of the budget.
+    batch_max_items: int = 50
+    batch_concurrency: int = 4
+    batch_max_concurrency: int = 8
+    batch_fetch_concurrency: int = 8
+    batch_item_timeout_seconds: float = 300.0
+
+    # Admin statistics (read from counters kept in app.db.counters): days
+    # of daily series, articles listed by attempt count, and how long a
+    # response is served from memory. LLM call counts are written to the
+    # counters every stats_flush_interval_seconds.
+    admin_stats_days: int = 30
+    admin_stats_top_articles: int = 20
+    admin_stats_cache_ttl_seconds: float = 10.0
+    stats_flush_interval_seconds: float = 60.0
 
     # Wikipedia
     # Can be overridden by env var WIKIPEDIA_USER_AGENT
     wikipedia_user_agent: str = "WikiSmartEdu/1.0 (contact@example.com)"
+    wikipedia_api_url: str = "https://en.wikipedia.org/w/api.php"
+    wikipedia_timeout_seconds: float = 15.0
+    # In-process LRU tier for fetched articles
+    article_cache_max_entries: int = 256
+    article_cache_ttl_seconds: int = 900
+    # Persistent SQLite tier; set ARTICLE_CACHE_PATH to an empty value to disable
+    article_cache_path: str | None = "var/article_cache.sqlite3"
+    article_cache_persistent_ttl_seconds: int = 86400
+    article_cache_persistent_max_entries: int = 10000
+    # Local store imported from a dump (python -m app.cli.import_wikipedia_dump);
+    # consulted before the caches. Set WIKIPEDIA_LIVE_FALLBACK=false where
+    # Wikipedia is unreachable so missing titles fail fast.
+    article_store_path: str | None = "var/wikipedia_store"
+    wikipedia_live_fallback: bool = True
+    # Full-text index (SQLite FTS5) behind /articles/search, updated on ingest;
+    # set SEARCH_INDEX_PATH to an empty value to disable
+    search_index_path: str | None = "var/search_index.sqlite3"
+    search_max_results: int = 50
 
     class Config:
         env_file = ".env"
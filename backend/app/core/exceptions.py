@@ -1,8 +1,18 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from app.core.rate_limit import LLMRateLimitError, retry_after_header
+
 
 def setup_exception_handlers(app: FastAPI) -> None:
+    @app.exception_handler(LLMRateLimitError)
+    async def rate_limit_exception_handler(_: Request, exc: LLMRateLimitError):  # type: ignore[override]
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(exc)},
+            headers={"Retry-After": retry_after_header(exc)},
+        )
+
     @app.exception_handler(Exception)
     async def generic_exception_handler(_: Request, exc: Exception):  # type: ignore[override]
         return JSONResponse(
@@ -0,0 +1,306 @@
+"""Client-side rate limiting and retries for LLM provider calls.
+
+Each provider/model pair gets a limiter with two token buckets, one for
+requests per minute and one for tokens per minute (input plus expected
+output), sized to the provider's published limits. A call reserves capacity
+in both buckets up front. Reservations are served in arrival order: a caller
+that has to wait sleeps until its reserved slot instead of failing, unless
+the slot lies beyond its deadline, in which case ``LLMRateLimitError`` is
+raised right away with the time after which a retry would fit.
+
+When the provider still answers 429 (or 5xx / connection errors), the call
+is retried with jittered exponential backoff. A ``Retry-After`` from the
+provider pauses the whole limiter, so queued callers do not walk into the
+same wall. Once the response reports real token usage, the difference from
+the reservation is settled with the token bucket; a caller cancelled while
+waiting for its slot gives its reservation back.
+
+Limiters only use ``time.monotonic`` and ``asyncio.sleep``, so one instance
+works across event loops and threads.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type, TypeVar
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Indirection so tests can observe backoff without sleeping.
+_sleep = asyncio.sleep
+
+
+class LLMRateLimitError(Exception):
+    """The call could not be admitted or completed before its deadline."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Bucket refilled continuously at ``per_minute / 60`` units per second.
+
+    The level may go negative: that is capacity already promised to callers
+    who are waiting for their turn.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` fits, without reserving it."""
+
+        self._refill()
+        # A request larger than the whole bucket waits for a full bucket.
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(requests_per_minute, clock)
+        self._tokens = TokenBucket(tokens_per_minute, clock)
+        self._paused_until = 0.0
+        self.queued = 0
+        self.max_queued = 0
+        self.calls = 0
+        self.throttled = 0
+        self.throttle_seconds = 0.0
+        self.rejected = 0
+        self.retries = 0
+        self.upstream_throttled = 0
+
+    def reserve(self, tokens: int, deadline: float) -> float:
+        """Reserve one request and ``tokens``; return the seconds to wait.
+
+        Raises ``LLMRateLimitError`` without reserving anything when the
+        slot would start after ``deadline`` (a ``time.monotonic`` value).
+        """
+
+        with self._lock:
+            now = self._clock()
+            wait = max(
+                self._requests.wait_for(1),
+                self._tokens.wait_for(tokens),
+                self._paused_until - now,
+                0.0,
+            )
+            if now + wait > deadline:
+                self.rejected += 1
+                raise LLMRateLimitError(f"{self.name} rate limit: no capacity before the deadline", wait)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self.calls += 1
+            if wait > 0:
+                self.throttled += 1
+                self.throttle_seconds += wait
+            return wait
+
+    def release(self, tokens: int) -> None:
+        """Return a reservation whose call never started (its caller was cancelled)."""
+
+        with self._lock:
+            self._requests.give_back(1)
+            self._tokens.give_back(min(tokens, self._tokens.capacity))
+
+    def settle(self, reserved: int, actual: int | None) -> None:
+        """Correct the token bucket once the real usage of a call is known."""
+
+        if actual is None:
+            return
+        with self._lock:
+            if actual < reserved:
+                self._tokens.give_back(reserved - actual)
+            else:
+                self._tokens.take(actual - reserved)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def record_retry(self, upstream_throttled: bool) -> None:
+        with self._lock:
+            self.retries += 1
+            self.upstream_throttled += upstream_throttled
+
+    async def acquire(self, tokens: int, deadline: float) -> None:
+        wait = self.reserve(tokens, deadline)
+        if wait <= 0:
+            return
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await _sleep(wait)
+        except asyncio.CancelledError:
+            # Timeouts, lost hedges and disconnects must not shrink the bucket
+            self.release(tokens)
+            raise
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests_per_minute": self._requests.capacity,
+                "tokens_per_minute": self._tokens.capacity,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "throttle_seconds": round(self.throttle_seconds, 3),
+                "rejected": self.rejected,
+                "retries": self.retries,
+                "upstream_throttled": self.upstream_throttled,
+            }
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, model: str, requests_per_minute: float, tokens_per_minute: float) -> RateLimiter:
+    key = (provider, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(f"{provider}:{model}", requests_per_minute, tokens_per_minute)
+        return limiter
+
+
+def reset_limiters() -> None:
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def get_stats() -> Dict[str, Any]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+def _status_code(exc: BaseException) -> int | None:
+    # groq.APIStatusError has ``status_code``; google.genai APIError has ``code``.
+    for attribute in ("status_code", "code"):
+        value = getattr(exc, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        # HTTP-date form; fall back to exponential backoff.
+        return None
+
+
+async def call(
+    limiter: RateLimiter,
+    tokens: int,
+    func: Callable[[], Awaitable[T]],
+    *,
+    retry_on: Tuple[Type[BaseException], ...] = (),
+    usage: Callable[[T], int | None] | None = None,
+) -> T:
+    """Run ``func`` under ``limiter``, retrying throttling and transient errors.
+
+    ``tokens`` is the reservation (estimated input plus expected output);
+    ``usage`` extracts the real total from the result to settle it. Waiting
+    and backoff together never exceed ``settings.llm_queue_timeout_seconds``.
+    """
+
+    max_attempts = settings.llm_retry_max_attempts
+    base_delay = settings.llm_retry_base_delay_seconds
+    max_delay = settings.llm_retry_max_delay_seconds
+    deadline = time.monotonic() + settings.llm_queue_timeout_seconds
+    attempt = 0
+    while True:
+        await limiter.acquire(tokens, deadline)
+        try:
+            result = await func()
+        except Exception as exc:  # noqa: BLE001
+            status = _status_code(exc)
+            if status not in RETRYABLE_STATUS and not isinstance(exc, retry_on):
+                raise
+
+            attempt += 1
+            retry_after = _retry_after(exc)
+            if status == 429 and retry_after is not None:
+                limiter.pause(retry_after)
+            # Full jitter, but never earlier than the provider asked for.
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+            remaining = deadline - time.monotonic()
+            if attempt >= max_attempts or delay > remaining:
+                if status == 429:
+                    raise LLMRateLimitError(
+                        f"{limiter.name} is rate limiting requests", retry_after or max(delay, base_delay)
+                    ) from exc
+                raise
+            limiter.record_retry(status == 429)
+            logger.warning(
+                "[rate-limit] %s call failed (%s), retry %s/%s in %.2fs",
+                limiter.name,
+                status or type(exc).__name__,
+                attempt,
+                max_attempts - 1,
+                delay,
+            )
+            await _sleep(delay)
+            continue
+
+        if usage is not None:
+            try:
+                limiter.settle(tokens, usage(result))
+            except Exception:  # noqa: BLE001
+                logger.debug("[rate-limit] Could not read usage from %s response", limiter.name)
+        return result
+
+
+def retry_after_header(exc: LLMRateLimitError) -> str:
+    return str(max(1, math.ceil(exc.retry_after)))
@@ -1,15 +1,33 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
+from passlib.hash import pbkdf2_sha256
 
 from app.core.config import settings
 
 
+logger = logging.getLogger(__name__)
+
 # Use pbkdf2_sha256 to avoid bcrypt's 72-byte password limit and backend issues.
 password_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+# Hashing is CPU-bound (hashlib releases the GIL), so it runs on its own small
+# pool: a login storm queues here instead of stalling the event loop or
+# starving the shared offload executor.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="pwhash",
+)
+
+_CALIBRATION_ROUNDS = 20000
+_ROUNDS_STEP = 10000
+
 def create_access_token(subject: Any, expires_delta: Optional[int] = None) -> str:
     if expires_delta is not None:
         expire = datetime.now(timezone.utc) + timedelta(minutes=expires_delta)
@@ -36,3 +54,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return password_context.hash(password)
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """Return the pbkdf2 rounds that take about ``target_ms`` on this machine.
+
+    Rounded down to a multiple of 10,000 so processes on similar hardware
+    agree, and never below ``settings.password_hash_min_rounds``.
+    """
+
+    started = time.perf_counter()
+    pbkdf2_sha256.using(rounds=_CALIBRATION_ROUNDS).hash("calibration-password")
+    per_round_ms = (time.perf_counter() - started) * 1000 / _CALIBRATION_ROUNDS
+
+    rounds = int(target_ms / per_round_ms) // _ROUNDS_STEP * _ROUNDS_STEP
+    return max(settings.password_hash_min_rounds, rounds)
+
+
+def configure_password_hashing() -> int:
+    """Apply the configured (or calibrated) rounds to ``password_context``.
+
+    New hashes use these rounds, and hashes with fewer rounds are flagged by
+    ``needs_update`` so they are upgraded on the user's next login. With
+    several processes, set ``PASSWORD_HASH_ROUNDS`` explicitly so they all
+    agree.
+    """
+
+    rounds = settings.password_hash_rounds or calibrate_rounds(settings.password_hash_target_ms)
+    password_context.update(
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+    )
+    logger.info("[security] Password hashing uses pbkdf2_sha256 with %s rounds", rounds)
+    return rounds
+
+
+async def _run_hasher(func, *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, func, *args)
+
+
+async def hash_password(password: str) -> str:
+    return await _run_hasher(password_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, str | None]:
+    """Verify a password off the event loop.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored hash
+    uses outdated parameters and should be replaced.
+    """
+
+    return await _run_hasher(password_context.verify_and_update, plain_password, hashed_password)
+
+
+async def dummy_verify_password() -> None:
+    # Spend the same time as a real check so unknown usernames can't be told
+    # apart by response time.
+    await _run_hasher(password_context.dummy_verify)
+
+
+def shutdown_hash_executor() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
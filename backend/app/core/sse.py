@@ -0,0 +1,32 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _encode(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield format_event(event, data)
+    except Exception as exc:  # noqa: BLE001
+        # Headers are already sent, so report failures in-band.
+        logger.exception("[sse] Stream failed")
+        yield format_event("error", {"detail": "Internal server error", "error": str(exc)})
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]]) -> StreamingResponse:
+    """Wrap ``(event, data)`` pairs into a Server-Sent Events response."""
+
+    return StreamingResponse(
+        _encode(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
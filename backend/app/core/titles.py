@@ -0,0 +1,13 @@
+from urllib.parse import unquote
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a page title the way MediaWiki does for lookups.
+
+    Underscores and runs of whitespace become single spaces and the first
+    character is upper-cased; the rest of the title is case-sensitive.
+    Shared by the article cache and store keys and ``Article.articlekey``.
+    """
+
+    title = " ".join(unquote(title).replace("_", " ").split())
+    return title[:1].upper() + title[1:]
@@ -0,0 +1,61 @@
+"""Data steps of the migration to one article row per identity.
+
+Databases created before ``Article.articlekey`` have no key and may hold
+several rows for one article (one per ingest, quiz or upload). Revision
+0005 adds the column and then calls ``backfill_keys`` and
+``merge_duplicates`` before building the unique index. Both are idempotent.
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import Connection, bindparam, select, update
+
+from app.models.article import Article, article_key
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+
+
+_BATCH_SIZE = 1000
+
+
+def backfill_keys(connection: Connection) -> int:
+    """Set the key of rows without one; PDF rows get a per-row key (their file is not known)."""
+
+    table = Article.__table__
+    rows = connection.execute(select(table.c.id, table.c.url).where(table.c.articlekey.is_(None))).all()
+    keys = [
+        # Two uploads with the same file name may be different documents
+        {"row_id": row_id, "key": f"{url}#{row_id}" if url.startswith("upload://") else article_key(url)}
+        for row_id, url in rows
+    ]
+    statement = update(table).where(table.c.id == bindparam("row_id")).values(articlekey=bindparam("key"))
+    for start in range(0, len(keys), _BATCH_SIZE):
+        connection.execute(statement, keys[start:start + _BATCH_SIZE])
+    return len(keys)
+
+
+def merge_duplicates(connection: Connection) -> int:
+    """Fold rows sharing a key into the oldest, moving their quizzes and attempts.
+
+    Processed content files and search entries of the removed rows are left
+    in place; re-ingesting the article refreshes them.
+    """
+
+    table = Article.__table__
+    rows_by_key: Dict[str, List[int]] = defaultdict(list)
+    for row_id, key in connection.execute(select(table.c.id, table.c.articlekey).order_by(table.c.id)):
+        rows_by_key[key].append(row_id)
+
+    merged = 0
+    for keeper, *duplicates in rows_by_key.values():
+        if not duplicates:
+            continue
+        for model in (Quiz, QuizAttempt):
+            model_table = model.__table__
+            connection.execute(
+                update(model_table).where(model_table.c.articleid.in_(duplicates)).values(articleid=keeper)
+            )
+        connection.execute(table.delete().where(table.c.id.in_(duplicates)))
+        merged += len(duplicates)
+    return merged
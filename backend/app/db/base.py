@@ -1,5 +1,8 @@
 from app.models.user import User
 from app.models.article import Article
+from app.models.quiz import Quiz
 from app.models.quiz_attempt import QuizAttempt
+from app.models.job import Job
+from app.models.stat_counter import StatCounter
 
-__all__ = ["User", "Article", "QuizAttempt"]
+__all__ = ["User", "Article", "Quiz", "QuizAttempt", "Job", "StatCounter"]
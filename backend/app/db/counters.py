@@ -0,0 +1,141 @@
+"""Statistics counters maintained in the writer's transaction.
+
+An ``after_flush`` listener on every ORM session turns the users, articles,
+quizzes and quiz attempts it inserted, deleted or re-scored into counter
+deltas and upserts them into ``statcounters`` on the same connection. The
+counters commit or roll back with the rows they count, so reading the
+platform statistics is a handful of primary-key lookups instead of
+``COUNT(*)`` scans.
+
+Writes that bypass the ORM unit of work (Core ``insert()``, raw SQL) are not
+counted; ``rebuild`` recomputes every counter from the tables.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, DefaultDict, Dict, List, Tuple
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.stat_counter import StatCounter
+from app.models.user import User
+
+
+USERS = "users"
+ARTICLES = "articles"
+QUIZZES = "quizzes"
+ATTEMPTS = "attempts"
+# Keyed by ISO day of submission
+ATTEMPTS_BY_DAY = "attempts_by_day"
+# Keyed by article id
+ATTEMPTS_BY_ARTICLE = "attempts_by_article"
+# Keyed by ISO day; one counter per LLM operation
+LLM_CALLS_PREFIX = "llm_calls."
+
+_TOTALS = {User: USERS, Article: ARTICLES, Quiz: QUIZZES}
+
+# (name, key) -> [count, total]
+Deltas = DefaultDict[Tuple[str, str], List[float]]
+
+
+def day_key(value: date | datetime | None) -> str:
+    return (value or datetime.utcnow()).strftime("%Y-%m-%d")
+
+
+def _count_attempt(deltas: Deltas, attempt: QuizAttempt, count: int, score: float) -> None:
+    for name, key in (
+        (ATTEMPTS, ""),
+        (ATTEMPTS_BY_DAY, day_key(attempt.submittedat)),
+        (ATTEMPTS_BY_ARTICLE, str(attempt.articleid)),
+    ):
+        deltas[(name, key)][0] += count
+        deltas[(name, key)][1] += score
+
+
+def collect(session: Session) -> Deltas:
+    """Counter deltas for the pending changes of ``session``."""
+
+    deltas: Deltas = defaultdict(lambda: [0, 0.0])
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            if isinstance(obj, QuizAttempt):
+                _count_attempt(deltas, obj, sign, sign * (obj.score or 0.0))
+            elif type(obj) in _TOTALS:
+                deltas[(_TOTALS[type(obj)], "")][0] += sign
+
+    for obj in session.dirty:
+        if isinstance(obj, QuizAttempt):
+            # Grading re-scores attempts after they were counted
+            history = inspect(obj).attrs.score.history
+            if history.added and history.deleted:
+                _count_attempt(deltas, obj, 0, (history.added[0] or 0.0) - (history.deleted[0] or 0.0))
+    return deltas
+
+
+def apply(connection: Connection, deltas: Dict[Tuple[str, str], List[float]]) -> None:
+    """Add ``deltas`` to the counters in one upsert."""
+
+    rows = [
+        {"name": name, "key": key, "count": count, "total": total}
+        for (name, key), (count, total) in sorted(deltas.items())
+        if count or total
+    ]
+    if not rows:
+        return
+
+    table = StatCounter.__table__
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(table)
+    # Rows are sorted so concurrent writers lock counters in the same order.
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.name, table.c.key],
+            set_={
+                "count": table.c.count + statement.excluded.count,
+                "total": table.c.total + statement.excluded.total,
+            },
+        ),
+        rows,
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    deltas = collect(session)
+    if deltas:
+        apply(session.connection(), deltas)
+
+
+def rebuild(db: Session) -> None:
+    """Recompute the table-derived counters from scratch (LLM call counts are kept)."""
+
+    deltas: Deltas = defaultdict(lambda: [0, 0.0])
+    for model, name in _TOTALS.items():
+        deltas[(name, "")][0] = db.execute(select(func.count()).select_from(model)).scalar_one()
+
+    day = func.date(QuizAttempt.submittedat)
+    for key_column, name in (
+        (None, ATTEMPTS),
+        (day, ATTEMPTS_BY_DAY),
+        (QuizAttempt.articleid, ATTEMPTS_BY_ARTICLE),
+    ):
+        columns = [func.count(), func.coalesce(func.sum(QuizAttempt.score), 0.0)]
+        query = select(*columns) if key_column is None else select(key_column, *columns).group_by(key_column)
+        for row in db.execute(query):
+            if key_column is not None and row[0] is None:
+                continue
+            key = "" if key_column is None else str(row[0])
+            deltas[(name, key)] = [row[-2], float(row[-1])]
+
+    names = [*_TOTALS.values(), ATTEMPTS, ATTEMPTS_BY_DAY, ATTEMPTS_BY_ARTICLE]
+    db.execute(delete(StatCounter).where(StatCounter.name.in_(names)))
+    apply(db.connection(), deltas)
+    db.commit()
@@ -1,27 +1,47 @@
 import logging
+import os
 
-from app import models  # noqa: F401  # ensure models are imported
-from app.db.session import engine, SessionLocal
-from app.factories import seed_initial_data
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from alembic.util import CommandError
 
+from app.db.session import engine
 
-def init_db() -> None:
-    """Create all database tables and seed initial data.
 
-    This is called once at startup to ensure the schema exists and has
-    some development data.
-    """
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
 
-    logging.info("[init_db] Creating database tables if they do not exist...")
-    models.Base.metadata.create_all(bind=engine)
-    logging.info("[init_db] Tables present: %s", list(models.Base.metadata.tables.keys()))
+class SchemaVersionError(RuntimeError):
+    pass
 
 
+def check_schema() -> None:
+    """Refuse to start on a database that is behind the code's migrations.
+
+    Migrations run once, out-of-band (``alembic upgrade head``), never from
+    worker startup: this reads the revision recorded in ``alembic_version``
+    and compares it with the newest migration script. A database ahead of
+    this code (migrated for a newer release during a rolling deploy) is
+    accepted with a warning, since migrations keep the previous release
+    working.
+    """
 
+    script = ScriptDirectory.from_config(Config(ALEMBIC_INI))
+    head = script.get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
 
-def init_data() -> None:
-    db = SessionLocal()
+    if current == head:
+        logging.info("[init_db] Database schema at revision %s", current)
+        return
     try:
-        seed_initial_data(db)
-    finally:
-        db.close()
+        known = current is not None and script.get_revision(current) is not None
+    except CommandError:
+        known = False
+    if current is not None and not known:
+        logging.warning("[init_db] Database schema %s is newer than this code (%s)", current, head)
+        return
+    raise SchemaVersionError(
+        f"Database schema is at revision {current}, this code needs {head}; run `alembic upgrade head`"
+    )
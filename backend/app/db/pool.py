@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):  # type: ignore[override]
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(0, self.overflow()),
+                "max_overflow": self._max_overflow,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "wait_avg_ms": round(self._wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
@@ -1,8 +1,47 @@
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db import counters  # noqa: F401  # registers the statistics counter listener
+from app.db.pool import InstrumentedQueuePool
+
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    if database_url.startswith("sqlite"):
+        # SQLite picks its own pool class; the server pool settings do not apply.
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
 
 
-engine = create_engine(settings.database_url, future=True)
+engine = create_engine(settings.database_url, future=True, **_engine_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def get_db():
+    """Request-scoped session.
+
+    FastAPI caches dependencies per request, so authentication and the route
+    handler share this one session (and at most one pooled connection).
+    """
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
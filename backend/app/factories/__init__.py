@@ -1,3 +1,4 @@
+from app.factories.bulk_data import BulkSizes, seed_bulk
 from app.factories.seed_data import seed_initial_data
 
-__all__ = ["seed_initial_data"]
+__all__ = ["BulkSizes", "seed_bulk", "seed_initial_data"]
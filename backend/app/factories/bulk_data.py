@@ -0,0 +1,216 @@
+"""Generate large, reproducible datasets for load and performance testing.
+
+Users, articles and quiz attempts are generated in batches from a seeded
+random generator (the same seed and sizes give the same rows) and written
+with PostgreSQL ``COPY``, or batched multi-row inserts on other databases.
+Rows get explicit ids after the current maximum, so a run appends to
+existing data. Every user shares one password hash computed up front: the
+hash is salted, so it verifies like any other, and nothing is hashed per row.
+
+Attempts follow a Zipf-like article popularity (a few articles get most of
+the attempts) and are spread over the ``days`` days before ``end``, which is
+what the statistics and history queries see in production. They are
+finished attempts, graded when submitted.
+
+Core inserts bypass the ORM flush that maintains the statistics counters,
+so ``seed_bulk`` rebuilds them at the end.
+"""
+
+import csv
+import io
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+import numpy as np
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db import counters
+from app.models.article import Article
+from app.models.quiz_attempt import QuizAttempt
+from app.models.user import Role, User
+
+# Every generated user logs in with this password
+DEFAULT_PASSWORD = "password123"
+
+_USER_COLUMNS = ["id", "username", "email", "hashed_password", "role"]
+_ARTICLE_COLUMNS = ["id", "url", "title", "articlekey", "action", "createdat"]
+_ATTEMPT_COLUMNS = ["userid", "articleid", "score", "mcqcorrect", "submittedat", "gradedat"]
+
+# Questions per generated attempt; scores are multiples of 100 / this
+_QUESTIONS = 10
+
+
+@dataclass
+class BulkSizes:
+    users: int = 0
+    articles: int = 0
+    attempts: int = 0
+    days: int = 365
+
+
+def _next_id(connection: Connection, table: Table) -> int:
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _ids(connection: Connection, table: Table, first_id: int, count: int) -> np.ndarray:
+    # Generated ids, or every existing id when nothing was generated
+    if count:
+        return np.arange(first_id, first_id + count)
+    return np.array(connection.execute(select(table.c.id).order_by(table.c.id)).scalars().all(), dtype=np.int64)
+
+
+def _write_rows(connection: Connection, table: Table, columns: Sequence[str], rows: List[Sequence[Any]]) -> None:
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+    else:
+        connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+def user_rows(start_id: int, count: int, password_hash: str) -> Iterator[Sequence[Any]]:
+    for user_id in range(start_id, start_id + count):
+        yield (user_id, f"user{user_id}", f"user{user_id}@example.com", password_hash, Role.USER.value)
+
+
+def article_rows(start_id: int, count: int, created: datetime) -> Iterator[Sequence[Any]]:
+    for article_id in range(start_id, start_id + count):
+        title = f"Topic {article_id}"
+        url = f"https://en.wikipedia.org/wiki/Topic_{article_id}"
+        yield (article_id, url, title, f"en.wikipedia.org:{title}", "SEED", created)
+
+
+def attempt_batches(
+    rng: np.random.Generator,
+    user_ids: np.ndarray,
+    article_ids: np.ndarray,
+    count: int,
+    end: datetime,
+    days: int,
+    batch_size: int,
+) -> Iterator[List[Sequence[Any]]]:
+    # Popularity by rank 1/(rank + 1), shuffled so popular articles are not
+    # simply the lowest ids
+    weights = 1.0 / np.arange(1, len(article_ids) + 1)
+    popularity = np.cumsum(rng.permutation(weights))
+    popularity /= popularity[-1]
+
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        users = user_ids[rng.integers(0, len(user_ids), size)]
+        articles = article_ids[np.searchsorted(popularity, rng.random(size))]
+        correct = rng.binomial(_QUESTIONS, rng.beta(5, 2, size))
+        seconds = rng.integers(0, days * 86400, size)
+        submitted = [end - timedelta(seconds=int(ago)) for ago in seconds]
+        # Finished attempts: graded when submitted, no grading backlog
+        yield [
+            (int(user), int(article), right * 100.0 / _QUESTIONS, int(right), at, at)
+            for user, article, right, at in zip(users, articles, correct, submitted)
+        ]
+
+
+def _write(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    batches: Iterator[List[Sequence[Any]]],
+    progress: Callable[[str, int], None] | None,
+) -> int:
+    written = 0
+    for batch in batches:
+        _write_rows(connection, table, columns, batch)
+        written += len(batch)
+        if progress is not None:
+            progress(table.name, written)
+    return written
+
+
+def _chunks(rows: Iterator[Sequence[Any]], size: int) -> Iterator[List[Sequence[Any]]]:
+    batch: List[Sequence[Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed_bulk(
+    connection: Connection,
+    sizes: BulkSizes,
+    password_hash: str,
+    seed: int = 0,
+    end: datetime | None = None,
+    batch_size: int = 50000,
+    progress: Callable[[str, int], None] | None = None,
+) -> Dict[str, Any]:
+    """Append ``sizes`` rows on ``connection`` (the caller commits).
+
+    Attempts reference the users and articles generated here, or the
+    existing ones when a size is 0.
+    """
+
+    started = time.monotonic()
+    end = end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    rng = np.random.default_rng(seed)
+    users_table, articles_table = User.__table__, Article.__table__
+
+    first_user = _next_id(connection, users_table)
+    first_article = _next_id(connection, articles_table)
+    written = {
+        "users": _write(
+            connection,
+            users_table,
+            _USER_COLUMNS,
+            _chunks(user_rows(first_user, sizes.users, password_hash), batch_size),
+            progress,
+        ),
+        "articles": _write(
+            connection,
+            articles_table,
+            _ARTICLE_COLUMNS,
+            _chunks(article_rows(first_article, sizes.articles, end - timedelta(days=sizes.days)), batch_size),
+            progress,
+        ),
+    }
+
+    user_ids = _ids(connection, users_table, first_user, sizes.users)
+    article_ids = _ids(connection, articles_table, first_article, sizes.articles)
+    if sizes.attempts and (not len(user_ids) or not len(article_ids)):
+        raise ValueError("Quiz attempts need users and articles")
+    written["attempts"] = _write(
+        connection,
+        QuizAttempt.__table__,
+        _ATTEMPT_COLUMNS,
+        attempt_batches(rng, user_ids, article_ids, sizes.attempts, end, sizes.days, batch_size)
+        if sizes.attempts
+        else iter(()),
+        progress,
+    )
+
+    if connection.dialect.name == "postgresql":
+        # Explicit ids leave the serial sequences behind
+        for table in (users_table, articles_table):
+            connection.execute(
+                text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT MAX(id) FROM {table.name}))")
+            )
+
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    counters.rebuild(db)
+    db.close()
+    connection.execute(text("ANALYZE"))
+
+    written["seconds"] = round(time.monotonic() - started, 1)
+    return written
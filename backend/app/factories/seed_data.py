@@ -60,12 +60,14 @@ def seed_initial_data(db: Session) -> None:
     db.add_all([article1, article2])
     db.flush()
 
-    # Create quiz attempts
+    # Create quiz attempts (finished: nothing left to grade)
+    submitted = datetime.utcnow()
     attempt1 = QuizAttempt(
         userid=user2.id,
         articleid=article2.id,
         score=85.5,
-        submittedat=datetime.utcnow(),
+        submittedat=submitted,
+        gradedat=submitted,
     )
 
     db.add(attempt1)
@@ -1,11 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1 import routes_auth, routes_articles, routes_quiz, routes_admin, routes_health
+from app.api.v1 import routes_auth, routes_articles, routes_quiz, routes_admin, routes_health, routes_jobs
 from app.core.config import settings
 from app.core.logging_config import setup_logging
 from app.core.exceptions import setup_exception_handlers
-from app.db.init_db import init_db, init_data
+from app.core.concurrency import run_blocking, shutdown_executor
+from app.core.security import configure_password_hashing, shutdown_hash_executor
+from app.db.init_db import check_schema
+from app.services import (
+    article_store_service,
+    job_service,
+    pdf_service,
+    search_service,
+    stats_service,
+    wikipedia_service,
+)
 
 
 # def create_app() -> FastAPI:
@@ -32,21 +42,31 @@ app.include_router(routes_auth.router, prefix="/api/v1")
 app.include_router(routes_articles.router, prefix="/api/v1")
 app.include_router(routes_quiz.router, prefix="/api/v1")
 app.include_router(routes_admin.router, prefix="/api/v1")
+app.include_router(routes_jobs.router, prefix="/api/v1")
 
 setup_exception_handlers(app)
 
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
 
-    init_db()
+    await run_blocking(check_schema)
+    await run_blocking(configure_password_hashing)
+    await job_service.start_workers()
+    stats_service.start_flusher()
 
-# return app
-@app.get("/seed")
-def seed_database() -> dict:
-    init_data()
-    # print("Seeding database...")
-    return {"message": "Database seeded successfully"}
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await job_service.stop_workers()
+    await stats_service.stop_flusher()
+    await wikipedia_service.close_client()
+    article_store_service.close()
+    search_service.close()
+    shutdown_executor()
+    shutdown_hash_executor()
+    pdf_service.shutdown_process_pool()
+
+# return app
 # app = create_app()
 
 
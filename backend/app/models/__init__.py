@@ -1,12 +1,19 @@
 from app.models.base import Base
 from app.models.user import User, Role
 from app.models.article import Article
+from app.models.quiz import Quiz
 from app.models.quiz_attempt import QuizAttempt
+from app.models.job import Job, JobStatus
+from app.models.stat_counter import StatCounter
 
 __all__ = [
 	"Base",
 	"User",
 	"Role",
 	"Article",
+	"Quiz",
 	"QuizAttempt",
+	"Job",
+	"JobStatus",
+	"StatCounter",
 ]
@@ -1,18 +1,52 @@
 from datetime import datetime
+from urllib.parse import urlsplit
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
+from app.core.titles import normalize_title
 from app.models.base import Base
 
 
+def article_key(url: str) -> str:
+    """Identity of the article at ``url``: one row per key.
+
+    Wikipedia URLs become ``<host>:<normalized title>`` so mobile links,
+    underscores, percent-encoding, query strings and fragments all name the
+    same page (``normalize_title``, as for the article cache and store).
+    Other URLs are their own key, without the fragment.
+    """
+
+    parts = urlsplit(url)
+    host = (parts.hostname or "").replace(".m.wikipedia.org", ".wikipedia.org")
+    if host.endswith(".wikipedia.org") and parts.path.startswith("/wiki/"):
+        return f"{host}:{normalize_title(parts.path[len('/wiki/'):])}"[:300]
+    return url.split("#", 1)[0][:300]
+
+
+def _default_key(context) -> str:
+    return article_key(context.get_current_parameters()["url"])
+
+
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # Ingest upserts on the key; lookups by URL go through it too.
+        Index("ix_articles_articlekey", "articlekey", unique=True),
+        Index("ix_articles_title", "title"),
+        Index("ix_articles_createdat", "createdat"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String(500), nullable=False)
     title = Column(String(255), nullable=False)
+    # See article_key(); PDF uploads use "upload:<user id>:<sha256 of the file>".
+    # Nullable while releases that do not write it may still run (migration 0005).
+    articlekey = Column(String(300), nullable=True, default=_default_key)
     action = Column(String(50), nullable=False)
     createdat = Column(DateTime, default=datetime.utcnow)
+    # Owner of a PDF upload (only they and admins can read it); None otherwise
+    uploadedby = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     quiz_attempts = relationship("QuizAttempt", back_populates="article")
+    quizzes = relationship("Quiz", back_populates="article")
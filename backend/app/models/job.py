@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+
+from app.models.base import Base
+
+
+class JobStatus(PyEnum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers claim the next job by (status, priority desc, id).
+        Index("ix_jobs_status_priority_id", "status", "priority", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    userid = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    priority = Column(Integer, nullable=False, default=0)
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    createdat = Column(DateTime, default=datetime.utcnow)
+    startedat = Column(DateTime, nullable=True)
+    finishedat = Column(DateTime, nullable=True)
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import relationship
+
+from app.models.base import Base
+
+
+class Quiz(Base):
+    __tablename__ = "quizzes"
+    __table_args__ = (
+        # Attempts are scored against the latest quiz of an article.
+        Index("ix_quizzes_articleid_id", "articleid", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    articleid = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    # QuizContent as generated, open-question reference answers included
+    questions = Column(JSON, nullable=False)
+    # One byte per multiple-choice question: the index of the correct option
+    answerkey = Column(LargeBinary, nullable=False)
+    opencount = Column(Integer, nullable=False, default=0)
+    # SHA-256 of the questions, so regenerating an unchanged quiz adds no row
+    digest = Column(String(64), nullable=False)
+    createdat = Column(DateTime, default=datetime.utcnow)
+
+    article = relationship("Article", back_populates="quizzes")
+    attempts = relationship("QuizAttempt", back_populates="quiz")
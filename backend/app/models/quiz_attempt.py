@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -8,12 +8,26 @@ from app.models.base import Base
 
 class QuizAttempt(Base):
     __tablename__ = "quizattempts"
+    __table_args__ = (
+        # A user's attempts, newest first (history pages)
+        Index("ix_quizattempts_userid_submittedat", "userid", "submittedat"),
+        Index("ix_quizattempts_articleid", "articleid"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     userid = Column(Integer, ForeignKey("users.id"), nullable=False)
     articleid = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    quizid = Column(Integer, ForeignKey("quizzes.id"), nullable=True)
+    # Percentage of points; open answers count once they are graded
     score = Column(Float, nullable=False)
+    mcqcorrect = Column(Integer, nullable=True)
+    # Open answers by question index, kept for grading
+    openanswers = Column(JSON, nullable=True)
+    # Sum of open-answer grades (0..1 each), set when grading finishes
+    openscore = Column(Float, nullable=True)
+    gradedat = Column(DateTime, nullable=True)
     submittedat = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="quiz_attempts")
     article = relationship("Article", back_populates="quiz_attempts")
+    quiz = relationship("Quiz", back_populates="attempts")
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, Float, String
+
+from app.models.base import Base
+
+
+class StatCounter(Base):
+    """Running count and sum of one statistic, kept by app.db.counters."""
+
+    __tablename__ = "statcounters"
+
+    name = Column(String(64), primary_key=True)
+    # "" for the all-time value, otherwise a day ("2024-05-01") or an id
+    key = Column(String(64), primary_key=True, default="")
+    count = Column(BigInteger, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from pydantic import BaseModel, HttpUrl
 
@@ -20,19 +20,36 @@ class ArticleResponse(BaseModel):
         from_attributes = True
 
 
+class ArticleSearchResult(BaseModel):
+    # None for pages indexed from a dump that were never ingested
+    article_id: int | None = None
+    title: str
+    url: str
+    snippet: str  # matched terms wrapped in <mark></mark>
+    score: float
+
+
+class ArticleSearchResponse(BaseModel):
+    query: str
+    results: List[ArticleSearchResult]
+
+
 class SummaryRequest(BaseModel):
     article_id: int
     length: str = "medium"  # short | medium
+    refresh: bool = False  # bypass the LLM result cache
 
 
 class SummaryResponse(BaseModel):
     article_id: int
     summary: str
+    cached: bool = False
 
 
 class WikipediaSummaryRequest(BaseModel):
     url: HttpUrl
     length: str = "medium"  # short | medium
+    refresh: bool = False  # bypass the LLM result cache
 
 
 class WikipediaSummaryResponse(BaseModel):
@@ -40,22 +57,26 @@ class WikipediaSummaryResponse(BaseModel):
     title: str
     length: str
     summary: str
+    cached: bool = False
 
 
 class TranslationRequest(BaseModel):
     article_id: int
     target_language: str  # FR, EN, AR, ES, etc.
+    refresh: bool = False  # bypass the LLM result cache
 
 
 class TranslationResponse(BaseModel):
     article_id: int
     target_language: str
     translated_text: str
+    cached: bool = False
 
 
 class WikipediaTranslationRequest(BaseModel):
     url: HttpUrl
     target_language: str  # FR, EN, AR, ES, etc.
+    refresh: bool = False  # bypass the LLM result cache
 
 
 class WikipediaTranslationResponse(BaseModel):
@@ -63,3 +84,4 @@ class WikipediaTranslationResponse(BaseModel):
     title: str
     target_language: str
     translated_text: str
+    cached: bool = False
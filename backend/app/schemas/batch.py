@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Literal
+
+from pydantic import BaseModel, HttpUrl, model_validator
+
+from app.core.config import settings
+
+
+def _check_batch_size(total: int) -> None:
+    if not total:
+        raise ValueError("Provide at least one item")
+    if total > settings.batch_max_items:
+        raise ValueError(f"A batch holds at most {settings.batch_max_items} items")
+
+
+class _ArticleBatchRequest(BaseModel):
+    # Wikipedia URLs and/or ids of stored articles
+    urls: List[HttpUrl] = []
+    article_ids: List[int] = []
+    refresh: bool = False  # bypass the LLM result cache
+
+    @model_validator(mode="after")
+    def check_size(self):
+        _check_batch_size(len(self.urls) + len(self.article_ids))
+        return self
+
+
+class BatchSummaryRequest(_ArticleBatchRequest):
+    length: str = "medium"  # short | medium
+
+
+class BatchTranslationRequest(_ArticleBatchRequest):
+    target_language: str  # FR, EN, AR, ES, etc.
+
+
+class BatchQuizRequest(BaseModel):
+    urls: List[HttpUrl]
+    refresh: bool = False  # bypass the LLM result cache
+
+    @model_validator(mode="after")
+    def check_size(self):
+        _check_batch_size(len(self.urls))
+        return self
+
+
+class BatchItemResult(BaseModel):
+    # Position of the item in the request: URLs first, then article ids
+    index: int
+    url: HttpUrl | None = None
+    article_id: int | None = None
+    status: Literal["succeeded", "failed"]
+    # Same body as the matching single-item endpoint's response
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+
+
+class BatchSummary(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Dict, Literal
+
+from pydantic import BaseModel, Field
+
+from app.models.job import JobStatus
+
+
+JobKind = Literal["summary", "summary_url", "translation", "translation_url", "quiz"]
+
+
+class JobCreate(BaseModel):
+    kind: JobKind
+    # Same body as the matching synchronous endpoint, e.g. WikipediaSummaryRequest
+    # for "summary_url" or QuizGenerationRequest for "quiz".
+    payload: Dict[str, Any]
+    priority: int = Field(0, ge=-10, le=10)  # higher runs first
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    priority: int
+    createdat: datetime | None = None
+    startedat: datetime | None = None
+    finishedat: datetime | None = None
+    # Same body as the matching synchronous endpoint's response
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,13 @@
 from datetime import datetime
 from typing import List, Dict, Any
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, conint
+
+
+# Submitted indexes; answer keys store option indexes in one byte (255 never
+# matches) and generated quizzes are far smaller than 1000 questions
+QuestionIndex = conint(ge=0, lt=1000)
+OptionIndex = conint(ge=0, lt=255)
 
 
 class MultipleChoiceQuestion(BaseModel):
@@ -15,25 +21,49 @@ class OpenQuestion(BaseModel):
     answer: str
 
 
+class QuizContent(BaseModel):
+    """What the LLM is asked to produce; also the Gemini response schema."""
+
+    multiple_choice: List[MultipleChoiceQuestion]
+    open_questions: List[OpenQuestion]
+
+
 class QuizGenerationRequest(BaseModel):
     url: HttpUrl
+    refresh: bool = False  # bypass the LLM result cache
 
 
 class QuizGenerationResponse(BaseModel):
     url: HttpUrl
     multiple_choice: List[MultipleChoiceQuestion]
     open_questions: List[OpenQuestion]
+    cached: bool = False
+    # The stored quiz that attempts are scored against
+    quiz_id: int | None = None
+    article_id: int | None = None
 
 
 class QuizAttemptCreate(BaseModel):
     article_id: int
-    answers_mcq: Dict[int, int]  # question index -> selected option index
-    answers_open: Dict[int, str]  # question index -> user free-text answer
+    quiz_id: int | None = None  # defaults to the article's latest quiz
+    answers_mcq: Dict[QuestionIndex, OptionIndex]  # question index -> selected option index
+    answers_open: Dict[QuestionIndex, str]  # question index -> user free-text answer
 
 
 class QuizAttemptResponse(BaseModel):
     attempt_id: int
-    score: float
+    quiz_id: int
+    score: float  # percentage; open answers add to it once graded
+    mcq_correct: int
+    mcq_total: int
+    open_total: int
+    grading_pending: bool = False
+
+
+class GradeAttemptRequest(BaseModel):
+    """Payload of the internal job that grades an attempt's open answers."""
+
+    attempt_id: int
 
 
 class QuizAttemptDB(BaseModel):
@@ -1,8 +1,36 @@
+from datetime import date
+from typing import Dict, List
+
 from pydantic import BaseModel
 
 
+class DailyAttempts(BaseModel):
+    day: date
+    attempts: int
+    average_score: float | None = None
+
+
+class ArticleScore(BaseModel):
+    article_id: int
+    attempts: int
+    average_score: float | None = None
+
+
+class DailyCount(BaseModel):
+    day: date
+    count: int
+
+
 class GlobalStatsResponse(BaseModel):
     total_users: int
     total_articles: int
     total_quizzes_generated: int
     total_downloads: int
+    total_quiz_attempts: int = 0
+    average_score: float | None = None
+    # Last ``admin_stats_days`` days, oldest first; days without attempts are omitted
+    attempts_per_day: List[DailyAttempts] = []
+    # Most attempted articles first
+    article_scores: List[ArticleScore] = []
+    # LLM calls per operation and day
+    llm_calls: Dict[str, List[DailyCount]] = {}
@@ -0,0 +1,186 @@
+"""Two-tier cache for raw Wikipedia pages.
+
+Tier 1 is an in-process LRU with TTL; tier 2 is a local SQLite file keyed by
+normalized title and revision id, so a restarted worker does not have to go
+back to Wikipedia for popular articles.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Any
+
+from app.core.cache import TTLCache
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+from app.core.titles import normalize_title
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    title: str
+    url: str
+    revision_id: int
+    content: str
+    fetched_at: float
+
+
+class _PersistentStore:
+    def __init__(self, path: str, ttl: float, max_entries: int) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " title_key TEXT NOT NULL,"
+                " revision_id INTEGER NOT NULL,"
+                " title TEXT NOT NULL,"
+                " url TEXT NOT NULL,"
+                " content BLOB NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (title_key, revision_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_fetched_at ON pages (fetched_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, title_key: str) -> CachedPage | None:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT title, url, revision_id, content, fetched_at FROM pages"
+                " WHERE title_key = ? ORDER BY fetched_at DESC LIMIT 1",
+                (title_key,),
+            ).fetchone()
+            if row is None or row[4] + self.ttl < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        title, url, revision_id, content, fetched_at = row
+        return CachedPage(
+            title=title,
+            url=url,
+            revision_id=revision_id,
+            content=zlib.decompress(content).decode("utf-8"),
+            fetched_at=fetched_at,
+        )
+
+    def put(self, title_key: str, page: CachedPage) -> None:
+        blob = zlib.compress(page.content.encode("utf-8"))
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # Only the latest revision of a title is worth keeping.
+                conn.execute(
+                    "DELETE FROM pages WHERE title_key = ? AND revision_id <> ?",
+                    (title_key, page.revision_id),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages"
+                    " (title_key, revision_id, title, url, content, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (title_key, page.revision_id, page.title, page.url, blob, page.fetched_at),
+                )
+                overflow = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM pages WHERE rowid IN"
+                        " (SELECT rowid FROM pages ORDER BY fetched_at ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self.evictions += overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM pages")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_memory = TTLCache(
+    maxsize=settings.article_cache_max_entries,
+    ttl=settings.article_cache_ttl_seconds,
+)
+_store: _PersistentStore | None = (
+    _PersistentStore(
+        settings.article_cache_path,
+        ttl=settings.article_cache_persistent_ttl_seconds,
+        max_entries=settings.article_cache_persistent_max_entries,
+    )
+    if settings.article_cache_path
+    else None
+)
+
+
+async def get(title_key: str) -> CachedPage | None:
+    page = _memory.get(title_key)
+    if page is not None:
+        return page
+
+    if _store is None:
+        return None
+
+    try:
+        page = await run_blocking(_store.get, title_key)
+    except sqlite3.Error:
+        logger.exception("[article_cache] Persistent lookup failed for %r", title_key)
+        return None
+
+    if page is not None:
+        _memory.set(title_key, page)
+    return page
+
+
+async def put(title_key: str, page: CachedPage) -> None:
+    """Store a page under the requested key and its canonical title."""
+
+    canonical_key = normalize_title(page.title)
+    for key in {title_key, canonical_key}:
+        _memory.set(key, page)
+        if _store is None:
+            continue
+        try:
+            await run_blocking(_store.put, key, page)
+        except sqlite3.Error:
+            logger.exception("[article_cache] Persistent write failed for %r", key)
+
+
+def clear() -> None:
+    _memory.clear()
+    if _store is not None:
+        _store.clear()
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        "memory": _memory.stats(),
+        "persistent": _store.stats() if _store is not None else None,
+    }
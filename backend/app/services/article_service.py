@@ -0,0 +1,84 @@
+"""Article rows: one per article identity (``Article.articlekey``).
+
+Ingest paths call ``upsert_article`` instead of adding rows, so fetching,
+quizzing or uploading the same article again reuses its row. The insert is
+``ON CONFLICT DO NOTHING`` on the unique key, which stays correct when two
+requests ingest the same article at once.
+
+PDF uploads belong to their uploader: each user gets their own row for a
+file, and only they (and admins) can read it (``can_read``).
+"""
+
+from datetime import datetime
+from typing import Any, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import counters
+from app.models.article import Article, article_key
+from app.models.user import Role
+
+# URL scheme of PDF uploads
+UPLOAD_URL_PREFIX = "upload://"
+
+
+def upload_key(digest: str, user_id: int) -> str:
+    return f"upload:{user_id}:{digest}"
+
+
+def can_read(article: Article, user: Any) -> bool:
+    """Whether ``user`` may use ``article``: uploads are private to their uploader.
+
+    Uploads recorded before uploaders were (no ``uploadedby``) are admin-only.
+    """
+
+    if user.role == Role.ADMIN:
+        return True
+    if article.uploadedby is None and not article.url.startswith(UPLOAD_URL_PREFIX):
+        return True
+    return article.uploadedby == user.id
+
+
+def unreadable_ids(db: Session, article_ids: Iterable[int], user: Any) -> List[int]:
+    """Those of ``article_ids`` that ``user`` may not read (missing ids are not included)."""
+
+    ids = set(article_ids)
+    if not ids or user.role == Role.ADMIN:
+        return []
+    articles = db.execute(select(Article).where(Article.id.in_(ids))).scalars()
+    return sorted(article.id for article in articles if not can_read(article, user))
+
+
+def upsert_article(
+    db: Session, url: str, title: str, action: str, key: str | None = None, uploaded_by: int | None = None
+) -> int:
+    """Id of the article identified by ``key`` (``article_key(url)`` by default), created if new.
+
+    An existing row keeps its URL, title, action and uploader. Not committed.
+    """
+
+    key = key or article_key(url)
+    table = Article.__table__
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    inserted = db.execute(
+        insert(table)
+        .values(
+            url=url,
+            title=(title or url)[:255],
+            articlekey=key,
+            action=action,
+            createdat=datetime.utcnow(),
+            uploadedby=uploaded_by,
+        )
+        .on_conflict_do_nothing(index_elements=[table.c.articlekey])
+        .returning(table.c.id)
+    ).scalar()
+    if inserted is not None:
+        # Core inserts bypass the ORM flush that keeps the counters
+        counters.apply(db.connection(), {(counters.ARTICLES, ""): [1, 0.0]})
+        return inserted
+    return db.execute(select(Article.id).where(Article.articlekey == key)).scalar_one()
@@ -0,0 +1,201 @@
+"""Local article store built from a Wikipedia dump.
+
+Two files under ``settings.article_store_path``:
+
+- ``articles.dat``: zlib-compressed page texts, appended one after another.
+- ``index.sqlite3``: normalized title -> (offset, length) of the page in
+  ``articles.dat``, with its title, URL and revision id. Redirects are index
+  rows that point at another title instead of at data.
+
+A lookup is one primary-key read of the index and one ``pread`` of the
+compressed bytes, so articles are served without any network call.
+``ArticleStoreWriter`` only appends; re-importing a title points its index
+row at the new copy.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Tuple
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+from app.services.article_cache_service import CachedPage, normalize_title
+
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "articles.dat"
+INDEX_FILE = "index.sqlite3"
+
+# Import is bound by compression: level 3 is ~3x faster than the default
+# for ~15% more bytes, and decompression speed is the same
+_COMPRESSION_LEVEL = 3
+
+# Redirect chains longer than this are treated as missing pages
+_MAX_REDIRECTS = 3
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS pages ("
+    " title_key TEXT PRIMARY KEY,"
+    " title TEXT NOT NULL,"
+    " url TEXT NOT NULL,"
+    " revision_id INTEGER NOT NULL,"
+    # NULL offset: a redirect to redirect_key
+    " data_offset INTEGER,"
+    " data_length INTEGER,"
+    " redirect_key TEXT)"
+)
+
+
+class ArticleStoreWriter:
+    """Append pages to a store; index rows are written in batches."""
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        os.makedirs(path, exist_ok=True)
+        self._data = open(os.path.join(path, DATA_FILE), "ab")
+        self._offset = self._data.tell()
+        self._index = sqlite3.connect(os.path.join(path, INDEX_FILE))
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute(_SCHEMA)
+        self._batch_size = batch_size
+        self._rows: List[Tuple[Any, ...]] = []
+        self.pages = 0
+        self.redirects = 0
+
+    def add(self, title: str, url: str, revision_id: int, content: str) -> None:
+        blob = zlib.compress(content.encode("utf-8"), _COMPRESSION_LEVEL)
+        self._data.write(blob)
+        self._rows.append((normalize_title(title), title, url, revision_id, self._offset, len(blob), None))
+        self._offset += len(blob)
+        self.pages += 1
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def add_redirect(self, title: str, target: str, url: str) -> None:
+        self._rows.append((normalize_title(title), title, url, 0, None, None, normalize_title(target)))
+        self.redirects += 1
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        # Data first, so no index row ever points past the end of the file
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        with self._index:
+            self._index.executemany(
+                "INSERT OR REPLACE INTO pages"
+                " (title_key, title, url, revision_id, data_offset, data_length, redirect_key)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._rows,
+            )
+        self._rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> "ArticleStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ArticleStore:
+    """Read-only view of a store; safe to share between threads."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._fd = os.open(os.path.join(path, DATA_FILE), os.O_RDONLY)
+        self._index = sqlite3.connect(
+            f"file:{os.path.join(path, INDEX_FILE)}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def get(self, title_key: str) -> CachedPage | None:
+        with self._lock:
+            for _ in range(_MAX_REDIRECTS + 1):
+                row = self._index.execute(
+                    "SELECT title, url, revision_id, data_offset, data_length, redirect_key"
+                    " FROM pages WHERE title_key = ?",
+                    (title_key,),
+                ).fetchone()
+                if row is None or row[3] is not None:
+                    break
+                title_key = row[5]
+            else:
+                row = None
+            if row is None or row[3] is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        title, url, revision_id, offset, length, _ = row
+        return CachedPage(
+            title=title,
+            url=url,
+            revision_id=revision_id,
+            content=zlib.decompress(os.pread(self._fd, length, offset)).decode("utf-8"),
+            fetched_at=time.time(),
+        )
+
+    def close(self) -> None:
+        os.close(self._fd)
+        self._index.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "hits": self.hits, "misses": self.misses}
+
+
+_store: ArticleStore | None = None
+_store_lock = threading.Lock()
+
+
+def _open_store() -> ArticleStore | None:
+    global _store
+
+    path = settings.article_store_path
+    store = _store
+    if store is not None and store.path == path:
+        return store
+    if not path or not os.path.exists(os.path.join(path, INDEX_FILE)):
+        return None
+    with _store_lock:
+        if _store is None or _store.path != path:
+            if _store is not None:
+                _store.close()
+            _store = ArticleStore(path)
+        return _store
+
+
+async def get(title: str) -> CachedPage | None:
+    """The stored page for ``title`` (following redirects), or ``None``."""
+
+    store = _open_store()
+    if store is None:
+        return None
+    try:
+        return await run_blocking(store.get, normalize_title(title))
+    except (OSError, sqlite3.Error, zlib.error):
+        logger.exception("[article_store] Lookup failed for %r", title)
+        return None
+
+
+def close() -> None:
+    global _store
+
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def get_stats() -> Dict[str, Any] | None:
+    return _store.stats() if _store is not None else None
@@ -0,0 +1,137 @@
+"""Batch runs of the summary, translation and quiz pipelines.
+
+A batch is a list of single-endpoint requests, using the same kinds and
+payloads as background jobs. Items start in request order. Results are
+yielded as they complete, and each one reports its own success or error, so
+one bad URL does not fail the rest.
+
+Two limits apply. ``settings.batch_concurrency`` caps the items running at
+once in a batch. ``settings.batch_max_concurrency`` caps them across every
+batch in the process; that is the budget for LLM calls. Wikipedia pages for
+waiting items are fetched ahead of the budget
+(``settings.batch_fetch_concurrency`` at a time) into the article cache, so
+an item only holds a budget slot while it does LLM work.
+"""
+
+import asyncio
+import logging
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Sequence, Tuple
+
+from app.core.config import settings
+from app.schemas.batch import BatchItemResult, BatchSummary
+from app.services import job_service, wikipedia_service
+
+
+logger = logging.getLogger(__name__)
+
+# One budget per event loop: a single loop in production, several in tests.
+_budgets: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_counters: Counter = Counter()
+
+
+@dataclass
+class BatchItem:
+    kind: str  # job kind, e.g. "summary_url"
+    payload: Dict[str, Any]
+
+
+def article_items(
+    urls: Iterable[Any], article_ids: Iterable[int], url_kind: str, id_kind: str, **params: Any
+) -> List[BatchItem]:
+    """Build the items of a batch over Wikipedia URLs, then stored article ids."""
+
+    return [BatchItem(url_kind, {"url": str(url), **params}) for url in urls] + [
+        BatchItem(id_kind, {"article_id": article_id, **params}) for article_id in article_ids
+    ]
+
+
+def _budget() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    budget = _budgets.get(loop)
+    if budget is None:
+        budget = _budgets[loop] = asyncio.Semaphore(max(1, settings.batch_max_concurrency))
+    return budget
+
+
+async def _run_item(
+    item: BatchItem, batch_slots: asyncio.Semaphore, fetch_slots: asyncio.Semaphore
+) -> Tuple[Dict[str, Any] | None, str | None]:
+    try:
+        url = item.payload.get("url")
+        if url is not None:
+            async with fetch_slots:
+                await wikipedia_service.get_page(wikipedia_service.extract_title_from_url(url))
+
+        async with batch_slots, _budget():
+            _counters["running"] += 1
+            try:
+                result = await asyncio.wait_for(
+                    job_service.run_request(item.kind, item.payload),
+                    timeout=settings.batch_item_timeout_seconds,
+                )
+            finally:
+                _counters["running"] -= 1
+        return result, None
+    except asyncio.TimeoutError:
+        return None, f"Timed out after {settings.batch_item_timeout_seconds:g} seconds"
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("[batch] %s item failed: %s", item.kind, exc)
+        return None, str(exc) or type(exc).__name__
+
+
+async def run_batch(items: Sequence[BatchItem]) -> AsyncIterator[Tuple[int, Dict[str, Any] | None, str | None]]:
+    """Yield ``(index, result, error)`` for each item as it completes.
+
+    Closing the generator (e.g. the client disconnected) cancels the items
+    that have not finished.
+    """
+
+    batch_slots = asyncio.Semaphore(max(1, settings.batch_concurrency))
+    fetch_slots = asyncio.Semaphore(max(1, settings.batch_fetch_concurrency))
+
+    async def run(index: int, item: BatchItem) -> Tuple[int, Dict[str, Any] | None, str | None]:
+        return (index, *await _run_item(item, batch_slots, fetch_slots))
+
+    _counters["batches"] += 1
+    tasks = [asyncio.ensure_future(run(index, item)) for index, item in enumerate(items)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            index, result, error = await finished
+            _counters["failed" if error is not None else "succeeded"] += 1
+            yield index, result, error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def stream_batch(items: Sequence[BatchItem]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield an ``("item", BatchItemResult)`` event per completed item, then
+    ``("done", BatchSummary)``."""
+
+    failed = 0
+    async for index, result, error in run_batch(items):
+        failed += error is not None
+        payload = items[index].payload
+        yield "item", BatchItemResult(
+            index=index,
+            url=payload.get("url"),
+            article_id=payload.get("article_id"),
+            status="failed" if error is not None else "succeeded",
+            result=result,
+            error=error,
+        ).model_dump(mode="json")
+
+    yield "done", BatchSummary(total=len(items), succeeded=len(items) - failed, failed=failed).model_dump()
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        "budget": settings.batch_max_concurrency,
+        "running": _counters["running"],
+        "batches": _counters["batches"],
+        "succeeded": _counters["succeeded"],
+        "failed": _counters["failed"],
+    }
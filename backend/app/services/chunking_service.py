@@ -0,0 +1,91 @@
+import re
+from typing import Callable, Iterable, List
+
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+Size = Callable[[str], int]
+
+
+def _hard_split(text: str, max_size: int, size: Size) -> List[str]:
+    pieces: List[str] = []
+    while size(text) > max_size:
+        # Cut proportionally, then shrink until the piece fits.
+        cut = max(1, len(text) * max_size // size(text))
+        while cut > 1 and size(text[:cut]) > max_size:
+            cut = max(1, cut * 9 // 10)
+        pieces.append(text[:cut])
+        text = text[cut:]
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+def split_text(text: str, max_size: int, size: Size = len) -> List[str]:
+    """Split an oversized block on sentence boundaries.
+
+    ``size`` measures text (characters by default, or estimated tokens).
+    Sentences larger than ``max_size`` are hard-split as a last resort.
+    """
+
+    pieces: List[str] = []
+    current = ""
+    current_size = 0
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence_size = size(sentence)
+        if sentence_size > max_size:
+            if current:
+                pieces.append(current)
+                current = ""
+                current_size = 0
+            *head, sentence = _hard_split(sentence, max_size, size)
+            pieces.extend(head)
+            sentence_size = size(sentence)
+
+        if current and current_size + size(" ") + sentence_size > max_size:
+            pieces.append(current)
+            current = sentence
+            current_size = sentence_size
+        else:
+            current_size += size(" ") + sentence_size if current else sentence_size
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_sections(sections: Iterable[str], max_size: int, size: Size = len) -> List[str]:
+    """Pack consecutive sections into chunks of at most ``max_size``.
+
+    ``size`` measures text (characters by default, or estimated tokens).
+    Section boundaries are preserved whenever a section fits in a chunk;
+    only sections larger than the budget are split further.
+    """
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    separator_size = size("\n\n")
+
+    for text in sections:
+        if not text:
+            continue
+
+        text_size = size(text)
+        blocks = [(text, text_size)] if text_size <= max_size else [
+            (block, size(block)) for block in split_text(text, max_size, size)
+        ]
+        for block, block_size in blocks:
+            added = block_size + (separator_size if current else 0)
+            if current and current_size + added > max_size:
+                chunks.append("\n\n".join(current))
+                current = []
+                current_size = 0
+                added = block_size
+            current.append(block)
+            current_size += added
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
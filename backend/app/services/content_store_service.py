@@ -0,0 +1,42 @@
+"""Local store for processed article content (e.g. text extracted from PDFs).
+
+Content is written as one JSON file per article id under
+``settings.processed_content_dir`` and has the same shape as
+``wikipedia_service.fetch_article_sections``.
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+
+
+def _path(article_id: int) -> str:
+    return os.path.join(settings.processed_content_dir, f"{article_id}.json")
+
+
+def _write(article_id: int, article_data: Dict[str, Any]) -> None:
+    os.makedirs(settings.processed_content_dir, exist_ok=True)
+    path = _path(article_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(article_data, handle, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read(article_id: int) -> Dict[str, Any] | None:
+    try:
+        with open(_path(article_id), encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+async def save(article_id: int, article_data: Dict[str, Any]) -> None:
+    await run_blocking(_write, article_id, article_data)
+
+
+async def load(article_id: int) -> Dict[str, Any] | None:
+    return await run_blocking(_read, article_id)
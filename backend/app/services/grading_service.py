@@ -0,0 +1,149 @@
+"""Open-answer grading by local text similarity.
+
+Answers and reference answers become TF-IDF vectors over character
+n-grams of their words (robust to typos, plurals and word order). A
+batch is vectorized in one pass with NumPy: n-grams are rolling hashes
+of the code points, every (document, n-gram) weight is one entry of flat
+arrays, and the cosine of each (reference, answer) pair is a single
+sparse dot product over them, so a class's submissions grade in
+milliseconds without any network call.
+
+IDF is computed over the distinct reference answers of the batch, so
+n-grams that every reference shares ("the ", "tion") count less than the
+ones that tell them apart.
+
+A similarity at or above ``grading_accept_similarity`` earns full credit
+and one at or below ``grading_reject_similarity`` none; in between the
+credit is linear. With ``grading_llm_escalation`` on, those borderline
+answers are sent to the LLM router in one call and its grades win.
+"""
+
+import logging
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import llm_router_service
+
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# (question, reference answer, student answer)
+GradingItem = Tuple[str, str, str]
+
+# Multiplier of the rolling n-gram hash (wraps around in uint64)
+_HASH_BASE = np.uint64(1_000_003)
+
+
+def _normalize(text: str) -> str:
+    words = _WORD.findall(text.lower())
+    return f" {' '.join(words)} " if words else ""
+
+
+def _ngrams(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(document index, n-gram hash) of every character n-gram in ``texts``."""
+
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    position_document = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    documents, hashes = [], []
+    for size in range(settings.grading_ngram_min, settings.grading_ngram_max + 1):
+        windows = codes.size - size + 1
+        if windows <= 0:
+            break
+        value = np.full(windows, size, dtype=np.uint64)
+        for offset in range(size):
+            value = value * _HASH_BASE + codes[offset:offset + windows]
+        # Drop windows that straddle two documents
+        inside = position_document[:windows] == position_document[size - 1:size - 1 + windows]
+        documents.append(position_document[:windows][inside])
+        hashes.append(value[inside])
+    if not documents:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+    return np.concatenate(documents), np.concatenate(hashes)
+
+
+def similarities(pairs: List[Tuple[str, str]]) -> np.ndarray:
+    """Cosine similarity of each ``(reference, answer)`` pair, from 0 to 1."""
+
+    count = len(pairs)
+    if not count:
+        return np.zeros(0)
+
+    # Documents 0..count-1 are the references, count..2*count-1 the answers
+    # References repeat across a class's attempts; normalize each text once
+    normalized: Dict[str, str] = {}
+    texts = []
+    for text in [reference for reference, _ in pairs] + [answer for _, answer in pairs]:
+        if text not in normalized:
+            normalized[text] = _normalize(text)
+        texts.append(normalized[text])
+    documents, hashes = _ngrams(texts)
+    _, tokens = np.unique(hashes, return_inverse=True)
+    size = int(tokens.max()) + 1 if tokens.size else 1
+
+    # Term frequency of every (document, n-gram)
+    keys, frequency = np.unique(documents * size + tokens, return_counts=True)
+    document, token = keys // size, keys % size
+
+    # Each distinct reference counts once towards document frequency
+    _, first = np.unique(texts[:count], return_index=True)
+    reference_keys = keys[np.isin(document, first)]
+    document_frequency = np.bincount(reference_keys % size, minlength=size)
+    idf = np.log((1 + first.size) / (1 + document_frequency)) + 1
+
+    weight = (1 + np.log(frequency)) * idf[token]
+    norm = np.sqrt(np.bincount(document, weights=weight**2, minlength=2 * count))
+    weight /= np.where(norm > 0, norm, 1)[document]
+
+    # Dot product of each pair: join reference and answer entries on (pair, n-gram)
+    is_answer = document >= count
+    pair_keys = (document % count) * size + token
+    _, in_reference, in_answer = np.intersect1d(
+        pair_keys[~is_answer], pair_keys[is_answer], assume_unique=True, return_indices=True
+    )
+    products = weight[~is_answer][in_reference] * weight[is_answer][in_answer]
+    pairs_hit = document[~is_answer][in_reference]
+    return np.clip(np.bincount(pairs_hit, weights=products, minlength=count), 0.0, 1.0)
+
+
+def credit(similarity: np.ndarray) -> np.ndarray:
+    """Map similarities to grades from 0 to 1."""
+
+    low, high = settings.grading_reject_similarity, settings.grading_accept_similarity
+    return np.clip((similarity - low) / max(high - low, 1e-9), 0.0, 1.0)
+
+
+def grade_locally(items: List[GradingItem]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (grades, borderline mask) for ``items`` without any LLM call."""
+
+    similarity = similarities([(reference, answer) for _, reference, answer in items])
+    low, high = settings.grading_reject_similarity, settings.grading_accept_similarity
+    return credit(similarity), (similarity > low) & (similarity < high)
+
+
+async def grade_answers(items: List[GradingItem]) -> List[float]:
+    """Grade student answers from 0 to 1 against their reference answers."""
+
+    if not items:
+        return []
+    grades, borderline = grade_locally(items)
+
+    escalate = np.flatnonzero(borderline)
+    if settings.grading_llm_escalation and escalate.size:
+        try:
+            llm_grades = await llm_router_service.grade_answers([items[index] for index in escalate])
+        except Exception as exc:  # noqa: BLE001
+            # The local grades stand when no provider can help.
+            logger.warning("[grading] LLM escalation of %s answers failed: %s", escalate.size, exc)
+        else:
+            for index, grade in zip(escalate, llm_grades):
+                if grade is not None:
+                    grades[index] = grade
+
+    return [round(float(grade), 3) for grade in grades]
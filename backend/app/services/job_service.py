@@ -0,0 +1,449 @@
+"""Background job queue for long-running LLM operations.
+
+Jobs are rows in the ``jobs`` table, so the queue survives restarts and needs
+no external broker. Each API process runs ``settings.job_workers`` asyncio
+workers that claim the next queued job (highest priority first, then FIFO),
+skipping users who already have ``settings.job_max_running_per_user`` jobs
+running, and run it through the same pipelines as the synchronous endpoints.
+A finished job stores the same body that endpoint would have returned.
+
+Claims are a conditional UPDATE on ``status``, so several processes can share
+the table; the per-user cap is exact within a process and best-effort across
+processes.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.article import Article
+from app.models.job import Job, JobStatus
+from app.schemas.article import (
+    SummaryRequest,
+    SummaryResponse,
+    TranslationRequest,
+    TranslationResponse,
+    WikipediaSummaryRequest,
+    WikipediaSummaryResponse,
+    WikipediaTranslationRequest,
+    WikipediaTranslationResponse,
+)
+from app.schemas.job import JobResponse
+from app.schemas.quiz import GradeAttemptRequest, QuizGenerationRequest, QuizGenerationResponse
+from app.services import pipeline_service, quiz_service
+
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+_claim_lock = threading.Lock()
+_workers: List[asyncio.Task] = []
+_loop: asyncio.AbstractEventLoop | None = None
+_wakeup: asyncio.Event | None = None
+# Per-job events set when a worker in this process changes the job's status
+_listeners: Dict[int, asyncio.Event] = {}
+_counters: Counter = Counter()
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+async def _article_title(article_id: int) -> str:
+    def query() -> str | None:
+        db = SessionLocal()
+        try:
+            article = db.get(Article, article_id)
+            return article.title if article else None
+        finally:
+            db.close()
+
+    title = await run_blocking(query)
+    if title is None:
+        raise LookupError(f"Article {article_id} not found")
+    return title
+
+
+async def _run_summary(request: SummaryRequest) -> Dict[str, Any]:
+    title = await _article_title(request.article_id)
+    result = await pipeline_service.summarize_stored_article(
+        request.article_id, title, request.length, refresh=request.refresh
+    )
+    return SummaryResponse(
+        article_id=request.article_id,
+        summary=result["summary"],
+        cached=result["cached"],
+    ).model_dump(mode="json")
+
+
+async def _run_summary_url(request: WikipediaSummaryRequest) -> Dict[str, Any]:
+    result = await pipeline_service.summarize_url(str(request.url), request.length, refresh=request.refresh)
+    return WikipediaSummaryResponse(
+        url=request.url,
+        title=result["title"],
+        length=request.length,
+        summary=result["summary"],
+        cached=result["cached"],
+    ).model_dump(mode="json")
+
+
+async def _run_translation(request: TranslationRequest) -> Dict[str, Any]:
+    title = await _article_title(request.article_id)
+    result = await pipeline_service.translate_stored_article(
+        request.article_id, title, request.target_language, refresh=request.refresh
+    )
+    return TranslationResponse(
+        article_id=request.article_id,
+        target_language=request.target_language,
+        translated_text=result["translated_text"],
+        cached=result["cached"],
+    ).model_dump(mode="json")
+
+
+async def _run_translation_url(request: WikipediaTranslationRequest) -> Dict[str, Any]:
+    result = await pipeline_service.translate_url(
+        str(request.url), request.target_language, refresh=request.refresh
+    )
+    return WikipediaTranslationResponse(
+        url=request.url,
+        title=result["title"],
+        target_language=request.target_language,
+        translated_text=result["translated_text"],
+        cached=result["cached"],
+    ).model_dump(mode="json")
+
+
+async def _run_quiz(request: QuizGenerationRequest) -> Dict[str, Any]:
+    result = await pipeline_service.generate_quiz_for_url(str(request.url), refresh=request.refresh)
+    quiz_id, article_id = await quiz_service.store_quiz(str(request.url), result["title"], result)
+    return QuizGenerationResponse(
+        url=request.url,
+        multiple_choice=result["multiple_choice"],
+        open_questions=result["open_questions"],
+        cached=result["cached"],
+        quiz_id=quiz_id,
+        article_id=article_id,
+    ).model_dump(mode="json")
+
+
+async def _run_grading(request: GradeAttemptRequest) -> Dict[str, Any]:
+    return await quiz_service.grade_attempt(request.attempt_id)
+
+
+# kind -> (request schema of the matching endpoint, handler)
+_HANDLERS: Dict[str, Tuple[Type[BaseModel], Callable[[Any], Awaitable[Dict[str, Any]]]]] = {
+    "summary": (SummaryRequest, _run_summary),
+    "summary_url": (WikipediaSummaryRequest, _run_summary_url),
+    "translation": (TranslationRequest, _run_translation),
+    "translation_url": (WikipediaTranslationRequest, _run_translation_url),
+    "quiz": (QuizGenerationRequest, _run_quiz),
+    # Queued by quiz_service.submit_attempt, not by users
+    quiz_service.GRADING_JOB_KIND: (GradeAttemptRequest, _run_grading),
+}
+
+
+def validate_payload(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate ``payload`` against the request schema for ``kind``.
+
+    Raises ``pydantic.ValidationError`` if it does not match.
+    """
+
+    request_model, _ = _HANDLERS[kind]
+    return request_model.model_validate(payload).model_dump(mode="json")
+
+
+async def run_request(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one ``kind`` request inline and return the endpoint's response body."""
+
+    request_model, handler = _HANDLERS[kind]
+    return await handler(request_model.model_validate(payload))
+
+
+def wake_workers() -> None:
+    if _loop is not None and _wakeup is not None:
+        _loop.call_soon_threadsafe(_wakeup.set)
+
+
+def check_pending_limit(db: Session, user_id: int) -> None:
+    """Raise ``JobQueueFullError`` if the user has ``job_max_pending_per_user`` jobs of any kind.
+
+    Grading jobs queued by quiz attempts count too; the attempt route checks
+    this before queueing one.
+    """
+
+    pending = (
+        db.query(func.count(Job.id))
+        .filter(Job.userid == user_id, Job.status.in_((JobStatus.QUEUED, JobStatus.RUNNING)))
+        .scalar()
+    )
+    if pending >= settings.job_max_pending_per_user:
+        raise JobQueueFullError(
+            f"Too many pending jobs (limit {settings.job_max_pending_per_user}); wait for some to finish"
+        )
+
+
+def submit_job(db: Session, user_id: int, kind: str, payload: Dict[str, Any], priority: int = 0) -> Job:
+    check_pending_limit(db, user_id)
+    job = Job(userid=user_id, kind=kind, payload=payload, priority=priority, status=JobStatus.QUEUED)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _counters["submitted"] += 1
+    wake_workers()
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Job | None:
+    return db.get(Job, job_id)
+
+
+def _snapshot(job_id: int) -> Dict[str, Any] | None:
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        return JobResponse.model_validate(job).model_dump(mode="json") if job else None
+    finally:
+        db.close()
+
+
+def _claim_next() -> Tuple[int, str, Dict[str, Any]] | None:
+    """Mark the next eligible queued job as running and return it."""
+
+    # Serialize claims within the process so the per-user cap is exact here.
+    with _claim_lock:
+        db = SessionLocal()
+        try:
+            busy_users = (
+                select(Job.userid)
+                .where(Job.status == JobStatus.RUNNING)
+                .group_by(Job.userid)
+                .having(func.count(Job.id) >= settings.job_max_running_per_user)
+            )
+            # Retry a few times if another process claims the same row first.
+            for _ in range(3):
+                candidate = (
+                    db.query(Job.id, Job.kind, Job.payload)
+                    .filter(Job.status == JobStatus.QUEUED, Job.userid.not_in(busy_users))
+                    .order_by(Job.priority.desc(), Job.id)
+                    .first()
+                )
+                if candidate is None:
+                    return None
+
+                claimed = (
+                    db.query(Job)
+                    .filter(Job.id == candidate.id, Job.status == JobStatus.QUEUED)
+                    .update(
+                        {
+                            Job.status: JobStatus.RUNNING,
+                            Job.startedat: datetime.utcnow(),
+                            Job.attempts: Job.attempts + 1,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if claimed:
+                    return candidate.id, candidate.kind, candidate.payload
+            return None
+        finally:
+            db.close()
+
+
+def _finish(job_id: int, result: Dict[str, Any] | None, error: str | None) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id).update(
+            {
+                Job.status: JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED,
+                Job.result: result,
+                Job.error: error,
+                Job.finishedat: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _requeue(job_id: int) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id, Job.status == JobStatus.RUNNING).update(
+            {Job.status: JobStatus.QUEUED, Job.startedat: None},
+            synchronize_session=False,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def requeue_stale_jobs() -> int:
+    """Recover jobs left running by a process that died mid-job.
+
+    A job still running past the timeout cannot be owned by a live worker,
+    so it is queued again, or failed once it has used up its attempts.
+    """
+
+    cutoff = datetime.utcnow() - timedelta(
+        seconds=settings.job_timeout_seconds + settings.job_poll_interval_seconds
+    )
+    db = SessionLocal()
+    try:
+        stale = db.query(Job).filter(Job.status == JobStatus.RUNNING, Job.startedat < cutoff)
+        failed = stale.filter(Job.attempts >= settings.job_max_attempts).update(
+            {
+                Job.status: JobStatus.FAILED,
+                Job.error: "Job was interrupted too many times",
+                Job.finishedat: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+        requeued = stale.filter(Job.attempts < settings.job_max_attempts).update(
+            {Job.status: JobStatus.QUEUED, Job.startedat: None},
+            synchronize_session=False,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    if failed or requeued:
+        logger.warning("[jobs] Recovered stale jobs: %s requeued, %s failed", requeued, failed)
+    return requeued
+
+
+def _notify(job_id: int) -> None:
+    event = _listeners.pop(job_id, None)
+    if event is not None:
+        event.set()
+
+
+async def _execute(job_id: int, kind: str, payload: Dict[str, Any]) -> None:
+    _notify(job_id)
+    _counters["active"] += 1
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    try:
+        result = await asyncio.wait_for(run_request(kind, payload), timeout=settings.job_timeout_seconds)
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back to the queue for the next worker.
+        await run_blocking(_requeue, job_id)
+        raise
+    except asyncio.TimeoutError:
+        error = f"Job timed out after {settings.job_timeout_seconds:g} seconds"
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("[jobs] Job %s (%s) failed", job_id, kind)
+        error = str(exc) or type(exc).__name__
+    finally:
+        _counters["active"] -= 1
+
+    await run_blocking(_finish, job_id, result, error)
+    _counters["failed" if error is not None else "succeeded"] += 1
+    _notify(job_id)
+    # The user's running slot is free again.
+    _wakeup.set()
+
+
+async def _worker() -> None:
+    while True:
+        _wakeup.clear()
+        try:
+            claimed = await run_blocking(_claim_next)
+        except Exception:  # noqa: BLE001
+            logger.exception("[jobs] Failed to claim a job")
+            claimed = None
+
+        if claimed is None:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=settings.job_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await _execute(*claimed)
+
+
+async def _reaper() -> None:
+    while True:
+        try:
+            await run_blocking(requeue_stale_jobs)
+        except Exception:  # noqa: BLE001
+            logger.exception("[jobs] Failed to recover stale jobs")
+        await asyncio.sleep(settings.job_timeout_seconds)
+
+
+async def start_workers() -> None:
+    global _loop, _wakeup
+
+    if _workers or settings.job_workers <= 0:
+        return
+
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    _workers.append(asyncio.create_task(_reaper()))
+    _workers.extend(asyncio.create_task(_worker()) for _ in range(settings.job_workers))
+    logger.info("[jobs] Started %s job workers", settings.job_workers)
+
+
+async def stop_workers() -> None:
+    global _loop, _wakeup
+
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _listeners.clear()
+    _loop = None
+    _wakeup = None
+
+
+async def watch(job_id: int) -> AsyncIterator[Dict[str, Any]]:
+    """Yield job snapshots on every status change until the job finishes.
+
+    Changes made by this process wake the watcher immediately; the table is
+    also re-read every ``settings.job_poll_interval_seconds`` to pick up jobs
+    run by other processes.
+    """
+
+    last_status = None
+    changed = None
+    try:
+        while True:
+            changed = _listeners.setdefault(job_id, asyncio.Event())
+            snapshot = await run_blocking(_snapshot, job_id)
+            if snapshot is None:
+                return
+            if snapshot["status"] != last_status:
+                last_status = snapshot["status"]
+                yield snapshot
+            if JobStatus(last_status) in TERMINAL_STATUSES:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=settings.job_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if changed is not None and _listeners.get(job_id) is changed:
+            del _listeners[job_id]
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        "workers": max(0, len(_workers) - 1),
+        "active": _counters["active"],
+        "submitted": _counters["submitted"],
+        "succeeded": _counters["succeeded"],
+        "failed": _counters["failed"],
+    }
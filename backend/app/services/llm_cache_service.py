@@ -0,0 +1,180 @@
+"""Persistent cache of LLM results (summaries, translations, quizzes).
+
+Results are keyed by a hash of the input content together with the
+operation, model name, variant (summary length / target language) and prompt
+version, and stored in a local SQLite file whose total size is bounded by
+evicting the least recently used rows.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(operation: str, content: str, model: str, variant: str, prompt_version: str) -> str:
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return "|".join([operation, model, variant, prompt_version, content_hash])
+
+
+class _ResultStore:
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_results ("
+                " key TEXT PRIMARY KEY,"
+                " operation TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_results_accessed_at ON llm_results (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value FROM llm_results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with conn:
+                conn.execute("UPDATE llm_results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, operation: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_results (key, operation, value, size, created_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, operation, payload, len(payload), now, now),
+                )
+                self.stores += 1
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM llm_results ORDER BY accessed_at ASC").fetchall():
+            conn.execute("DELETE FROM llm_results WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM llm_results")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+_store: _ResultStore | None = (
+    _ResultStore(settings.llm_cache_path, max_bytes=settings.llm_cache_max_bytes)
+    if settings.llm_cache_enabled and settings.llm_cache_path
+    else None
+)
+
+
+async def lookup(operation: str, content: str, *, model: str, variant: str, prompt_version: str) -> Any:
+    """Return the cached result for an LLM operation, or None."""
+
+    if _store is None:
+        return None
+    key = make_key(operation, content, model, variant, prompt_version)
+    try:
+        return await run_blocking(_store.get, key)
+    except sqlite3.Error:
+        logger.exception("[llm_cache] Lookup failed for %s", operation)
+        return None
+
+
+async def store(operation: str, content: str, result: Any, *, model: str, variant: str, prompt_version: str) -> None:
+    if _store is None:
+        return
+    key = make_key(operation, content, model, variant, prompt_version)
+    try:
+        await run_blocking(_store.put, key, operation, result)
+    except sqlite3.Error:
+        logger.exception("[llm_cache] Write failed for %s", operation)
+
+
+async def get_or_compute(
+    operation: str,
+    content: str,
+    *,
+    model: str,
+    variant: str,
+    prompt_version: str,
+    compute: Callable[[], Awaitable[Any]],
+    refresh: bool = False,
+    should_store: Callable[[Any], bool] = bool,
+) -> Tuple[Any, bool]:
+    """Return ``(result, cache_hit)`` for an LLM operation.
+
+    With ``refresh=True`` the cached value is ignored and overwritten.
+    Results rejected by ``should_store`` (empty by default) are not cached.
+    """
+
+    key_parts = dict(model=model, variant=variant, prompt_version=prompt_version)
+    if not refresh:
+        cached = await lookup(operation, content, **key_parts)
+        if cached is not None:
+            return cached, True
+
+    result = await compute()
+    if should_store(result):
+        await store(operation, content, result, **key_parts)
+    return result, False
+
+
+def clear() -> None:
+    if _store is not None:
+        _store.clear()
+
+
+def get_stats() -> Dict[str, Any] | None:
+    return _store.stats() if _store is not None else None
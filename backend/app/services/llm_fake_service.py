@@ -0,0 +1,110 @@
+"""Local LLM provider with canned, deterministic answers.
+
+Registered in ``llm_router_service`` as ``"fake"``: route an operation to it
+(e.g. ``LLM_ROUTE_SUMMARY='["fake"]'``) to run the app without API keys, or
+build instances with a fixed latency or error to exercise routing policies
+in tests.
+"""
+
+import asyncio
+import re
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from app.services import llm_prompt_service
+
+
+_WORD = re.compile(r"\w+")
+
+
+class FakeProvider:
+    def __init__(
+        self,
+        name: str = "fake",
+        latency: float = 0.0,
+        error: BaseException | None = None,
+        max_input_tokens: int = 4000,
+    ) -> None:
+        self.name = name
+        self.latency = latency
+        self.error = error
+        self.max_input_tokens = max_input_tokens
+        # (operation, content) for every call, in order
+        self.calls: List[Tuple[str, str]] = []
+
+    def budget(self, operation: str) -> Tuple[str, int]:
+        return self.name, self.max_input_tokens
+
+    async def _respond(self, operation: str, content: str) -> None:
+        self.calls.append((operation, content))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+
+    def _summary(self, content: str, length: str) -> str:
+        words = content.split()
+        limit = 12 if llm_prompt_service.normalize_length(length) == "short" else 40
+        return " ".join(words[:limit])
+
+    def _translation(self, content: str, target_language: str) -> str:
+        return f"[{llm_prompt_service.normalize_language(target_language).upper()}] {content}"
+
+    async def summarize_article(self, content: str, length: str = "medium") -> Dict[str, Any]:
+        await self._respond("summary", content)
+        return {"summary": self._summary(content, length), "model": self.name}
+
+    async def stream_summary(self, content: str, length: str = "medium") -> AsyncIterator[str]:
+        await self._respond("summary", content)
+        for index, word in enumerate(self._summary(content, length).split()):
+            yield f" {word}" if index else word
+
+    async def translate_content(self, content: str, target_language: str) -> str:
+        if not content:
+            return ""
+        await self._respond("translation", content)
+        return self._translation(content, target_language)
+
+    async def stream_translation(self, content: str, target_language: str) -> AsyncIterator[str]:
+        if not content:
+            return
+        await self._respond("translation", content)
+        for index, word in enumerate(self._translation(content, target_language).split(" ")):
+            yield f" {word}" if index else word
+
+    def _quiz(self, content: str) -> Dict[str, Any]:
+        topic = " ".join(content.split()[:6])
+        return {
+            "multiple_choice": [
+                {
+                    "question": f"Which statement appears in the article? ({self.name})",
+                    "options": [topic, "None of the above", "All of the above", "It is not stated"],
+                    "correct_index": 0,
+                }
+            ],
+            "open_questions": [{"question": "What is the article about?", "answer": topic}],
+        }
+
+    async def generate_quiz(self, content: str) -> Dict[str, Any]:
+        if not content:
+            return dict(llm_prompt_service.EMPTY_QUIZ)
+        await self._respond("quiz", content)
+        return self._quiz(content)
+
+    async def stream_quiz(self, content: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        if not content:
+            return
+        await self._respond("quiz", content)
+        for kind, questions in self._quiz(content).items():
+            for question in questions:
+                yield kind, question
+
+    async def grade_answers(self, items: List[Tuple[str, str, str]]) -> List[float | None]:
+        if not items:
+            return []
+        await self._respond("grading", "\n".join(answer for _, _, answer in items))
+        grades: List[float | None] = []
+        for _, reference, answer in items:
+            expected = set(_WORD.findall(reference.lower()))
+            given = set(_WORD.findall(answer.lower()))
+            grades.append(len(expected & given) / len(expected) if expected else None)
+        return grades
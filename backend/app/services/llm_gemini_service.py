@@ -1,10 +1,19 @@
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
+import httpx
 from google import genai
+from google.genai import types
 
+from app.core import rate_limit
 from app.core.config import settings
+from app.schemas.quiz import QuizContent
+from app.services import llm_prompt_service, quiz_generation_service, token_service
 
 
+# Constrain quiz answers to the QuizContent JSON schema
+_QUIZ_CONFIG = types.GenerateContentConfig(response_mime_type="application/json", response_schema=QuizContent)
+_GRADING_CONFIG = types.GenerateContentConfig(response_mime_type="application/json")
+
 _client: genai.Client | None = None
 
 
@@ -17,58 +26,150 @@ def _get_client() -> genai.Client:
     return _client
 
 
-def translate_content(content: str, target_language: str) -> str:
-    """Translate arbitrary text into the requested language using Gemini.
+def budget(operation: str) -> Tuple[str, int]:
+    """(model, input budget in estimated tokens) for ``operation``."""
 
-    target_language is expected to be a short code like "EN", "FR", "ES", etc.
-    """
-
-    if not content:
-        return ""
+    return {
+        "summary": (settings.gemini_model_name_summary, settings.gemini_summary_max_input_tokens),
+        "translation": (settings.gemini_model_name_translation, settings.gemini_translation_max_input_tokens),
+        "quiz": (settings.gemini_model_name_quiz, settings.gemini_quiz_max_input_tokens),
+        "grading": (settings.gemini_model_name_quiz, settings.gemini_quiz_max_input_tokens),
+    }[operation]
 
-    # Basic normalization of language code
-    target_language = (target_language or "").strip()
-    if not target_language:
-        raise ValueError("target_language is required")
 
-    # Truncate long inputs to stay within model limits
-    if len(content) > settings.llm_max_input_chars:
-        content = content[: settings.llm_max_input_chars]
+def _limiter(model: str) -> rate_limit.RateLimiter:
+    return rate_limit.get_limiter(
+        "gemini", model, settings.gemini_requests_per_minute, settings.gemini_tokens_per_minute
+    )
 
-    client = _get_client()
 
-    system_instruction = (
-        "You are a translation assistant for an educational platform. "
-        "Translate the given text into the target language while preserving meaning "
-        "and keeping a neutral, clear tone. Return only the translated text."
-    )
+async def _generate(
+    model: str, prompt: str, expected_output: int, stream: bool = False, config: Any = None
+) -> Tuple[Any, int]:
+    """Call ``generate_content`` (or its streaming variant) under the rate limiter.
 
-    prompt = (
-        f"{system_instruction}\n\n"
-        f"Target language: {target_language}.\n"
-        f"Text to translate:\n{content}"
-    )
+    Returns the response and the token reservation to settle.
+    """
 
+    client = _get_client()
+    generate = client.aio.models.generate_content_stream if stream else client.aio.models.generate_content
+    reserved = token_service.estimate_tokens(prompt, model) + expected_output
     # Pass a single string as contents to satisfy google-genai's
     # _GenerateContentParameters schema and avoid Pydantic validation errors.
-    response = client.models.generate_content(
-        model=settings.gemini_model_name_translation,
-        contents=prompt,
+    response = await rate_limit.call(
+        _limiter(model),
+        reserved,
+        lambda: generate(model=model, contents=prompt, config=config),
+        retry_on=(httpx.TransportError,),
     )
+    return response, reserved
+
 
+def _record_usage(model: str, prompt: str, reserved: int, usage: Any) -> None:
+    token_service.record_usage(
+        model,
+        token_service.estimate_tokens(prompt, model),
+        getattr(usage, "prompt_token_count", None),
+        getattr(usage, "candidates_token_count", None),
+    )
+    total = getattr(usage, "total_token_count", None)
+    _limiter(model).settle(reserved, total if isinstance(total, int) else None)
+
+
+def _response_text(response: Any) -> str:
     # google-genai responses expose .text for the main content
-    translated_text = getattr(response, "text", None)
-    if not translated_text and getattr(response, "candidates", None):
+    text = getattr(response, "text", None)
+    if not text and getattr(response, "candidates", None):
         # Fallback extraction for older/newer response shapes
         try:
-            translated_text = response.candidates[0].content.parts[0].text
+            text = response.candidates[0].content.parts[0].text
         except Exception:  # noqa: BLE001
-            translated_text = ""
-    return translated_text or ""
+            text = ""
+    return text or ""
+
+
+async def _complete(operation: str, prompt: Tuple[str, str], expected_output: int, config: Any = None) -> str:
+    model, _ = budget(operation)
+    full_prompt = llm_prompt_service.join(prompt)
+    response, reserved = await _generate(model, full_prompt, expected_output, config=config)
+    _record_usage(model, full_prompt, reserved, getattr(response, "usage_metadata", None))
+    return _response_text(response)
+
+
+async def _stream(
+    operation: str, prompt: Tuple[str, str], expected_output: int, config: Any = None
+) -> AsyncIterator[str]:
+    model, _ = budget(operation)
+    full_prompt = llm_prompt_service.join(prompt)
+    stream, reserved = await _generate(model, full_prompt, expected_output, stream=True, config=config)
+    usage = None
+    async for chunk in stream:
+        # The last chunk carries the usage for the whole response
+        usage = getattr(chunk, "usage_metadata", None) or usage
+        text = getattr(chunk, "text", None)
+        if text:
+            yield text
+    _record_usage(model, full_prompt, reserved, usage)
+
+
+def _fit(operation: str, content: str) -> str:
+    # Cut content beyond the input budget; the pipeline chunks long articles
+    # before they get here.
+    model, max_tokens = budget(operation)
+    return token_service.truncate(content, max_tokens, model)
+
+
+async def summarize_article(content: str, length: str = "medium") -> Dict[str, Any]:
+    """Summarize an article's content using Gemini (same prompt as Groq)."""
+
+    content = _fit("summary", content)
+    summary = await _complete("summary", llm_prompt_service.summary_prompt(content, length), settings.llm_max_tokens)
+    return {"summary": summary.strip(), "model": settings.gemini_model_name_summary}
+
 
+async def stream_summary(content: str, length: str = "medium") -> AsyncIterator[str]:
+    """Stream summary text from Gemini as it is generated."""
 
-def generate_quiz(content: str) -> Dict[str, Any]:
-    """Generate a quiz in strict JSON format from article content using Gemini.
+    content = _fit("summary", content)
+    async for text in _stream("summary", llm_prompt_service.summary_prompt(content, length), settings.llm_max_tokens):
+        yield text
+
+
+async def translate_content(content: str, target_language: str) -> str:
+    """Translate arbitrary text into the requested language using Gemini.
+
+    target_language is expected to be a short code like "EN", "FR", "ES", etc.
+    """
+
+    if not content:
+        return ""
+
+    content = _fit("translation", content)
+    prompt = llm_prompt_service.translation_prompt(content, target_language)
+    # A translation is about as long as its input.
+    expected_output = token_service.estimate_tokens(content, settings.gemini_model_name_translation)
+    return await _complete("translation", prompt, expected_output)
+
+
+async def stream_translation(content: str, target_language: str) -> AsyncIterator[str]:
+    """Stream translated text from Gemini as it is generated."""
+
+    if not content:
+        return
+
+    content = _fit("translation", content)
+    prompt = llm_prompt_service.translation_prompt(content, target_language)
+    expected_output = token_service.estimate_tokens(content, settings.gemini_model_name_translation)
+    async for text in _stream("translation", prompt, expected_output):
+        yield text
+
+
+def _quiz_json(prompt: Tuple[str, str]) -> AsyncIterator[str]:
+    return _stream("quiz", prompt, settings.llm_max_tokens, config=_QUIZ_CONFIG)
+
+
+async def generate_quiz(content: str) -> Dict[str, Any]:
+    """Generate a quiz from article content using Gemini.
 
     The returned dict has the shape expected by QuizGenerationResponse:
     {
@@ -84,78 +185,27 @@ def generate_quiz(content: str) -> Dict[str, Any]:
     """
 
     if not content:
-        return {"multiple_choice": [], "open_questions": []}
+        return dict(llm_prompt_service.EMPTY_QUIZ)
+    return await quiz_generation_service.generate_quiz(_fit("quiz", content), _quiz_json)
 
-    # Truncate long inputs to stay within model limits
-    if len(content) > settings.llm_max_input_chars:
-        content = content[: settings.llm_max_input_chars]
 
-    client = _get_client()
+async def stream_quiz(content: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(kind, question)`` as Gemini generates each question."""
 
-    system_instruction = (
-        "You are an educational quiz generator. "
-        "Given article content, you produce a small quiz for students. "
-        "You must respond with STRICT JSON that matches this schema exactly: \n"
-        "{\n"
-        "  \"multiple_choice\": [\n"
-        "    {\n"
-        "      \"question\": string,\n"
-        "      \"options\": [string, string, string, string],\n"
-        "      \"correct_index\": integer between 0 and 3\n"
-        "    }, ...\n"
-        "  ],\n"
-        "  \"open_questions\": [\n"
-        "    {\n"
-        "      \"question\": string,\n"
-        "      \"answer\": string\n"
-        "    }, ...\n"
-        "  ]\n"
-        "}.\n"
-        "Do not include any keys other than these, and do not include explanations."
-    )
+    if not content:
+        return
+    async for kind, question in quiz_generation_service.stream_questions(_fit("quiz", content), _quiz_json):
+        yield kind, question
 
-    prompt = (
-        f"{system_instruction}\n\n"
-        f"Article content:\n{content}"
-    )
 
-    response = client.models.generate_content(
-        model=settings.gemini_model_name_quiz,
-        contents=prompt,
-    )
+async def grade_answers(items: List[Tuple[str, str, str]]) -> List[float | None]:
+    """Grade ``(question, reference, answer)`` items from 0 to 1 in one call.
+
+    ``None`` marks an item the answer gave no valid grade for.
+    """
 
-    raw = getattr(response, "text", None) or ""
-
-    import json
-    import re
-
-    # Try direct JSON parse first
-    try:
-        parsed = json.loads(raw)
-    except Exception:  # noqa: BLE001
-        # Strip markdown code fences if present
-        if "```" in raw:
-            # Remove ```json or ``` and closing ```
-            raw_clean = re.sub(r"```(json)?", "", raw, flags=re.IGNORECASE).strip()
-        else:
-            raw_clean = raw
-
-        # Try to extract the first JSON object from the text
-        match = re.search(r"\{[\s\S]*\}", raw_clean)
-        if match:
-            candidate = match.group(0)
-            try:
-                parsed = json.loads(candidate)
-            except Exception:  # noqa: BLE001
-                parsed = None
-        else:
-            parsed = None
-
-    if not parsed or not isinstance(parsed, dict):
-        # If parsing still fails, fall back to empty quiz to avoid 500s
-        return {"multiple_choice": [], "open_questions": []}
-
-    # Basic shape check; if keys missing, normalize to expected shape
-    mcq = parsed.get("multiple_choice") or []
-    open_q = parsed.get("open_questions") or []
-    return {"multiple_choice": mcq, "open_questions": open_q}
+    if not items:
+        return []
+    prompt = llm_prompt_service.grading_prompt(items)
+    text = await _complete("grading", prompt, 8 * len(items) + 16, config=_GRADING_CONFIG)
+    return llm_prompt_service.parse_grades(text, len(items))
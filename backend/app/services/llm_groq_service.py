@@ -1,67 +1,216 @@
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
-from groq import Groq
+from groq import APIConnectionError, AsyncGroq
 
+from app.core import rate_limit
+from app.core.concurrency import gather_limited
 from app.core.config import settings
+from app.services import chunking_service, llm_prompt_service, quiz_generation_service, token_service
 
 
-_client: Groq | None = None
+# Largest completion llama-3.1-8b-instant returns
+_MAX_OUTPUT_TOKENS = 8192
 
+_client: AsyncGroq | None = None
 
-def _get_client() -> Groq:
+
+def _get_client() -> AsyncGroq:
     global _client
     if _client is None:
         if not settings.groq_api_key:
             raise RuntimeError("Groq API key is not configured")
-        _client = Groq(api_key=settings.groq_api_key)
+        # Retries go through app.core.rate_limit, which shares backoff
+        # across callers.
+        _client = AsyncGroq(api_key=settings.groq_api_key, max_retries=0)
     return _client
 
 
-def summarize_article(content: str, length: str = "medium") -> Dict[str, Any]:
+def budget(operation: str) -> Tuple[str, int]:
+    """(model, input budget in estimated tokens); one model serves every operation."""
+
+    return settings.groq_model_name, settings.groq_max_input_tokens
+
+
+def _limiter() -> rate_limit.RateLimiter:
+    return rate_limit.get_limiter(
+        "groq", settings.groq_model_name, settings.groq_requests_per_minute, settings.groq_tokens_per_minute
+    )
+
+
+def _messages(prompt: Tuple[str, str]) -> List[Dict[str, str]]:
+    system_prompt, user_prompt = prompt
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _fit(content: str) -> str:
+    # Cut content beyond the input budget to avoid 413 / rate_limit_exceeded
+    # errors; the pipeline chunks long articles before they get here.
+    return token_service.truncate(content, settings.groq_max_input_tokens, settings.groq_model_name)
+
+
+def _estimate(messages: List[Dict[str, str]]) -> int:
+    return sum(token_service.estimate_tokens(message["content"], settings.groq_model_name) for message in messages)
+
+
+async def _create(messages: List[Dict[str, str]], max_tokens: int | None = None, **kwargs: Any) -> Tuple[Any, int]:
+    """Call the chat completions API under the rate limiter.
+
+    Returns the response and the token reservation to settle.
+    """
+
+    client = _get_client()
+    max_tokens = max_tokens or settings.llm_max_tokens
+    reserved = _estimate(messages) + max_tokens
+    response = await rate_limit.call(
+        _limiter(),
+        reserved,
+        lambda: client.chat.completions.create(
+            model=settings.groq_model_name,
+            messages=messages,
+            temperature=settings.llm_temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        ),
+        retry_on=(APIConnectionError,),
+    )
+    return response, reserved
+
+
+def _record_usage(messages: List[Dict[str, str]], reserved: int, usage: Any) -> None:
+    token_service.record_usage(
+        settings.groq_model_name,
+        _estimate(messages),
+        getattr(usage, "prompt_tokens", None),
+        getattr(usage, "completion_tokens", None),
+    )
+    total = getattr(usage, "total_tokens", None)
+    _limiter().settle(reserved, total if isinstance(total, int) else None)
+
+
+async def _complete(messages: List[Dict[str, str]], max_tokens: int | None = None, **kwargs: Any) -> str:
+    completion, reserved = await _create(messages, max_tokens, **kwargs)
+    _record_usage(messages, reserved, getattr(completion, "usage", None))
+    return completion.choices[0].message.content.strip() if completion.choices else ""
+
+
+async def _stream(messages: List[Dict[str, str]], max_tokens: int | None = None) -> AsyncIterator[str]:
+    stream, reserved = await _create(messages, max_tokens, stream=True)
+
+    usage = None
+    async for chunk in stream:
+        # Groq reports usage on the last chunk
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            yield delta
+    _record_usage(messages, reserved, usage)
+
+
+async def summarize_article(content: str, length: str = "medium") -> Dict[str, Any]:
     """Summarize an article's content using Groq LLM.
 
     Length can be "short" or "medium" (default). The model name and
     generation params come from settings.
     """
 
-    if length not in {"short", "medium"}:
-        length = "medium"
+    messages = _messages(llm_prompt_service.summary_prompt(_fit(content), length))
+    return {
+        "summary": await _complete(messages),
+        "model": settings.groq_model_name,
+    }
 
-    # Truncate very long content to stay within Groq token limits.
-    # This is a simple character-based heuristic to avoid 413 / rate_limit_exceeded errors.
-    if len(content) > settings.llm_max_input_chars:
-        content = content[: settings.llm_max_input_chars]
 
-    client = _get_client()
+async def stream_summary(content: str, length: str = "medium") -> AsyncIterator[str]:
+    """Stream summary tokens from Groq as they are generated."""
 
-    length_instruction = {
-        "short": "Provide a very short summary (2-3 concise sentences).",
-        "medium": "Provide a medium-length summary (1 short paragraph).",
-    }[length]
+    messages = _messages(llm_prompt_service.summary_prompt(_fit(content), length))
+    async for delta in _stream(messages):
+        yield delta
 
-    system_prompt = (
-        "You are an educational assistant. You write clear, neutral, "
-        "and concise summaries of educational articles for students."
-    )
 
-    user_prompt = (
-        f"{length_instruction} Focus only on the core ideas, "
-        f"without bullets, in plain text.\n\nArticle content:\n{content}"
+def _translation_pieces(content: str) -> List[str]:
+    # Input and output both count against the per-minute token budget, so a
+    # piece takes half of it; longer texts are split on paragraphs.
+    max_tokens = settings.groq_max_input_tokens // 2
+    return chunking_service.chunk_sections(
+        content.split("\n\n"),
+        max_tokens,
+        size=lambda text: token_service.estimate_tokens(text, settings.groq_model_name),
     )
 
-    completion = client.chat.completions.create(
-        model=settings.groq_model_name,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
+
+def _translation_request(piece: str, target_language: str) -> Tuple[List[Dict[str, str]], int]:
+    messages = _messages(llm_prompt_service.translation_prompt(piece, target_language))
+    # A translation is about as long as its input, give or take the script.
+    expected = 2 * token_service.estimate_tokens(piece, settings.groq_model_name)
+    return messages, min(_MAX_OUTPUT_TOKENS, max(settings.llm_max_tokens, expected))
+
+
+async def translate_content(content: str, target_language: str) -> str:
+    """Translate text using Groq.
+
+    Groq's input budget is much smaller than Gemini's, so long texts are
+    split into pieces on paragraph boundaries instead of being cut.
+    """
+
+    if not content:
+        return ""
+
+    llm_prompt_service.normalize_language(target_language)
+    translated = await gather_limited(
+        [
+            lambda piece=piece: _complete(*_translation_request(piece, target_language))
+            for piece in _translation_pieces(content)
         ],
-        temperature=settings.llm_temperature,
-        max_tokens=settings.llm_max_tokens,
+        settings.llm_chunk_concurrency,
     )
+    return "\n\n".join(part for part in translated if part)
 
-    message = completion.choices[0].message.content.strip() if completion.choices else ""
 
-    return {
-        "summary": message,
-        "model": settings.groq_model_name,
-    }
+async def stream_translation(content: str, target_language: str) -> AsyncIterator[str]:
+    """Stream translated text from Groq, piece by piece."""
+
+    if not content:
+        return
+
+    llm_prompt_service.normalize_language(target_language)
+    for index, piece in enumerate(_translation_pieces(content)):
+        if index:
+            yield "\n\n"
+        async for delta in _stream(*_translation_request(piece, target_language)):
+            yield delta
+
+
+async def _quiz_json(prompt: Tuple[str, str]) -> AsyncIterator[str]:
+    # Groq's JSON mode does not stream, so the answer arrives in one piece.
+    yield await _complete(_messages(prompt), response_format={"type": "json_object"})
+
+
+async def generate_quiz(content: str) -> Dict[str, Any]:
+    """Generate a quiz in the same JSON shape as the Gemini provider."""
+
+    if not content:
+        return dict(llm_prompt_service.EMPTY_QUIZ)
+    return await quiz_generation_service.generate_quiz(_fit(content), _quiz_json)
+
+
+async def stream_quiz(content: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(kind, question)`` for each question of a Groq quiz."""
+
+    if not content:
+        return
+    async for kind, question in quiz_generation_service.stream_questions(_fit(content), _quiz_json):
+        yield kind, question
+
+
+async def grade_answers(items: List[Tuple[str, str, str]]) -> List[float | None]:
+    """Grade ``(question, reference, answer)`` items from 0 to 1 in one call."""
+
+    if not items:
+        return []
+    messages = _messages(llm_prompt_service.grading_prompt(items))
+    text = await _complete(messages, 8 * len(items) + 16, response_format={"type": "json_object"})
+    return llm_prompt_service.parse_grades(text, len(items))
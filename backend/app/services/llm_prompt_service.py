@@ -0,0 +1,153 @@
+"""Prompts shared by the LLM providers, as (system instruction, user message).
+
+Chat providers (Groq) send the two as separate messages; single-prompt
+providers (Gemini) join them with a blank line.
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+
+# Bump when a prompt changes so cached results are not reused.
+SUMMARY_PROMPT_VERSION = "1"
+TRANSLATION_PROMPT_VERSION = "1"
+QUIZ_PROMPT_VERSION = "2"
+
+EMPTY_QUIZ: Dict[str, Any] = {"multiple_choice": [], "open_questions": []}
+
+_SUMMARY_SYSTEM = (
+    "You are an educational assistant. You write clear, neutral, "
+    "and concise summaries of educational articles for students."
+)
+
+_SUMMARY_LENGTHS = {
+    "short": "Provide a very short summary (2-3 concise sentences).",
+    "medium": "Provide a medium-length summary (1 short paragraph).",
+}
+
+_TRANSLATION_SYSTEM = (
+    "You are a translation assistant for an educational platform. "
+    "Translate the given text into the target language while preserving meaning "
+    "and keeping a neutral, clear tone. Return only the translated text."
+)
+
+_QUIZ_SYSTEM = (
+    "You are an educational quiz generator. "
+    "Given article content, you produce a small quiz for students. "
+    "You must respond with STRICT JSON that matches this schema exactly: \n"
+    "{\n"
+    "  \"multiple_choice\": [\n"
+    "    {\n"
+    "      \"question\": string,\n"
+    "      \"options\": [string, string, string, string],\n"
+    "      \"correct_index\": integer between 0 and 3\n"
+    "    }, ...\n"
+    "  ],\n"
+    "  \"open_questions\": [\n"
+    "    {\n"
+    "      \"question\": string,\n"
+    "      \"answer\": string\n"
+    "    }, ...\n"
+    "  ]\n"
+    "}.\n"
+    "Do not include any keys other than these, and do not include explanations."
+)
+
+_GRADING_SYSTEM = (
+    "You grade students' answers to open quiz questions. For each numbered item, "
+    "compare the student answer with the reference answer and give a grade from 0 "
+    "(wrong or missing) to 1 (fully correct); judge meaning, not wording. "
+    "Respond with STRICT JSON: {\"grades\": [number, ...]}, one grade per item, in order."
+)
+
+_QUIZ_RULES = (
+    "Each multiple-choice question needs four distinct, non-empty options and "
+    "the index of the correct one; each open question needs a short reference answer."
+)
+
+
+def normalize_length(length: str) -> str:
+    return length if length in _SUMMARY_LENGTHS else "medium"
+
+
+def summary_prompt(content: str, length: str) -> Tuple[str, str]:
+    user_prompt = (
+        f"{_SUMMARY_LENGTHS[normalize_length(length)]} Focus only on the core ideas, "
+        f"without bullets, in plain text.\n\nArticle content:\n{content}"
+    )
+    return _SUMMARY_SYSTEM, user_prompt
+
+
+def normalize_language(target_language: str) -> str:
+    target_language = (target_language or "").strip()
+    if not target_language:
+        raise ValueError("target_language is required")
+    return target_language
+
+
+def translation_prompt(content: str, target_language: str) -> Tuple[str, str]:
+    return _TRANSLATION_SYSTEM, f"Target language: {normalize_language(target_language)}.\nText to translate:\n{content}"
+
+
+def quiz_prompt(content: str, mcq_count: int, open_count: int) -> Tuple[str, str]:
+    user_prompt = (
+        f"Write exactly {mcq_count} multiple-choice questions and {open_count} open questions. "
+        f"{_QUIZ_RULES}\n\nArticle content:\n{content}"
+    )
+    return _QUIZ_SYSTEM, user_prompt
+
+
+def quiz_reask_prompt(
+    content: str,
+    missing: Dict[str, int],
+    rejected: Dict[str, List[Any]],
+    accepted: List[str],
+) -> Tuple[str, str]:
+    """Ask only for the questions that were missing or invalid in a first answer."""
+
+    parts = [
+        "Part of a quiz about the article below was invalid or missing. Write only the replacements: "
+        f"exactly {missing['multiple_choice']} multiple-choice questions and "
+        f"{missing['open_questions']} open questions. {_QUIZ_RULES}"
+    ]
+    invalid = [json.dumps(item, ensure_ascii=False)[:500] for items in rejected.values() for item in items]
+    if invalid:
+        parts.append("These questions were rejected:\n" + "\n".join(invalid))
+    if accepted:
+        parts.append("Do not repeat these questions:\n" + "\n".join(f"- {question}" for question in accepted))
+    parts.append(f"Article content:\n{content}")
+    return _QUIZ_SYSTEM, "\n\n".join(parts)
+
+
+def grading_prompt(items: List[Tuple[str, str, str]]) -> Tuple[str, str]:
+    """Prompt for ``(question, reference answer, student answer)`` items."""
+
+    blocks = [
+        f"{number}. Question: {question}\nReference answer: {reference}\nStudent answer: {answer}"
+        for number, (question, reference, answer) in enumerate(items, start=1)
+    ]
+    return _GRADING_SYSTEM, "\n\n".join(blocks)
+
+
+def parse_grades(text: str, count: int) -> List[float | None]:
+    """Grades from a grading answer; ``None`` where one is missing or invalid."""
+
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        grades = json.loads(text[start:end + 1]).get("grades") if start != -1 else None
+    except (json.JSONDecodeError, AttributeError):
+        grades = None
+    if not isinstance(grades, list):
+        grades = []
+
+    parsed: List[float | None] = []
+    for index in range(count):
+        grade = grades[index] if index < len(grades) else None
+        valid = isinstance(grade, (int, float)) and not isinstance(grade, bool) and 0 <= grade <= 1
+        parsed.append(float(grade) if valid else None)
+    return parsed
+
+
+def join(prompt: Tuple[str, str]) -> str:
+    system_instruction, user_prompt = prompt
+    return f"{system_instruction}\n\n{user_prompt}"
@@ -0,0 +1,315 @@
+"""Route LLM operations across providers.
+
+Every provider (``llm_groq_service``, ``llm_gemini_service``, a
+``FakeProvider``) exposes the same calls: ``summarize_article``,
+``stream_summary``, ``translate_content``, ``stream_translation``,
+``generate_quiz``, ``stream_quiz``, ``grade_answers`` and ``budget``. This
+module exposes them too and picks the provider per operation from
+``settings.llm_route_<operation>`` and ``settings.llm_policy_<operation>``:
+
+- ``fallback``: try providers in route order, moving on when one fails.
+- ``hedged``: like fallback, but when the current provider has not answered
+  after ``llm_hedge_delay_seconds`` the next one is started as well; the
+  first answer wins and the other call is cancelled. This bounds the tail
+  latency when a vendor degrades, at the cost of some duplicate calls.
+- ``fastest``: order providers by their observed latency (an exponentially
+  weighted moving average), then fall back as above.
+
+A provider that fails is moved to the back of the order for
+``llm_provider_cooldown_seconds``. Invalid input (``ValueError``) is raised
+straight away instead of being retried elsewhere. Streams can only switch
+provider before the first chunk; hedged streams race to the first chunk.
+
+Providers are looked up by attribute on each call, so patching
+``llm_groq_service.summarize_article`` still takes effect.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.rate_limit import LLMRateLimitError
+from app.services import llm_gemini_service, llm_groq_service
+from app.services.llm_fake_service import FakeProvider
+
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("summary", "translation", "quiz", "grading")
+POLICIES = ("fallback", "hedged", "fastest")
+
+# How quickly the latency average follows the latest observation
+_LATENCY_WEIGHT = 0.3
+
+_DEFAULT_PROVIDERS: Dict[str, Any] = {
+    "groq": llm_groq_service,
+    "gemini": llm_gemini_service,
+    "fake": FakeProvider(),
+}
+_providers: Dict[str, Any] = dict(_DEFAULT_PROVIDERS)
+
+
+@dataclass
+class _Health:
+    calls: int = 0
+    failures: int = 0
+    # Won a hedged race that another provider had started first
+    hedge_wins: int = 0
+    # EWMA of seconds to an answer (to the first chunk for streams)
+    latency: float | None = None
+    cooldown_until: float = 0.0
+
+
+_lock = threading.Lock()
+_health: Dict[Tuple[str, str], _Health] = {}
+_hedges: Dict[str, int] = {operation: 0 for operation in OPERATIONS}
+# Calls per (operation, UTC day) not yet written to the statistics counters
+_unflushed_calls: Counter = Counter()
+
+
+def register_provider(name: str, provider: Any) -> None:
+    _providers[name] = provider
+
+
+def reset() -> None:
+    """Restore the default providers and forget latency and failures."""
+
+    _providers.clear()
+    _providers.update(_DEFAULT_PROVIDERS)
+    with _lock:
+        _health.clear()
+        _unflushed_calls.clear()
+        for operation in OPERATIONS:
+            _hedges[operation] = 0
+
+
+def _route(operation: str) -> List[str]:
+    route = [name for name in getattr(settings, f"llm_route_{operation}") if name in _providers]
+    if not route:
+        raise RuntimeError(f"No LLM provider configured for {operation}")
+    return route
+
+
+def _policy(operation: str) -> str:
+    policy = getattr(settings, f"llm_policy_{operation}")
+    return policy if policy in POLICIES else "fallback"
+
+
+def _health_of(name: str, method: str) -> _Health:
+    # Callers hold _lock
+    health = _health.get((name, method))
+    if health is None:
+        health = _health[(name, method)] = _Health()
+    return health
+
+
+def candidates(operation: str, method: str) -> List[str]:
+    """Providers for ``operation`` in the order they will be tried."""
+
+    route = _route(operation)
+    now = time.monotonic()
+    with _lock:
+        health = {name: _health_of(name, method) for name in route}
+        if _policy(operation) == "fastest":
+            # Providers without a measurement go first so they get one.
+            route = sorted(route, key=lambda name: health[name].latency or 0.0)
+        return sorted(route, key=lambda name: health[name].cooldown_until > now)
+
+
+def budget(operation: str) -> Tuple[str, int]:
+    """(model, input budget) of the first provider in the route.
+
+    Long inputs are chunked for it; other providers fit what they receive
+    to their own budget.
+    """
+
+    return _providers[_route(operation)[0]].budget(operation)
+
+
+def _record(name: str, method: str, latency: float | None) -> None:
+    with _lock:
+        health = _health_of(name, method)
+        health.calls += 1
+        if latency is None:
+            health.failures += 1
+            health.cooldown_until = time.monotonic() + settings.llm_provider_cooldown_seconds
+        elif health.latency is None:
+            health.latency = latency
+        else:
+            health.latency += _LATENCY_WEIGHT * (latency - health.latency)
+
+
+async def _timed(name: str, method: str, call: Awaitable[Any]) -> Any:
+    started = time.monotonic()
+    try:
+        result = await call
+    except (ValueError, asyncio.CancelledError):
+        raise
+    except Exception as exc:  # noqa: BLE001
+        _record(name, method, None)
+        logger.warning("[llm-router] %s.%s failed: %s", name, method, exc)
+        raise
+    _record(name, method, time.monotonic() - started)
+    return result
+
+
+def _final_error(errors: List[BaseException]) -> BaseException:
+    # A rate limit tells the client when to come back; prefer it.
+    limits = [error for error in errors if isinstance(error, LLMRateLimitError)]
+    if limits:
+        return min(limits, key=lambda error: error.retry_after)
+    return errors[0]
+
+
+async def _race(
+    operation: str,
+    method: str,
+    start: Callable[[Any], Awaitable[Any]],
+    discard: Callable[[Any], Awaitable[None]] | None = None,
+) -> Any:
+    """Run ``start(provider)`` on the candidates per policy; return the first success."""
+
+    with _lock:
+        _unflushed_calls[(operation, time.strftime("%Y-%m-%d", time.gmtime()))] += 1
+    waiting = candidates(operation, method)
+    hedged = _policy(operation) == "hedged"
+    running: Dict["asyncio.Future[Any]", str] = {}
+    errors: List[BaseException] = []
+    first = waiting[0]
+
+    def launch() -> None:
+        name = waiting.pop(0)
+        running[asyncio.ensure_future(_timed(name, method, start(_providers[name])))] = name
+
+    launch()
+    try:
+        while running:
+            timeout = settings.llm_hedge_delay_seconds if hedged and waiting else None
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                with _lock:
+                    _hedges[operation] += 1
+                launch()
+                continue
+
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    name = running.pop(task)
+                    if name != first and hedged:
+                        with _lock:
+                            _health_of(name, method).hedge_wins += 1
+                    return task.result()
+            for task in done:
+                running.pop(task)
+                error = task.exception()
+                if isinstance(error, ValueError):
+                    raise error
+                errors.append(error)
+            if waiting:
+                launch()
+    finally:
+        for task in running:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Finished alongside the winner (or a ValueError): retrieve every
+                # outcome; _timed has already counted and logged failures
+                if task.exception() is None and discard is not None:
+                    # A successful call that lost the race holds an open stream.
+                    await discard(task.result())
+    raise _final_error(errors)
+
+
+async def _call(operation: str, method: str, *args: Any, **kwargs: Any) -> Any:
+    return await _race(operation, method, lambda provider: getattr(provider, method)(*args, **kwargs))
+
+
+async def _stream(operation: str, method: str, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+    async def first_chunk(provider: Any) -> Tuple[AsyncIterator[Any], Any]:
+        iterator = getattr(provider, method)(*args, **kwargs).__aiter__()
+        try:
+            return iterator, await iterator.__anext__()
+        except StopAsyncIteration:
+            return iterator, None
+
+    async def close(opened: Tuple[AsyncIterator[Any], Any]) -> None:
+        aclose = getattr(opened[0], "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    opened = await _race(operation, method, first_chunk, discard=close)
+    iterator, chunk = opened
+    try:
+        if chunk is None:
+            return
+        yield chunk
+        async for chunk in iterator:
+            yield chunk
+    finally:
+        await close(opened)
+
+
+async def summarize_article(content: str, length: str = "medium") -> Dict[str, Any]:
+    return await _call("summary", "summarize_article", content, length=length)
+
+
+def stream_summary(content: str, length: str = "medium") -> AsyncIterator[str]:
+    return _stream("summary", "stream_summary", content, length=length)
+
+
+async def translate_content(content: str, target_language: str) -> str:
+    return await _call("translation", "translate_content", content, target_language)
+
+
+def stream_translation(content: str, target_language: str) -> AsyncIterator[str]:
+    return _stream("translation", "stream_translation", content, target_language)
+
+
+async def generate_quiz(content: str) -> Dict[str, Any]:
+    return await _call("quiz", "generate_quiz", content)
+
+
+def stream_quiz(content: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    return _stream("quiz", "stream_quiz", content)
+
+
+async def grade_answers(items: List[Tuple[str, str, str]]) -> List[float | None]:
+    return await _call("grading", "grade_answers", items)
+
+
+def drain_call_counts() -> Dict[Tuple[str, str], int]:
+    """Return and forget the calls per ``(operation, day)`` counted so far."""
+
+    with _lock:
+        counts = dict(_unflushed_calls)
+        _unflushed_calls.clear()
+    return counts
+
+
+def get_stats() -> Dict[str, Any]:
+    now = time.monotonic()
+    with _lock:
+        providers = {
+            f"{name}.{method}": {
+                "calls": health.calls,
+                "failures": health.failures,
+                "hedge_wins": health.hedge_wins,
+                "latency_ms": round(health.latency * 1000, 1) if health.latency is not None else None,
+                "cooling_down": health.cooldown_until > now,
+            }
+            for (name, method), health in _health.items()
+        }
+        hedges = dict(_hedges)
+    return {
+        "routes": {
+            operation: {"providers": getattr(settings, f"llm_route_{operation}"), "policy": _policy(operation)}
+            for operation in OPERATIONS
+        },
+        "hedges": hedges,
+        "providers": providers,
+    }
@@ -1,17 +1,120 @@
-from typing import Dict, Any
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List
 
-from langchain_community.document_loaders import PyPDFLoader
+from fastapi import UploadFile
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+from app.core.config import settings
+from app.services import section_service
+
+
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+class PdfTooLargeError(ValueError):
+    pass
+
+
+class InvalidPdfError(ValueError):
+    pass
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.pdf_max_workers)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def spool_upload(upload: UploadFile) -> str:
+    """Copy an upload to a temp file chunk by chunk, enforcing the byte cap.
+
+    Returns the temp file path; the caller is responsible for removing it.
+    """
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await upload.read(_UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > settings.pdf_max_bytes:
+                    raise PdfTooLargeError(f"PDF exceeds the {settings.pdf_max_bytes} byte limit")
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a spooled upload; identifies the document across uploads."""
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        while chunk := source.read(_UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    # Runs in a worker process: each worker opens the file itself and only
+    # parses the pages it was given.
+    reader = PdfReader(file_path)
+    return [section_service.clean_text(reader.pages[index].extract_text() or "") for index in range(start, stop)]
 
 
 def extract_text_from_pdf(file_path: str) -> Dict[str, Any]:
-    loader = PyPDFLoader(file_path)
-    pages = loader.load()
-    full_text = "\n".join(page.page_content for page in pages)
+    """Extract page text from a PDF into the same shape as wikipedia_service.
+
+    Pages are parsed lazily; documents with at least
+    ``settings.pdf_parallel_min_pages`` pages are split into page ranges and
+    extracted on a process pool.
+    """
+
+    try:
+        reader = PdfReader(file_path)
+        page_count = len(reader.pages)
+    except PdfReadError as exc:
+        raise InvalidPdfError(f"Could not read PDF: {exc}") from exc
+
+    if page_count > settings.pdf_max_pages:
+        raise PdfTooLargeError(f"PDF has {page_count} pages; the limit is {settings.pdf_max_pages}")
+
+    if page_count >= settings.pdf_parallel_min_pages and settings.pdf_max_workers > 1:
+        step = -(-page_count // settings.pdf_max_workers)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        pool = _get_process_pool()
+        futures = [pool.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges]
+        texts = [text for future in futures for text in future.result()]
+    else:
+        texts = [section_service.clean_text(page.extract_text() or "") for page in reader.pages]
+
+    sections: Dict[str, Any] = {}
+    for index, text in enumerate(texts, start=1):
+        if text:
+            sections[f"Page {index}"] = text
+
+    metadata_title = reader.metadata.title if reader.metadata else None
 
     return {
-        "title": "Uploaded PDF",
+        "title": metadata_title or "Uploaded PDF",
         "url": None,
-        "sections": {
-            "Content": full_text,
-        },
+        "sections": sections,
+        # Page text is already cleaned for LLM use
+        "cleaned": True,
+        "page_count": page_count,
     }
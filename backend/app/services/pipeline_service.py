@@ -0,0 +1,449 @@
+"""Article pipelines shared by the route handlers: fetch -> clean -> LLM.
+
+Articles longer than the input budget of one LLM call (in estimated tokens,
+see ``token_service``) are split on section boundaries and processed in
+parallel: summaries are mapped per chunk and reduced into one,
+translations are reassembled in order.
+
+LLM calls go through ``llm_router_service``; chunk sizes and cache keys
+follow the first provider of each operation's route.
+
+Each pipeline returns a plain dict; LLM results go through the persistent
+result cache and report whether they were served from it. Identical jobs
+that are already in flight (same operation, article and parameters) are
+coalesced so a burst of students opening the same link costs one upstream
+call.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from app.core.concurrency import SingleFlight, gather_limited
+from app.core.config import settings
+from app.services import (
+    article_cache_service,
+    chunking_service,
+    content_store_service,
+    llm_cache_service,
+    llm_prompt_service,
+    llm_router_service,
+    section_service,
+    token_service,
+    wikipedia_service,
+)
+
+
+_jobs = SingleFlight("pipeline")
+
+
+def _article_key(url: str) -> str:
+    return article_cache_service.normalize_title(wikipedia_service.extract_title_from_url(url))
+
+
+async def _coalesced(key: Tuple[Any, ...], job: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    # Waiters share one result object; hand each caller its own copy.
+    return dict(await _jobs.do(key, job))
+
+
+def sections_to_text(article_data: Dict[str, Any]) -> str:
+    sections = article_data.get("sections", {}) or {}
+    full_text_parts = [section_text for section_text in sections.values() if section_text]
+
+    if article_data.get("cleaned"):
+        # Sections were cleaned while parsing; joining is all that is left.
+        return " ".join(full_text_parts)
+
+    full_text = "\n\n".join(full_text_parts)
+    return wikipedia_service.clean_wikipedia_text(full_text)
+
+
+def _with_clean_sections(article_data: Dict[str, Any]) -> Dict[str, Any]:
+    if article_data.get("cleaned"):
+        return article_data
+    sections = article_data.get("sections", {}) or {}
+    return {
+        **article_data,
+        "sections": {title: section_service.clean_text(text) for title, text in sections.items()},
+        "cleaned": True,
+    }
+
+
+async def load_article(url: str) -> Tuple[Dict[str, Any], str]:
+    article_data = _with_clean_sections(await wikipedia_service.fetch_article_sections(url))
+    return article_data, sections_to_text(article_data)
+
+
+async def load_article_by_title(title: str) -> Tuple[Dict[str, Any], str]:
+    article_data = _with_clean_sections(await wikipedia_service.fetch_article_sections_by_title(title))
+    return article_data, sections_to_text(article_data)
+
+
+# (model, input budget in estimated tokens) for each kind of LLM call
+Budget = Tuple[str, int]
+
+
+def _summary_budget() -> Budget:
+    return llm_router_service.budget("summary")
+
+
+def _translation_budget() -> Budget:
+    return llm_router_service.budget("translation")
+
+
+def _chunk(texts: List[str], budget: Budget) -> List[str]:
+    model, max_tokens = budget
+    return chunking_service.chunk_sections(
+        texts, max_tokens, size=lambda text: token_service.estimate_tokens(text, model)
+    )
+
+
+def article_chunks(sections: Dict[str, str], budget: Budget) -> List[str]:
+    # Callers pass sections from load_*; Wikipedia and PDF sources clean them
+    # at parse time.
+    return _chunk([text for text in sections.values() if text], budget)
+
+
+def _needs_chunking(text: str, sections: Dict[str, str] | None, budget: Budget) -> bool:
+    model, max_tokens = budget
+    return bool(sections) and token_service.estimate_tokens(text, model) > max_tokens
+
+
+async def _map_summaries(chunks: List[str]) -> str:
+    """Summarize chunks in parallel and return the text to reduce."""
+
+    partials = await gather_limited(
+        [lambda chunk=chunk: llm_router_service.summarize_article(chunk, length="medium") for chunk in chunks],
+        settings.llm_chunk_concurrency,
+    )
+    partial_summaries = [partial.get("summary", "") for partial in partials if partial.get("summary")]
+    combined = "\n\n".join(partial_summaries)
+
+    model, max_tokens = _summary_budget()
+    if token_service.estimate_tokens(combined, model) > max_tokens:
+        next_chunks = _chunk(partial_summaries, _summary_budget())
+        # Only recurse while the reduce step is still shrinking the input.
+        if len(next_chunks) < len(chunks):
+            return await _map_summaries(next_chunks)
+
+    return combined
+
+
+async def _summarize_chunks(chunks: List[str], length: str) -> Dict[str, Any]:
+    return await llm_router_service.summarize_article(await _map_summaries(chunks), length=length)
+
+
+async def _translate_chunks(chunks: List[str], target_language: str) -> str:
+    translated = await gather_limited(
+        [lambda chunk=chunk: llm_router_service.translate_content(chunk, target_language) for chunk in chunks],
+        settings.llm_chunk_concurrency,
+    )
+    return "\n\n".join(part for part in translated if part)
+
+
+async def load_stored_article(article_id: int, title: str) -> Tuple[Dict[str, Any], str]:
+    """Load content processed at ingest time (e.g. a PDF), else fetch by title."""
+
+    stored = await content_store_service.load(article_id)
+    if stored is not None:
+        stored = _with_clean_sections(stored)
+        return stored, sections_to_text(stored)
+    return await load_article_by_title(title)
+
+
+async def summarize_text(
+    text: str,
+    length: str,
+    refresh: bool = False,
+    sections: Dict[str, str] | None = None,
+) -> Tuple[Dict[str, Any], bool]:
+    async def compute() -> Dict[str, Any]:
+        if _needs_chunking(text, sections, _summary_budget()):
+            return await _summarize_chunks(article_chunks(sections, _summary_budget()), length)
+        return await llm_router_service.summarize_article(text, length=length)
+
+    return await llm_cache_service.get_or_compute(
+        "summary",
+        text,
+        model=_summary_budget()[0],
+        variant=length,
+        prompt_version=llm_prompt_service.SUMMARY_PROMPT_VERSION,
+        compute=compute,
+        refresh=refresh,
+        should_store=lambda result: bool(result.get("summary")),
+    )
+
+
+async def translate_text(
+    text: str,
+    target_language: str,
+    refresh: bool = False,
+    sections: Dict[str, str] | None = None,
+) -> Tuple[str, bool]:
+    async def compute() -> str:
+        if _needs_chunking(text, sections, _translation_budget()):
+            return await _translate_chunks(article_chunks(sections, _translation_budget()), target_language)
+        return await llm_router_service.translate_content(text, target_language)
+
+    return await llm_cache_service.get_or_compute(
+        "translation",
+        text,
+        model=_translation_budget()[0],
+        variant=target_language.strip().upper(),
+        prompt_version=llm_prompt_service.TRANSLATION_PROMPT_VERSION,
+        compute=compute,
+        refresh=refresh,
+    )
+
+
+def _quiz_key_parts() -> Dict[str, str]:
+    return dict(
+        model=llm_router_service.budget("quiz")[0],
+        variant="default",
+        prompt_version=llm_prompt_service.QUIZ_PROMPT_VERSION,
+    )
+
+
+def _has_questions(quiz: Dict[str, Any]) -> bool:
+    return bool(quiz.get("multiple_choice") or quiz.get("open_questions"))
+
+
+async def generate_quiz_from_text(text: str, refresh: bool = False) -> Tuple[Dict[str, Any], bool]:
+    return await llm_cache_service.get_or_compute(
+        "quiz",
+        text,
+        **_quiz_key_parts(),
+        compute=lambda: llm_router_service.generate_quiz(text),
+        refresh=refresh,
+        should_store=_has_questions,
+    )
+
+
+async def summarize_url(url: str, length: str, refresh: bool = False) -> Dict[str, Any]:
+    return await _coalesced(
+        ("summary", _article_key(url), length, refresh),
+        lambda: _summarize_url(url, length, refresh=refresh),
+    )
+
+
+async def _summarize_url(url: str, length: str, refresh: bool = False) -> Dict[str, Any]:
+    article_data, cleaned_text = await load_article(url)
+    llm_result, cached = await summarize_text(
+        cleaned_text, length, refresh=refresh, sections=article_data.get("sections")
+    )
+    return {
+        "title": article_data.get("title", ""),
+        "summary": llm_result.get("summary", ""),
+        "cached": cached,
+    }
+
+
+async def translate_url(url: str, target_language: str, refresh: bool = False) -> Dict[str, Any]:
+    return await _coalesced(
+        ("translation", _article_key(url), target_language.strip().upper(), refresh),
+        lambda: _translate_url(url, target_language, refresh=refresh),
+    )
+
+
+async def _translate_url(url: str, target_language: str, refresh: bool = False) -> Dict[str, Any]:
+    article_data, cleaned_text = await load_article(url)
+    translated, cached = await translate_text(
+        cleaned_text, target_language, refresh=refresh, sections=article_data.get("sections")
+    )
+    return {
+        "title": article_data.get("title", ""),
+        "translated_text": translated,
+        "cached": cached,
+    }
+
+
+async def summarize_stored_article(article_id: int, title: str, length: str, refresh: bool = False) -> Dict[str, Any]:
+    return await _coalesced(
+        ("summary", f"article:{article_id}", length, refresh),
+        lambda: _summarize_stored_article(article_id, title, length, refresh=refresh),
+    )
+
+
+async def _summarize_stored_article(article_id: int, title: str, length: str, refresh: bool = False) -> Dict[str, Any]:
+    article_data, cleaned_text = await load_stored_article(article_id, title)
+    llm_result, cached = await summarize_text(
+        cleaned_text, length, refresh=refresh, sections=article_data.get("sections")
+    )
+    return {
+        "title": article_data.get("title", ""),
+        "summary": llm_result.get("summary", ""),
+        "cached": cached,
+    }
+
+
+async def translate_stored_article(
+    article_id: int, title: str, target_language: str, refresh: bool = False
+) -> Dict[str, Any]:
+    return await _coalesced(
+        ("translation", f"article:{article_id}", target_language.strip().upper(), refresh),
+        lambda: _translate_stored_article(article_id, title, target_language, refresh=refresh),
+    )
+
+
+async def _translate_stored_article(
+    article_id: int, title: str, target_language: str, refresh: bool = False
+) -> Dict[str, Any]:
+    article_data, cleaned_text = await load_stored_article(article_id, title)
+    translated, cached = await translate_text(
+        cleaned_text, target_language, refresh=refresh, sections=article_data.get("sections")
+    )
+    return {
+        "title": article_data.get("title", ""),
+        "translated_text": translated,
+        "cached": cached,
+    }
+
+
+async def generate_quiz_for_url(url: str, refresh: bool = False) -> Dict[str, Any]:
+    return await _coalesced(
+        ("quiz", _article_key(url), refresh),
+        lambda: _generate_quiz_for_url(url, refresh=refresh),
+    )
+
+
+async def _generate_quiz_for_url(url: str, refresh: bool = False) -> Dict[str, Any]:
+    article_data, cleaned_text = await load_article(url)
+    quiz_json, cached = await generate_quiz_from_text(cleaned_text, refresh=refresh)
+    return {
+        "title": article_data.get("title", ""),
+        "multiple_choice": quiz_json.get("multiple_choice", []),
+        "open_questions": quiz_json.get("open_questions", []),
+        "cached": cached,
+    }
+
+
+async def stream_summary_url(url: str, length: str, refresh: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield ``("delta", text)`` events, then one ``("done", result)`` event.
+
+    Long articles run the map phase first and stream only the reduce call.
+    """
+
+    article_data, cleaned_text = await load_article(url)
+    sections = article_data.get("sections")
+    key_parts = dict(
+        model=_summary_budget()[0],
+        variant=length,
+        prompt_version=llm_prompt_service.SUMMARY_PROMPT_VERSION,
+    )
+
+    cached = None if refresh else await llm_cache_service.lookup("summary", cleaned_text, **key_parts)
+    if cached is not None:
+        summary = cached.get("summary", "")
+        yield "delta", summary
+    else:
+        reduce_input = (
+            await _map_summaries(article_chunks(sections, _summary_budget()))
+            if _needs_chunking(cleaned_text, sections, _summary_budget())
+            else cleaned_text
+        )
+        parts: List[str] = []
+        async for delta in llm_router_service.stream_summary(reduce_input, length):
+            parts.append(delta)
+            yield "delta", delta
+        summary = "".join(parts).strip()
+        if summary:
+            await llm_cache_service.store(
+                "summary", cleaned_text, {"summary": summary, "model": _summary_budget()[0]}, **key_parts
+            )
+
+    yield "done", {"title": article_data.get("title", ""), "summary": summary, "cached": cached is not None}
+
+
+async def stream_quiz_url(url: str, refresh: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield a ``("question", ...)`` event per question, then one ``("done", result)`` event.
+
+    Questions are sent as soon as the provider has finished each one.
+    """
+
+    article_data, cleaned_text = await load_article(url)
+    key_parts = _quiz_key_parts()
+
+    cached = None if refresh else await llm_cache_service.lookup("quiz", cleaned_text, **key_parts)
+    quiz: Dict[str, List[Dict[str, Any]]] = {"multiple_choice": [], "open_questions": []}
+    if cached is not None:
+        for kind in quiz:
+            for question in cached.get(kind, []):
+                yield "question", {"type": kind, "index": len(quiz[kind]), "question": question}
+                quiz[kind].append(question)
+    else:
+        async for kind, question in llm_router_service.stream_quiz(cleaned_text):
+            yield "question", {"type": kind, "index": len(quiz[kind]), "question": question}
+            quiz[kind].append(question)
+        if _has_questions(quiz):
+            await llm_cache_service.store("quiz", cleaned_text, quiz, **key_parts)
+
+    yield "done", {"title": article_data.get("title", ""), **quiz, "cached": cached is not None}
+
+
+async def _stream_chunked_translation(chunks: List[str], target_language: str) -> AsyncIterator[str]:
+    # The first chunk is streamed token by token while the remaining chunks
+    # are translated in the background and emitted in order as they finish.
+    semaphore = asyncio.Semaphore(max(1, settings.llm_chunk_concurrency))
+
+    async def translate(chunk: str) -> str:
+        async with semaphore:
+            return await llm_router_service.translate_content(chunk, target_language)
+
+    pending = [asyncio.ensure_future(translate(chunk)) for chunk in chunks[1:]]
+    try:
+        async for delta in llm_router_service.stream_translation(chunks[0], target_language):
+            yield delta
+        for task in pending:
+            translated = await task
+            if translated:
+                yield "\n\n" + translated
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _stream_translation_events(
+    article_data: Dict[str, Any], cleaned_text: str, target_language: str, refresh: bool
+) -> AsyncIterator[Tuple[str, Any]]:
+    sections = article_data.get("sections")
+    key_parts = dict(
+        model=_translation_budget()[0],
+        variant=target_language.strip().upper(),
+        prompt_version=llm_prompt_service.TRANSLATION_PROMPT_VERSION,
+    )
+
+    cached = None if refresh else await llm_cache_service.lookup("translation", cleaned_text, **key_parts)
+    if cached is not None:
+        translated = cached
+        yield "delta", translated
+    else:
+        if _needs_chunking(cleaned_text, sections, _translation_budget()):
+            deltas = _stream_chunked_translation(article_chunks(sections, _translation_budget()), target_language)
+        else:
+            deltas = llm_router_service.stream_translation(cleaned_text, target_language)
+        parts: List[str] = []
+        async for delta in deltas:
+            parts.append(delta)
+            yield "delta", delta
+        translated = "".join(parts)
+        if translated:
+            await llm_cache_service.store("translation", cleaned_text, translated, **key_parts)
+
+    yield "done", {"title": article_data.get("title", ""), "translated_text": translated, "cached": cached is not None}
+
+
+async def stream_translation_url(url: str, target_language: str, refresh: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+    article_data, cleaned_text = await load_article(url)
+    async for event in _stream_translation_events(article_data, cleaned_text, target_language, refresh):
+        yield event
+
+
+async def stream_translation_stored(
+    article_id: int, title: str, target_language: str, refresh: bool = False
+) -> AsyncIterator[Tuple[str, Any]]:
+    article_data, cleaned_text = await load_stored_article(article_id, title)
+    async for event in _stream_translation_events(article_data, cleaned_text, target_language, refresh):
+        yield event
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    return _jobs.stats()
@@ -0,0 +1,162 @@
+"""Quiz generation from streamed JSON.
+
+Providers stream the raw text of a ``QuizContent`` JSON object (Gemini with
+a response schema, Groq in JSON mode). ``QuizStreamParser`` picks each
+question out of the text as soon as its object closes, so questions can be
+sent to the client while the rest are still being generated, and a response
+cut short by the token limit still yields every complete question.
+
+Each question is validated on its own. Instead of regenerating the whole
+quiz when some are invalid or missing, one follow-up call asks for just the
+replacements, naming the rejected items and the questions already kept.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.quiz import MultipleChoiceQuestion, OpenQuestion
+from app.services import llm_prompt_service
+
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("multiple_choice", "open_questions")
+MCQ_OPTIONS = 4
+
+# Streams the raw answer to a (system, user) prompt
+QuizStream = Callable[[Tuple[str, str]], AsyncIterator[str]]
+
+
+class QuizStreamParser:
+    """Incremental scanner for ``{"multiple_choice": [...], "open_questions": [...]}``.
+
+    ``feed`` returns ``(kind, item)`` for every array element object that
+    closed in the new text; ``item`` is the raw text when it is not valid
+    JSON. Text before the first ``{`` (prose, code fences) is skipped.
+    Each character is scanned once, however the text is chunked.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key: str | None = None
+        self._array: str | None = None
+        self._item_start = 0
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        items: List[Tuple[str, Any]] = []
+        self._buffer += text
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._key = buffer[self._string_start + 1:pos]
+            elif char == '"':
+                if self._depth:
+                    self._in_string = True
+                    self._string_start = pos
+            elif char in "{[":
+                if not self._depth and char == "[":
+                    continue
+                if self._depth == 1 and char == "[":
+                    self._array = self._key
+                elif self._depth == 2 and char == "{":
+                    self._item_start = pos
+                self._depth += 1
+            elif char in "}]" and self._depth:
+                self._depth -= 1
+                if self._depth == 2 and char == "}" and self._array in KINDS:
+                    raw = buffer[self._item_start:pos + 1]
+                    try:
+                        items.append((self._array, json.loads(raw)))
+                    except json.JSONDecodeError:
+                        items.append((self._array, raw))
+                elif self._depth == 1:
+                    self._array = None
+        self._pos = len(buffer)
+        return items
+
+
+def validate_question(kind: str, item: Any) -> Dict[str, Any] | None:
+    """The question as a plain dict, or ``None`` when it is unusable."""
+
+    model = MultipleChoiceQuestion if kind == "multiple_choice" else OpenQuestion
+    try:
+        question = model.model_validate(item)
+    except ValidationError:
+        return None
+    if not question.question.strip():
+        return None
+
+    if isinstance(question, OpenQuestion):
+        return question.model_dump() if question.answer.strip() else None
+
+    options = [option.strip() for option in question.options]
+    if len(options) != MCQ_OPTIONS or not all(options) or len(set(options)) != MCQ_OPTIONS:
+        return None
+    if not 0 <= question.correct_index < MCQ_OPTIONS:
+        return None
+    return question.model_dump()
+
+
+async def stream_questions(content: str, stream: QuizStream) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(kind, question)`` as valid questions arrive.
+
+    Once the answer is complete, invalid or missing questions are re-asked.
+    """
+
+    targets = {"multiple_choice": settings.quiz_mcq_count, "open_questions": settings.quiz_open_count}
+    counts = dict.fromkeys(KINDS, 0)
+    accepted: List[str] = []
+    prompt = llm_prompt_service.quiz_prompt(content, targets["multiple_choice"], targets["open_questions"])
+
+    rounds = 1 + max(0, settings.quiz_max_reasks)
+    for attempt in range(rounds):
+        rejected: Dict[str, List[Any]] = {kind: [] for kind in KINDS}
+        parser = QuizStreamParser()
+        async for text in stream(prompt):
+            for kind, item in parser.feed(text):
+                question = validate_question(kind, item)
+                if question is None:
+                    rejected[kind].append(item)
+                    continue
+                counts[kind] += 1
+                accepted.append(question["question"])
+                yield kind, question
+
+        missing = {kind: max(0, targets[kind] - counts[kind]) for kind in KINDS}
+        if not any(missing.values()):
+            return
+        if attempt + 1 == rounds:
+            break
+        logger.info(
+            "[quiz] Attempt %s: %s invalid, %s missing; re-asking",
+            attempt + 1,
+            sum(len(items) for items in rejected.values()),
+            missing,
+        )
+        prompt = llm_prompt_service.quiz_reask_prompt(content, missing, rejected, accepted)
+
+    logger.warning("[quiz] Quiz is incomplete after re-asks: %s", counts)
+
+
+async def generate_quiz(content: str, stream: QuizStream) -> Dict[str, Any]:
+    quiz: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in KINDS}
+    async for kind, question in stream_questions(content, stream):
+        quiz[kind].append(question)
+    return quiz
@@ -1,6 +1,266 @@
-from typing import Dict, Any
+"""Stored quizzes, attempt scoring and open-answer grading.
 
+Every generated quiz is stored with its article and a compact answer key
+(one byte per multiple-choice question), so submitting an attempt is one
+indexed read of the key, a vectorized comparison and one write, with no LLM
+call. Open answers are graded afterwards by a ``grade_attempt`` job (see
+``grading_service``), which adds their points to the attempt's score.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.job import Job, JobStatus
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.schemas.quiz import QuizAttemptCreate
+from app.services import article_service, grading_service
+
+
+GRADING_JOB_KIND = "grade_attempt"
+
+# Key byte for a question whose stored correct index is unusable; never matches
+_NO_ANSWER = 255
+
+
+class QuizNotFoundError(LookupError):
+    pass
+
+
+def build_answer_key(quiz: Dict[str, Any]) -> bytes:
+    key = bytearray()
+    for question in quiz.get("multiple_choice", []):
+        index = question.get("correct_index")
+        options = question.get("options") or []
+        key.append(index if isinstance(index, int) and 0 <= index < min(len(options), _NO_ANSWER) else _NO_ANSWER)
+    return bytes(key)
+
+
+def _digest(quiz: Dict[str, Any]) -> str:
+    content = {"multiple_choice": quiz.get("multiple_choice", []), "open_questions": quiz.get("open_questions", [])}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def save_quiz(db: Session, url: str, title: str, quiz: Dict[str, Any]) -> Quiz | None:
+    """Store ``quiz`` for the article at ``url``; reuse the latest identical quiz.
+
+    A quiz without questions is not stored (``None``): there is nothing to attempt.
+    """
+
+    if not quiz.get("multiple_choice") and not quiz.get("open_questions"):
+        return None
+
+    article_id = article_service.upsert_article(db, url, title, "QUIZ")
+
+    digest = _digest(quiz)
+    latest = db.execute(
+        select(Quiz).where(Quiz.articleid == article_id).order_by(Quiz.id.desc()).limit(1)
+    ).scalar()
+    if latest is not None and latest.digest == digest:
+        return latest
+
+    stored = Quiz(
+        articleid=article_id,
+        questions={"multiple_choice": quiz.get("multiple_choice", []), "open_questions": quiz.get("open_questions", [])},
+        answerkey=build_answer_key(quiz),
+        opencount=len(quiz.get("open_questions", [])),
+        digest=digest,
+    )
+    db.add(stored)
+    db.commit()
+    db.refresh(stored)
+    return stored
+
+
+async def store_quiz(url: str, title: str, quiz: Dict[str, Any]) -> Tuple[int | None, int | None]:
+    """Store a generated quiz off the event loop; return ``(quiz_id, article_id)``.
+
+    Both are ``None`` when the quiz has no questions.
+    """
+
+    def store() -> Tuple[int | None, int | None]:
+        db = SessionLocal()
+        try:
+            stored = save_quiz(db, url, title, quiz)
+            if stored is None:
+                return None, None
+            return stored.id, stored.articleid
+        finally:
+            db.close()
+
+    return await run_blocking(store)
+
+
+def compute_score(answer_key: bytes, answers_mcq: Dict[int, int]) -> int:
+    """Number of multiple-choice answers that match ``answer_key``.
+
+    Answers to question indexes outside the key are ignored.
+    """
+
+    if not answers_mcq:
+        return 0
+    key = np.frombuffer(answer_key, dtype=np.uint8)
+    questions = np.fromiter(answers_mcq.keys(), dtype=np.int64, count=len(answers_mcq))
+    chosen = np.fromiter(answers_mcq.values(), dtype=np.int64, count=len(answers_mcq))
+    in_range = (questions >= 0) & (questions < key.size)
+    return int(np.count_nonzero(key[questions[in_range]] == chosen[in_range]))
+
+
+def _percent(points: float, total: int) -> float:
+    return round(100.0 * points / total, 2) if total else 0.0
+
+
+def submit_attempt(db: Session, user_id: int, payload: QuizAttemptCreate) -> Tuple[QuizAttempt, int, int]:
+    """Score the multiple-choice answers and record the attempt.
+
+    Open answers are stored and a grading job is queued in the same
+    transaction. Returns the attempt and the quiz's multiple-choice and
+    open-question counts. Raises ``QuizNotFoundError`` when the article has
+    no stored quiz (or ``quiz_id`` is not one of its quizzes).
+    """
+
+    query = select(Quiz.id, Quiz.answerkey, Quiz.opencount).where(Quiz.articleid == payload.article_id)
+    if payload.quiz_id is not None:
+        query = query.where(Quiz.id == payload.quiz_id)
+    quiz = db.execute(query.order_by(Quiz.id.desc()).limit(1)).first()
+    # Empty quizzes are no longer stored; older ones cannot be attempted
+    if quiz is None or not (len(quiz.answerkey) or quiz.opencount):
+        raise QuizNotFoundError(f"No quiz has been generated for article {payload.article_id}")
+
+    mcq_total = len(quiz.answerkey)
+    correct = compute_score(quiz.answerkey, payload.answers_mcq)
+    open_answers = {
+        str(index): answer
+        for index, answer in payload.answers_open.items()
+        if 0 <= index < quiz.opencount and answer.strip()
+    }
+
+    attempt = QuizAttempt(
+        userid=user_id,
+        articleid=payload.article_id,
+        quizid=quiz.id,
+        score=_percent(correct, mcq_total + quiz.opencount),
+        mcqcorrect=correct,
+        openanswers=open_answers or None,
+        # Nothing to grade: unanswered open questions score zero
+        gradedat=None if open_answers else datetime.utcnow(),
+    )
+    db.add(attempt)
+    db.flush()
+    if open_answers:
+        db.add(
+            Job(
+                userid=user_id,
+                kind=GRADING_JOB_KIND,
+                payload={"attempt_id": attempt.id},
+                status=JobStatus.QUEUED,
+            )
+        )
+    db.commit()
+    db.refresh(attempt)
+    return attempt, mcq_total, quiz.opencount
+
+
+def _pending_grading(attempt_id: int) -> List[Dict[str, Any]]:
+    """The attempt and up to ``grading_batch_size`` others awaiting grading.
+
+    Each entry carries the attempt id, its multiple-choice points, the
+    quiz's question total and ``(question, reference, answer)`` items. An
+    attempt that is already graded comes back alone, with its scores.
+    """
+
+    db = SessionLocal()
+    try:
+        attempt = db.get(QuizAttempt, attempt_id)
+        if attempt is None:
+            raise LookupError(f"Quiz attempt {attempt_id} not found")
+        if attempt.gradedat is not None:
+            return [{"attempt_id": attempt.id, "score": attempt.score, "open_score": attempt.openscore}]
+
+        others = db.execute(
+            select(QuizAttempt)
+            .where(
+                QuizAttempt.gradedat.is_(None),
+                # Attempts from before stored quizzes have nothing to grade
+                QuizAttempt.quizid.isnot(None),
+                QuizAttempt.openanswers.isnot(None),
+                QuizAttempt.id != attempt_id,
+            )
+            .order_by(QuizAttempt.id)
+            .limit(max(0, settings.grading_batch_size - 1))
+        ).scalars()
+        quizzes: Dict[int, Quiz] = {}
+        pending = []
+        for waiting in [attempt, *others]:
+            quiz = quizzes.get(waiting.quizid)
+            if quiz is None:
+                quiz = quizzes[waiting.quizid] = db.get(Quiz, waiting.quizid)
+            open_questions = quiz.questions.get("open_questions", [])
+            answers = {int(index): answer for index, answer in (waiting.openanswers or {}).items()}
+            pending.append(
+                {
+                    "attempt_id": waiting.id,
+                    "mcq_correct": waiting.mcqcorrect or 0,
+                    "total": len(quiz.answerkey) + quiz.opencount,
+                    "items": [
+                        (
+                            str(open_questions[index].get("question", "")),
+                            str(open_questions[index].get("answer", "")),
+                            answers[index],
+                        )
+                        for index in sorted(answers)
+                        if index < len(open_questions)
+                    ],
+                }
+            )
+        return pending
+    finally:
+        db.close()
+
+
+def _save_grades(scores: Dict[int, Tuple[float, float]]) -> None:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        for attempt in db.execute(select(QuizAttempt).where(QuizAttempt.id.in_(list(scores)))).scalars():
+            if attempt.gradedat is None:
+                attempt.openscore, attempt.score = scores[attempt.id]
+                attempt.gradedat = now
+        db.commit()
+    finally:
+        db.close()
+
+
+async def grade_attempt(attempt_id: int) -> Dict[str, Any]:
+    """Grade an attempt's open answers and fold them into its score.
+
+    Other attempts waiting for grading are graded in the same batch, so a
+    class submitting together is graded by the first job; the jobs queued
+    for the others find their attempts done.
+    """
+
+    pending = await run_blocking(_pending_grading, attempt_id)
+    if "items" not in pending[0]:
+        return {**pending[0], "batch": 0}
+
+    grades = await grading_service.grade_answers([item for entry in pending for item in entry["items"]])
+    scores: Dict[int, Tuple[float, float]] = {}
+    position = 0
+    for entry in pending:
+        open_score = float(sum(grades[position:position + len(entry["items"])]))
+        position += len(entry["items"])
+        scores[entry["attempt_id"]] = (open_score, _percent(entry["mcq_correct"] + open_score, entry["total"]))
+    await run_blocking(_save_grades, scores)
+
+    open_score, score = scores[attempt_id]
+    return {"attempt_id": attempt_id, "score": score, "open_score": open_score, "batch": len(pending)}
 
-def compute_score(quiz_definition: Dict[str, Any], answers_mcq: Dict[int, int]) -> int:
-    # TODO: implement scoring logic based on correct answers from quiz_definition
-    raise NotImplementedError
@@ -0,0 +1,197 @@
+"""Full-text search over ingested articles.
+
+An SQLite FTS5 index (inverted index with BM25 ranking) in
+``settings.search_index_path``, like the other local stores. Each document
+is the cleaned text of an article, keyed by URL so re-ingesting a page
+replaces its entry; Wikipedia ingest adds documents as it stores content,
+and the dump importer can index a whole dump in batches. The index is
+shared by every user, so PDF uploads are never added to it.
+
+Queries are reduced to their words (FTS5 operators in user input are not
+interpreted): every word must match, the last one as a prefix so partial
+input still finds results (from three letters on). Titles weigh more than
+body text.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# bm25() weight of a title match relative to a body match
+_TITLE_WEIGHT = 10.0
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+_SNIPPET_TOKENS = 24
+# Shorter last words match exactly: a one- or two-letter prefix expands to a
+# large part of the vocabulary
+_MIN_PREFIX = 3
+# URL scheme of PDF uploads (see routes_articles)
+_UPLOAD_PREFIX = "upload://"
+
+# (url, title, body, article id or None)
+Document = Tuple[str, str, str, int | None]
+
+
+def _docid(url: str) -> int:
+    # Stable 63-bit rowid per URL, so replacing a document needs no lookup table
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def to_match_query(query: str) -> str | None:
+    """FTS5 MATCH expression for free-text ``query``; ``None`` when it has no words."""
+
+    words = _WORD.findall(query.lower())[:16]
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if len(words[-1]) >= _MIN_PREFIX:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.searches = 0
+        self.indexed = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # prefix: extra index entries for 3- and 4-letter prefixes, which
+        # keep partial-word queries from scanning every matching term
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5("
+            " title, body, url UNINDEXED, article_id UNINDEXED,"
+            " tokenize='porter unicode61 remove_diacritics 2', prefix='3 4')"
+        )
+
+    def add_many(self, documents: Iterable[Document]) -> int:
+        """Insert or replace ``documents`` in one transaction."""
+
+        rows = [(_docid(url), title, body, url, article_id) for url, title, body, article_id in documents]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM documents WHERE rowid = ?", [(row[0],) for row in rows])
+            self._conn.executemany(
+                "INSERT INTO documents (rowid, title, body, url, article_id) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self.indexed += len(rows)
+        return len(rows)
+
+    def remove(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE rowid = ?", (_docid(url),))
+
+    def search(self, query: str, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+        match = to_match_query(query)
+        if match is None:
+            return []
+        with self._lock:
+            self.searches += 1
+            # Earlier versions indexed uploads; never return them
+            rows = self._conn.execute(
+                "SELECT article_id, title, url,"
+                " snippet(documents, 1, ?, ?, '...', ?), bm25(documents, ?, 1.0) AS score"
+                " FROM documents WHERE documents MATCH ? AND substr(url, 1, ?) != ?"
+                " ORDER BY score LIMIT ? OFFSET ?",
+                (
+                    SNIPPET_START,
+                    SNIPPET_END,
+                    _SNIPPET_TOKENS,
+                    _TITLE_WEIGHT,
+                    match,
+                    len(_UPLOAD_PREFIX),
+                    _UPLOAD_PREFIX,
+                    limit,
+                    offset,
+                ),
+            ).fetchall()
+        return [
+            # bm25() is lower for better matches; expose higher-is-better
+            {"article_id": article_id, "title": title, "url": url, "snippet": snippet, "score": round(-score, 4)}
+            for article_id, title, url, snippet, score in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def optimize(self) -> None:
+        """Merge index segments; worth running after a bulk import."""
+
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO documents (documents) VALUES ('optimize')")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "searches": self.searches, "indexed": self.indexed}
+
+
+_index: SearchIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex | None:
+    global _index
+
+    path = settings.search_index_path
+    index = _index
+    if index is not None and index.path == path:
+        return index
+    if not path:
+        return None
+    with _index_lock:
+        if _index is None or _index.path != path:
+            if _index is not None:
+                _index.close()
+            _index = SearchIndex(path)
+        return _index
+
+
+async def index_article(url: str, title: str, body: str, article_id: int | None = None) -> None:
+    """Add or replace one article; failures are logged, never raised to the ingest."""
+
+    index = get_index()
+    if index is None or not body:
+        return
+    try:
+        await run_blocking(index.add_many, [(url, title, body, article_id)])
+    except sqlite3.Error:
+        logger.exception("[search] Failed to index %r", url)
+
+
+async def search(query: str, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+    index = get_index()
+    if index is None:
+        return []
+    return await run_blocking(index.search, query, limit, offset)
+
+
+def close() -> None:
+    global _index
+
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+            _index = None
+
+
+def get_stats() -> Dict[str, Any] | None:
+    return _index.stats() if _index is not None else None
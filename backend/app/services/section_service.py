@@ -0,0 +1,99 @@
+"""Section parsing and cleaning for plain-text Wikipedia extracts.
+
+Headings of every level (``== History ==``, ``=== Early years ===`` ...) are
+found in one compiled regex scan. Sections keep offsets into the original
+string and form a tree by heading level; each section body is cleaned as the
+scan closes it, so callers get LLM-ready text without re-joining and
+re-scanning the whole article.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+INTRODUCTION = "Introduction"
+
+_HEADING = re.compile(r"^(={2,6})[ \t]*(.+?)[ \t]*\1[ \t]*$", re.MULTILINE)
+_REFERENCE = re.compile(r"\[\d+\]")
+
+
+@dataclass
+class Section:
+    title: str
+    # 1 for the lead section, otherwise the number of "=" in the heading
+    level: int
+    # Body offsets into ParsedArticle.source (heading line excluded)
+    start: int
+    end: int
+    children: List["Section"] = field(default_factory=list)
+    # Cleaned body, filled in during the scan when parsing with clean=True
+    cleaned: str | None = None
+
+
+@dataclass
+class ParsedArticle:
+    source: str
+    # Virtual document node; its children are the lead and top-level sections
+    root: Section
+    # Every section in document order
+    sections: List[Section]
+
+    def body(self, section: Section) -> str:
+        return self.source[section.start:section.end].strip()
+
+    def to_dict(self) -> Dict[str, str]:
+        """Flatten to ``{title: text}`` in document order.
+
+        Uses the cleaned text when available. Repeated titles (e.g. "Notes"
+        under two parents) get a " (2)", " (3)" ... suffix instead of
+        overwriting each other.
+        """
+
+        result: Dict[str, str] = {}
+        for section in self.sections:
+            title = section.title
+            suffix = 2
+            while title in result:
+                title = f"{section.title} ({suffix})"
+                suffix += 1
+            result[title] = section.cleaned if section.cleaned is not None else self.body(section)
+        return result
+
+
+def clean_text(text: str) -> str:
+    """Drop numeric reference markers and collapse whitespace.
+
+    ``str.split``/``join`` collapses whitespace in C, and the reference regex
+    only runs when the text contains a ``[`` at all (extracts usually don't).
+    """
+
+    if "[" in text:
+        text = _REFERENCE.sub("", text)
+    return " ".join(text.split())
+
+
+def parse_sections(source: str, clean: bool = True) -> ParsedArticle:
+    root = Section(title="", level=0, start=0, end=len(source))
+    lead = Section(title=INTRODUCTION, level=1, start=0, end=len(source))
+    root.children.append(lead)
+
+    sections = [lead]
+    stack = [root]
+    current = lead
+    for match in _HEADING.finditer(source):
+        current.end = match.start()
+        if clean:
+            current.cleaned = clean_text(source[current.start:current.end])
+
+        level = len(match.group(1))
+        while stack[-1].level >= level:
+            stack.pop()
+        current = Section(title=match.group(2), level=level, start=match.end(), end=len(source))
+        stack[-1].children.append(current)
+        stack.append(current)
+        sections.append(current)
+
+    if clean:
+        current.cleaned = clean_text(source[current.start:current.end])
+    return ParsedArticle(source=source, root=root, sections=sections)
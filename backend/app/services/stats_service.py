@@ -1,19 +1,165 @@
+"""Platform statistics for the admin dashboard.
+
+Everything is read from the counters that ``app.db.counters`` keeps in the
+writers' transactions: the totals are primary-key lookups and the daily
+series short range scans, so the cost does not grow with the users,
+articles or attempts tables. The response is cached for
+``admin_stats_cache_ttl_seconds``.
+
+LLM calls are tallied in memory by ``llm_router_service`` and added to the
+counters every ``stats_flush_interval_seconds``, on shutdown and before
+each uncached read.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.models.article import Article
-from app.models.quiz_attempt import QuizAttempt
-from app.models.user import User
+from app.core.cache import TTLCache
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+from app.db import counters
+from app.db.session import SessionLocal
+from app.models.stat_counter import StatCounter
+from app.services import llm_router_service
+
+
+logger = logging.getLogger(__name__)
+
+_cache = TTLCache(maxsize=1, ttl=settings.admin_stats_cache_ttl_seconds)
+_flusher: asyncio.Task | None = None
+
+
+def _average(count: int, total: float) -> float | None:
+    return round(total / count, 2) if count else None
+
+
+def flush_llm_calls() -> None:
+    """Add the LLM calls counted in this process to the counters."""
+
+    calls = llm_router_service.drain_call_counts()
+    if not calls:
+        return
+    deltas = {
+        (f"{counters.LLM_CALLS_PREFIX}{operation}", day): [count, 0.0]
+        for (operation, day), count in calls.items()
+    }
+    db = SessionLocal()
+    try:
+        counters.apply(db.connection(), deltas)
+        db.commit()
+    except Exception:  # noqa: BLE001
+        logger.exception("[stats] Failed to record %s LLM calls", sum(calls.values()))
+    finally:
+        db.close()
+
+
+def _read(db: Session) -> Dict[str, Any]:
+    names = (counters.USERS, counters.ARTICLES, counters.QUIZZES, counters.ATTEMPTS)
+    totals = {
+        counter.name: counter
+        for counter in db.execute(
+            select(StatCounter).where(StatCounter.name.in_(names), StatCounter.key == "")
+        ).scalars()
+    }
 
+    def total(name: str) -> int:
+        return int(totals[name].count) if name in totals else 0
 
-def get_global_stats(db: Session) -> dict:
-    total_users = db.query(User).count()
-    total_articles = db.query(Article).count()
-    total_quizzes_generated = db.query(QuizAttempt).count()  # proxy
-    total_downloads = 0  # to be tracked when export feature is implemented
+    since = counters.day_key(datetime.utcnow() - timedelta(days=settings.admin_stats_days - 1))
+    days = db.execute(
+        select(StatCounter)
+        .where(StatCounter.name == counters.ATTEMPTS_BY_DAY, StatCounter.key >= since)
+        .order_by(StatCounter.key)
+    ).scalars()
+    articles = db.execute(
+        select(StatCounter)
+        .where(StatCounter.name == counters.ATTEMPTS_BY_ARTICLE, StatCounter.count > 0)
+        .order_by(StatCounter.count.desc(), StatCounter.key)
+        .limit(settings.admin_stats_top_articles)
+    ).scalars()
+    llm_calls: Dict[str, Any] = {}
+    for counter in db.execute(
+        select(StatCounter)
+        .where(StatCounter.name.startswith(counters.LLM_CALLS_PREFIX, autoescape=True), StatCounter.key >= since)
+        .order_by(StatCounter.name, StatCounter.key)
+    ).scalars():
+        operation = counter.name[len(counters.LLM_CALLS_PREFIX):]
+        llm_calls.setdefault(operation, []).append({"day": date.fromisoformat(counter.key), "count": int(counter.count)})
 
+    attempts = totals.get(counters.ATTEMPTS)
     return {
-        "total_users": total_users,
-        "total_articles": total_articles,
-        "total_quizzes_generated": total_quizzes_generated,
-        "total_downloads": total_downloads,
+        "total_users": total(counters.USERS),
+        "total_articles": total(counters.ARTICLES),
+        "total_quizzes_generated": total(counters.QUIZZES),
+        "total_downloads": 0,  # to be tracked when export feature is implemented
+        "total_quiz_attempts": total(counters.ATTEMPTS),
+        "average_score": _average(attempts.count, attempts.total) if attempts else None,
+        "attempts_per_day": [
+            {
+                "day": date.fromisoformat(counter.key),
+                "attempts": int(counter.count),
+                "average_score": _average(counter.count, counter.total),
+            }
+            for counter in days
+            if counter.count
+        ],
+        "article_scores": [
+            {
+                "article_id": int(counter.key),
+                "attempts": int(counter.count),
+                "average_score": _average(counter.count, counter.total),
+            }
+            for counter in articles
+        ],
+        "llm_calls": llm_calls,
     }
+
+
+def get_global_stats(db: Session) -> Dict[str, Any]:
+    stats = _cache.get("global")
+    if stats is None:
+        flush_llm_calls()
+        stats = _read(db)
+        _cache.set("global", stats)
+    return stats
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def rebuild_counters() -> None:
+    db = SessionLocal()
+    try:
+        counters.rebuild(db)
+    finally:
+        db.close()
+    clear_cache()
+
+
+async def _flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.stats_flush_interval_seconds)
+        await run_blocking(flush_llm_calls)
+
+
+def start_flusher() -> None:
+    global _flusher
+
+    if _flusher is None:
+        _flusher = asyncio.create_task(_flush_periodically())
+
+
+async def stop_flusher() -> None:
+    global _flusher
+
+    if _flusher is not None:
+        _flusher.cancel()
+        await asyncio.gather(_flusher, return_exceptions=True)
+        _flusher = None
+    await run_blocking(flush_llm_calls)
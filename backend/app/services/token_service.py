@@ -0,0 +1,178 @@
+"""Token estimation and input budgeting for LLM calls.
+
+No tokenizer for the Groq (Llama 3) or Gemini models ships with the app, so
+token counts are estimated from character classes: ASCII text costs about a
+quarter of a token per character, while Cyrillic, Arabic and especially CJK
+text cost several times more. Classes are told apart by UTF-8 width, which
+tracks script closely enough, and each model family has its own rates.
+
+Estimates are calibrated at runtime: whenever an API response reports the
+real prompt token count, the model's correction factor moves towards
+``actual / estimated`` (an exponentially weighted average), so the budgets
+converge on what the provider actually bills.
+"""
+
+import logging
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+
+
+logger = logging.getLogger(__name__)
+
+# Tokens per character by UTF-8 width, per model family (matched as a
+# substring of the model name):
+# - ascii: 1 byte (English, code, digits)
+# - alphabetic: 2 bytes (accented Latin, Greek, Cyrillic, Hebrew, Arabic)
+# - cjk: 3 bytes (CJK, Hangul, Indic, Thai, ...)
+# - astral: 4 bytes (emoji, rare ideographs)
+# Models of unknown families use the Llama 3 rates.
+_LLAMA = {"ascii": 0.25, "alphabetic": 0.42, "cjk": 0.9, "astral": 1.5}
+_PROFILES: Dict[str, Dict[str, float]] = {
+    # Llama 3 tokenizer (128k vocabulary), used by the Groq models
+    "llama": _LLAMA,
+    # Gemini (256k vocabulary) packs non-Latin scripts tighter
+    "gemini": {"ascii": 0.25, "alphabetic": 0.32, "cjk": 0.7, "astral": 1.2},
+}
+
+# How quickly calibration follows the latest observation, and its bounds
+_CALIBRATION_WEIGHT = 0.2
+_CALIBRATION_BOUNDS = (0.5, 2.5)
+
+_lock = threading.Lock()
+_correction: Dict[str, float] = {}
+_usage: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+
+def _profile(model: str) -> Dict[str, float]:
+    model = model.lower()
+    for family, rates in _PROFILES.items():
+        if family in model:
+            return rates
+    return _LLAMA
+
+
+def _raw_estimate(text: str, model: str) -> float:
+    rates = _profile(model)
+    if text.isascii():
+        return len(text) * rates["ascii"]
+
+    # Count characters per UTF-8 width with C-level encodes instead of a
+    # Python loop or regex scan (a few ms per MB of text).
+    chars = len(text)
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    astral = len(text.encode("utf-16-le", "surrogatepass")) // 2 - chars
+    wide_bytes = len(text.encode("utf-8", "surrogatepass")) - ascii_chars - 4 * astral
+    wide_chars = chars - ascii_chars - astral
+    cjk = wide_bytes - 2 * wide_chars
+    alphabetic = wide_chars - cjk
+    return (
+        ascii_chars * rates["ascii"]
+        + alphabetic * rates["alphabetic"]
+        + cjk * rates["cjk"]
+        + astral * rates["astral"]
+    )
+
+
+def estimate_tokens(text: str, model: str) -> int:
+    """Estimated number of tokens ``model`` will bill for ``text``."""
+
+    if not text:
+        return 0
+    return math.ceil(_raw_estimate(text, model) * _correction.get(model, 1.0))
+
+
+def char_budget(text: str, max_tokens: int, model: str) -> int:
+    """How many characters of text like ``text`` fit in ``max_tokens``.
+
+    Uses the token density of ``text`` itself, so the same token budget
+    allows about four times more characters of English than of Chinese.
+    """
+
+    tokens = estimate_tokens(text, model)
+    if tokens <= max_tokens:
+        return max(len(text), 1)
+    return max(1, int(len(text) * max_tokens / tokens))
+
+
+def truncate(text: str, max_tokens: int, model: str) -> str:
+    """Cut ``text`` to at most ``max_tokens`` estimated tokens.
+
+    The cut falls on the last whitespace before the limit when there is one
+    nearby, so words are not split.
+    """
+
+    if estimate_tokens(text, model) <= max_tokens:
+        return text
+
+    cut = char_budget(text, max_tokens, model)
+    # Token density varies across the text; shrink until the prefix fits.
+    while cut > 1 and estimate_tokens(text[:cut], model) > max_tokens:
+        cut = int(cut * 0.95)
+
+    space = text.rfind(" ", max(0, cut - 100), cut)
+    return text[: space if space > 0 else cut]
+
+
+def record_usage(
+    model: str,
+    estimated_input: int,
+    actual_input: int | None = None,
+    output: int | None = None,
+) -> None:
+    """Account one LLM call and calibrate the model's estimate.
+
+    ``estimated_input`` is what ``estimate_tokens`` returned for the prompt;
+    ``actual_input``/``output`` are the counts the provider reported, when
+    it did.
+    """
+
+    # Providers omit usage on some responses
+    actual_input = actual_input if isinstance(actual_input, int) else None
+    output = output if isinstance(output, int) else None
+
+    with _lock:
+        usage = _usage[model]
+        usage["calls"] += 1
+        usage["estimated_input_tokens"] += estimated_input
+        if output:
+            usage["output_tokens"] += output
+        if actual_input and estimated_input:
+            usage["measured_estimated_input_tokens"] += estimated_input
+            usage["actual_input_tokens"] += actual_input
+            correction = _correction.get(model, 1.0)
+            observed = correction * actual_input / estimated_input
+            low, high = _CALIBRATION_BOUNDS
+            _correction[model] = min(high, max(low, correction + _CALIBRATION_WEIGHT * (observed - correction)))
+
+    logger.info(
+        "[llm] %s: ~%s input tokens (reported: %s input, %s output)",
+        model,
+        estimated_input,
+        actual_input if actual_input is not None else "n/a",
+        output if output is not None else "n/a",
+    )
+
+
+def reset() -> None:
+    with _lock:
+        _correction.clear()
+        _usage.clear()
+
+
+def get_stats() -> Dict[str, Any]:
+    with _lock:
+        stats: Dict[str, Any] = {}
+        for model, usage in _usage.items():
+            measured = usage["measured_estimated_input_tokens"]
+            stats[model] = {
+                "calls": usage["calls"],
+                "estimated_input_tokens": usage["estimated_input_tokens"],
+                "actual_input_tokens": usage["actual_input_tokens"],
+                "output_tokens": usage["output_tokens"],
+                # Reported / estimated input tokens over calls that reported usage
+                "estimate_accuracy": round(usage["actual_input_tokens"] / measured, 3) if measured else None,
+                "correction": round(_correction.get(model, 1.0), 3),
+            }
+        return stats
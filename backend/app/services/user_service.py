@@ -1,10 +1,33 @@
-from sqlalchemy.orm import Session
+from dataclasses import dataclass
+from typing import Any, Dict
 
-from app.core.security import get_password_hash, verify_password
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import dummy_verify_password, hash_password, verify_and_update_password
 from app.models.user import Role, User
 from app.schemas.user import UserCreate
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Verified identity of the caller, detached from any DB session."""
+
+    id: int
+    role: Role
+
+
+# user id -> Principal. Entries are dropped when the user row is updated or
+# deleted through the ORM in this process; the TTL bounds staleness for
+# changes made elsewhere (other processes, bulk UPDATEs, manual SQL).
+_principals = TTLCache(
+    maxsize=settings.auth_principal_cache_max_entries,
+    ttl=settings.auth_principal_cache_ttl_seconds,
+)
+
+
 def get_user_by_username(db: Session, username: str) -> User | None:
     return db.query(User).filter(User.username == username).first()
 
@@ -13,11 +36,11 @@ def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
+async def create_user(db: Session, user_in: UserCreate) -> User:
     user = User(
         username=user_in.username,
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await hash_password(user_in.password),
         role=Role.USER,
     )
     db.add(user)
@@ -26,10 +49,58 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     return user
 
 
-def authenticate_user(db: Session, username: str, password: str) -> User | None:
+async def authenticate_user(db: Session, username: str, password: str) -> User | None:
     user = get_user_by_username(db, username)
+    # Return the connection to the pool while the hash is checked; a login
+    # storm would otherwise pin one connection per queued login.
+    db.close()
     if not user:
+        await dummy_verify_password()
         return None
-    if not verify_password(password, user.hashed_password):
+
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash is not None:
+        # Stored hash predates the current rounds; upgrade it transparently.
+        db.add(user)
+        user.hashed_password = new_hash
+        db.commit()
+        db.refresh(user)
     return user
+
+
+def get_principal(db: Session, user_id: int) -> Principal | None:
+    principal = _principals.get(user_id)
+    if principal is None:
+        user = db.get(User, user_id)
+        if user is None:
+            return None
+        principal = Principal(id=user.id, role=user.role)
+        _principals.set(user_id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    _principals.pop(user_id)
+
+
+def get_principal_cache_stats() -> Dict[str, Any]:
+    return _principals.stats()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_principal(target.id)
+    # A concurrent request may re-cache the old row before this transaction
+    # commits, so drop the entry again once it has.
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_principal(user_id)
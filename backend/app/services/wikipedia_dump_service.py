@@ -0,0 +1,247 @@
+"""Stream pages out of a Wikipedia dump into the local article store.
+
+Reads a MediaWiki XML export (``pages-articles.xml.bz2``) or a JSON Lines
+dump, bz2-compressed or not, one page at a time: the XML parser drops each
+``<page>`` element once it has been read, so memory stays flat however big
+the dump is. Wikitext is reduced to the same plain text the MediaWiki
+``extracts`` API returns (``== Heading ==`` lines kept, templates, tables,
+references and markup removed), so ``section_service`` parses both alike.
+
+JSON Lines records need a ``title`` and either ``text`` (plain text, stored
+as is) or ``wikitext``; ``revision_id``, ``url`` and ``redirect`` (target
+title) are optional.
+"""
+
+import bz2
+import html
+import json
+import logging
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, Iterator, List
+from urllib.parse import quote
+
+from app.core.config import settings
+from app.services import section_service
+from app.services.article_store_service import ArticleStoreWriter
+from app.services.search_service import Document, SearchIndex
+
+
+logger = logging.getLogger(__name__)
+
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+# Tags whose content is not prose
+_DROPPED_ELEMENT = re.compile(
+    r"<(gallery|math|chem|score|timeline|syntaxhighlight|source|imagemap|references|ref)\b[^>]*?(?:/>|>.*?</\1\s*>)",
+    re.S | re.I,
+)
+_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+_TEMPLATE = re.compile(r"\{\{[^{}]*\}\}")
+_TABLE = re.compile(r"\{\|(?:(?!\{\|).)*?\|\}", re.S)
+_LINK = re.compile(r"\[\[([^\[\]]*)\]\]")
+_EXTERNAL_LINK = re.compile(r"\[(?:https?:)?//[^\s\]]*(?:\s+([^\]]*))?\]")
+_EMPHASIS = re.compile(r"'{2,}")
+_BEHAVIOR_SWITCH = re.compile(r"__[A-Z]+__")
+_LIST_MARKER = re.compile(r"^[*#:;]+[ \t]*", re.M)
+_HEADING = re.compile(r"^(={2,6})[ \t]*(.+?)[ \t]*\1[ \t]*$", re.M)
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.M)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+# Link namespaces that are not article text (plus interlanguage links)
+_DROPPED_NAMESPACES = {"file", "image", "media", "category"}
+_LANGUAGE_PREFIX = re.compile(r"^[a-z]{2,3}(?:-[a-z]+)?$")
+
+# Nesting deeper than this is left to the final brace cleanup
+_MAX_PASSES = 10
+
+# Pages per search index transaction
+_INDEX_BATCH_SIZE = 1000
+
+
+@dataclass
+class DumpPage:
+    title: str
+    revision_id: int
+    content: str
+    # Target title when the page is a redirect
+    redirect: str | None = None
+    url: str | None = None
+
+
+def _replace_link(match: "re.Match[str]") -> str:
+    target, _, label = match.group(1).partition("|")
+    target = target.strip()
+    namespace, colon, _ = target.lstrip(":").partition(":")
+    if colon and not target.startswith(":"):
+        namespace = namespace.strip().lower()
+        if namespace in _DROPPED_NAMESPACES or _LANGUAGE_PREFIX.match(namespace):
+            return ""
+    if label:
+        # Only the last part of a piped link is displayed
+        return label.rsplit("|", 1)[-1]
+    return target.lstrip(":").lstrip("#")
+
+
+def _repeat(pattern: "re.Pattern[str]", replacement: Any, text: str) -> str:
+    # Innermost constructs match first; each pass unwraps one nesting level
+    for _ in range(_MAX_PASSES):
+        text, count = pattern.subn(replacement, text)
+        if not count:
+            break
+    return text
+
+
+def strip_markup(wikitext: str) -> str:
+    """Plain text of ``wikitext`` with ``== Heading ==`` lines kept."""
+
+    text = _COMMENT.sub("", wikitext)
+    text = _DROPPED_ELEMENT.sub("", text)
+    text = _repeat(_TEMPLATE, "", text).replace("{{", "").replace("}}", "")
+    text = _repeat(_TABLE, "", text)
+    text = _TAG.sub("", text)
+    text = _repeat(_LINK, _replace_link, text)
+    text = _EXTERNAL_LINK.sub(lambda match: match.group(1) or "", text)
+    text = _EMPHASIS.sub("", text)
+    text = _BEHAVIOR_SWITCH.sub("", text)
+    text = html.unescape(text)
+    text = _LIST_MARKER.sub("", text)
+    text = _HEADING.sub(lambda match: f"{match.group(1)} {match.group(2)} {match.group(1)}", text)
+    text = _TRAILING_SPACE.sub("", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _default_base_url() -> str:
+    return settings.wikipedia_api_url.rsplit("/w/", 1)[0] + "/wiki/"
+
+
+def page_url(base_url: str, title: str) -> str:
+    return base_url + quote(title.replace(" ", "_"), safe="()_,:;'!*@$-.~/")
+
+
+def _open(path: str) -> IO[bytes]:
+    return bz2.open(path, "rb") if path.endswith(".bz2") else open(path, "rb")
+
+
+def iter_xml_pages(stream: IO[bytes]) -> Iterator[DumpPage]:
+    """Main-namespace pages of a MediaWiki XML export, in file order."""
+
+    events = ET.iterparse(stream, events=("start", "end"))
+    _, root = next(events)
+    namespace = root.tag[: root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+    base_url = _default_base_url()
+
+    for event, element in events:
+        if event != "end":
+            continue
+        if element.tag == f"{namespace}base" and element.text:
+            # https://en.wikipedia.org/wiki/Main_Page
+            base_url = element.text.rsplit("/", 1)[0] + "/"
+        elif element.tag == f"{namespace}page":
+            if element.findtext(f"{namespace}ns", "0") == "0":
+                title = element.findtext(f"{namespace}title", "")
+                redirect = element.find(f"{namespace}redirect")
+                revision = element.find(f"{namespace}revision")
+                revision_id = revision.findtext(f"{namespace}id", "0") if revision is not None else "0"
+                wikitext = revision.findtext(f"{namespace}text", "") if revision is not None else ""
+                yield DumpPage(
+                    title=title,
+                    revision_id=int(revision_id),
+                    content="" if redirect is not None else strip_markup(wikitext),
+                    redirect=redirect.get("title") if redirect is not None else None,
+                    url=page_url(base_url, title),
+                )
+            # Finished pages are dropped so memory does not grow with the dump
+            root.clear()
+
+
+def iter_jsonl_pages(stream: IO[bytes]) -> Iterator[DumpPage]:
+    base_url = _default_base_url()
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            title = record["title"]
+        except (ValueError, KeyError):
+            logger.warning("[dump] Skipping malformed record on line %s", number)
+            continue
+        content = record["text"] if "text" in record else strip_markup(record.get("wikitext", ""))
+        yield DumpPage(
+            title=title,
+            revision_id=int(record.get("revision_id") or 0),
+            content=content,
+            redirect=record.get("redirect"),
+            url=record.get("url") or page_url(base_url, title),
+        )
+
+
+def iter_pages(path: str) -> Iterator[DumpPage]:
+    """Pages of the dump at ``path``; JSON Lines when named ``*.jsonl[.bz2]``."""
+
+    with _open(path) as stream:
+        if path.removesuffix(".bz2").endswith((".jsonl", ".json")):
+            yield from iter_jsonl_pages(stream)
+        else:
+            yield from iter_xml_pages(stream)
+
+
+def search_text(content: str) -> str:
+    """The text of a stored page as ingest indexes it: cleaned sections, no headings."""
+
+    return " ".join(text for text in section_service.parse_sections(content).to_dict().values() if text)
+
+
+def import_dump(
+    path: str,
+    store_path: str,
+    limit: int | None = None,
+    progress: Callable[[Dict[str, Any]], None] | None = None,
+    progress_every: int = 10000,
+    index_path: str | None = None,
+) -> Dict[str, Any]:
+    """Append the pages of a dump to the store at ``store_path``.
+
+    Pages with no text left after markup removal are skipped. With
+    ``index_path``, pages are also added to the full-text search index there.
+    """
+
+    started = time.monotonic()
+    skipped = 0
+    index = SearchIndex(index_path) if index_path else None
+    documents: List[Document] = []
+
+    def report() -> Dict[str, Any]:
+        elapsed = time.monotonic() - started
+        return {
+            "pages": writer.pages,
+            "redirects": writer.redirects,
+            "skipped": skipped,
+            "seconds": round(elapsed, 1),
+            "pages_per_second": round(writer.pages / elapsed, 1) if elapsed else None,
+        }
+
+    with ArticleStoreWriter(store_path) as writer:
+        for page in iter_pages(path):
+            if page.redirect:
+                writer.add_redirect(page.title, page.redirect, page.url)
+            elif page.content:
+                writer.add(page.title, page.url, page.revision_id, page.content)
+                if index is not None:
+                    documents.append((page.url, page.title, search_text(page.content), None))
+                    if len(documents) >= _INDEX_BATCH_SIZE:
+                        index.add_many(documents)
+                        documents.clear()
+            else:
+                skipped += 1
+            seen = writer.pages + writer.redirects + skipped
+            if progress is not None and seen % progress_every == 0:
+                progress(report())
+            if limit is not None and writer.pages >= limit:
+                break
+    if index is not None:
+        index.add_many(documents)
+        index.optimize()
+        index.close()
+    return report()
@@ -1,19 +1,36 @@
 from typing import Dict, Any
 from urllib.parse import urlparse, unquote
-import re
+import time
 
-import requests
-import wikipedia
+import httpx
 
+from app.core.concurrency import SingleFlight
 from app.core.config import settings
+from app.services import article_cache_service, article_store_service, section_service
+from app.services.article_cache_service import CachedPage
 
 
-session = requests.Session()
-session.headers.update({
-    "User-Agent": settings.wikipedia_user_agent,
-})
+_client: httpx.AsyncClient | None = None
 
-wikipedia.requests = session
+# Concurrent requests for the same normalized title share one Wikipedia call.
+_fetches = SingleFlight("wikipedia_fetch")
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": settings.wikipedia_user_agent},
+            timeout=settings.wikipedia_timeout_seconds,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 def extract_title_from_url(url: str) -> str:
@@ -28,63 +45,85 @@ def extract_title_from_url(url: str) -> str:
     return title
 
 
-def fetch_article_sections(url: str) -> Dict[str, Any]:
-    title = extract_title_from_url(url)
-    page = wikipedia.page(title)
-    content = page.content
+async def _download_page(title: str) -> CachedPage:
+    """Fetch plain-text content and revision id in one MediaWiki API call."""
+
+    response = await _get_client().get(
+        settings.wikipedia_api_url,
+        params={
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "prop": "extracts|revisions|info",
+            "explaintext": "1",
+            "rvprop": "ids",
+            "inprop": "url",
+            "redirects": "1",
+            "titles": title,
+        },
+    )
+    response.raise_for_status()
+
+    pages = response.json().get("query", {}).get("pages") or []
+    if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+        raise LookupError(f"Wikipedia page not found: {title}")
+
+    page = pages[0]
+    return CachedPage(
+        title=page["title"],
+        url=page["fullurl"],
+        revision_id=page["revisions"][0]["revid"],
+        content=page.get("extract") or "",
+        fetched_at=time.time(),
+    )
+
+
+async def _fetch_and_store(title: str, title_key: str) -> CachedPage:
+    page = await _download_page(title)
+    await article_cache_service.put(title_key, page)
+    return page
+
+
+async def get_page(title: str) -> CachedPage:
+    """Return the raw page for ``title``.
+
+    Looks in the local dump store, then the article cache, and only then
+    asks Wikipedia (unless ``wikipedia_live_fallback`` is off).
+    """
 
-    sections: Dict[str, Any] = {}
-    current_section = "Introduction"
-    sections[current_section] = []
+    stored = await article_store_service.get(title)
+    if stored is not None:
+        return stored
 
-    for line in content.splitlines():
-        line = line.strip()
-        if line.startswith("===") and line.endswith("==="):
-            section_title = line.strip("=").strip()
-            current_section = section_title
-            sections[current_section] = []
-        elif line:
-            sections[current_section].append(line)
+    title_key = article_cache_service.normalize_title(title)
+    cached = await article_cache_service.get(title_key)
+    if cached is not None:
+        return cached
 
-    for key in list(sections.keys()):
-        sections[key] = "\n".join(sections[key])
+    if not settings.wikipedia_live_fallback:
+        raise LookupError(f"Wikipedia page not in the local store: {title}")
+    return await _fetches.do(title_key, lambda: _fetch_and_store(title, title_key))
 
-    return {
-        "title": page.title,
-        "url": page.url,
-        "sections": sections,
-    }
+
+async def fetch_article_sections(url: str) -> Dict[str, Any]:
+    title = extract_title_from_url(url)
+    return await fetch_article_sections_by_title(title)
 
 
-def fetch_article_sections_by_title(title: str) -> Dict[str, Any]:
+async def fetch_article_sections_by_title(title: str) -> Dict[str, Any]:
     """Fetch article sections given a Wikipedia page title.
 
     This bypasses URL parsing and is useful when we already
     know the canonical title from the database.
     """
-    page = wikipedia.page(title)
-    content = page.content
-
-    sections: Dict[str, Any] = {}
-    current_section = "Introduction"
-    sections[current_section] = []
-
-    for line in content.splitlines():
-        line = line.strip()
-        if line.startswith("===") and line.endswith("==="):
-            section_title = line.strip("=").strip()
-            current_section = section_title
-            sections[current_section] = []
-        elif line:
-            sections[current_section].append(line)
-
-    for key in list(sections.keys()):
-        sections[key] = "\n".join(sections[key])
+    page = await get_page(title)
 
     return {
         "title": page.title,
         "url": page.url,
-        "sections": sections,
+        "sections": section_service.parse_sections(page.content).to_dict(),
+        # Section text is already cleaned for LLM use
+        "cleaned": True,
     }
 
 
@@ -95,8 +134,8 @@ def clean_wikipedia_text(text: str) -> str:
     - Collapse excessive whitespace
     """
 
-    # Remove numeric reference markers [1], [23], etc.
-    cleaned = re.sub(r"\[\d+\]", "", text)
-    # Normalize whitespace
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned.strip()
+    return section_service.clean_text(text)
+
+
+def get_fetch_stats() -> Dict[str, Any]:
+    return _fetches.stats()
@@ -0,0 +1,64 @@
+"""Article lookup latency from the local dump store.
+
+Imports ``--pages`` synthetic articles (a few KB to ~100KB of text each)
+into a temporary store, then reads random titles with
+``ArticleStore.get`` (index lookup, ``pread``, decompress) and reports
+p50/p99 microseconds per read. Redirect lookups are measured separately.
+
+Usage (from backend/):
+    python -m benchmarks.bench_article_store --pages 20000 --reads 5000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.article_cache_service import normalize_title
+from app.services.article_store_service import ArticleStore, ArticleStoreWriter
+from benchmarks.bench_section_parser import synthetic_article
+
+
+def _measure(store: ArticleStore, titles, reads: int) -> list:
+    rng = random.Random(1)
+    samples = []
+    for _ in range(reads):
+        key = normalize_title(rng.choice(titles))
+        start = time.perf_counter()
+        store.get(key)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(name: str, samples: list) -> None:
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:>10}: p50 {statistics.median(samples):8.1f} us   p99 {p99:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20000)
+    parser.add_argument("--reads", type=int, default=5000)
+    args = parser.parse_args()
+
+    # A pool of article bodies keeps the import fast; sizes vary per page
+    bodies = [synthetic_article(size, seed=size) for size in (2_000, 10_000, 40_000, 100_000)]
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        with ArticleStoreWriter(path) as writer:
+            for number in range(args.pages):
+                title = f"Article {number}"
+                writer.add(title, f"https://en.wikipedia.org/wiki/Article_{number}", number, bodies[number % 4])
+                writer.add_redirect(f"Alias {number}", title, f"https://en.wikipedia.org/wiki/Alias_{number}")
+        print(f"imported {args.pages} pages in {time.perf_counter() - start:.1f} s")
+
+        store = ArticleStore(path)
+        _report("direct", _measure(store, [f"Article {n}" for n in range(args.pages)], args.reads))
+        _report("redirect", _measure(store, [f"Alias {n}" for n in range(args.pages)], args.reads))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Auth overhead per request: user lookup vs principal cache vs trusted claims.
+
+Runs the ``get_current_user`` dependency (JWT decode + principal resolution)
+for ``--requests`` calls spread over ``--users`` users, each with a fresh
+session as in a real request, and reports time and SQL statements per call:
+
+- ``lookup``: principal cache disabled, one users query per request (the
+  previous behaviour)
+- ``cached``: verified-principal cache (LRU + TTL)
+- ``trusted``: ``AUTH_TRUST_TOKEN_CLAIMS``, role taken from the signed token
+
+SQLite keeps the round-trip cheap; point ``--database-url`` at Postgres to
+include network latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth --requests 5000 --users 500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("GROQ_API_KEY", "")
+os.environ.setdefault("GEMINI_API_KEY", "")
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.routes_auth import get_current_user
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.base import Base
+from app.models.user import Role, User
+from app.services import user_service
+
+
+def _setup(database_url, n_users):
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {
+                    "id": i,
+                    "username": f"bench{i}",
+                    "email": f"bench{i}@example.com",
+                    "hashed_password": "x",
+                    "role": Role.USER,
+                }
+                for i in range(1, n_users + 1)
+            ],
+        )
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+async def _run(mode, session_factory, tokens):
+    if mode == "lookup":
+        principals = TTLCache(maxsize=1, ttl=0)
+    else:
+        principals = TTLCache(settings.auth_principal_cache_max_entries, settings.auth_principal_cache_ttl_seconds)
+
+    with patch.object(user_service, "_principals", principals), patch.object(
+        settings, "auth_trust_token_claims", mode == "trusted"
+    ):
+        started = time.perf_counter()
+        for token in tokens:
+            db = session_factory()
+            try:
+                await get_current_user(token, db)
+            finally:
+                db.close()
+        elapsed = time.perf_counter() - started
+
+    return elapsed, principals.stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench_auth.sqlite3')}"
+        engine, session_factory = _setup(database_url, args.users)
+
+        statements = {"count": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(*_):
+            statements["count"] += 1
+
+        rng = random.Random(42)
+        tokens = [
+            create_access_token({"sub": str(rng.randint(1, args.users)), "role": "USER"}, 60)
+            for _ in range(args.requests)
+        ]
+
+        print(f"{'mode':<10}{'us/request':>12}{'SQL/request':>14}{'cache hit rate':>16}")
+        for mode in ("lookup", "cached", "trusted"):
+            statements["count"] = 0
+            elapsed, stats = asyncio.run(_run(mode, session_factory, tokens))
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = f"{stats['hits'] / lookups:.1%}" if lookups else "n/a"
+            print(
+                f"{mode:<10}{elapsed / args.requests * 1e6:>12.1f}"
+                f"{statements['count'] / args.requests:>14.3f}{hit_rate:>16}"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Load benchmark: latency of concurrent summary requests with slow upstreams.
+
+Upstream calls (Wikipedia fetch, Groq summary) are replaced by fakes that take
+``--latency`` seconds. In ``blocking`` mode the fakes sleep synchronously, the
+way the old sync clients behaved on the event loop; in ``async`` mode they
+await, like the current httpx / AsyncGroq path. Health probes are fired
+alongside the load to show whether the worker stays responsive.
+
+Usage (from backend/):
+    python -m benchmarks.bench_concurrent_requests --requests 50 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("GROQ_API_KEY", "")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("ARTICLE_CACHE_PATH", "")
+
+import httpx
+
+from app.main import app
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+ARTICLE = {
+    "title": "Benchmark",
+    "url": "https://en.wikipedia.org/wiki/Benchmark",
+    "sections": {"Introduction": "Benchmark article body. " * 200},
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _fakes(mode, latency):
+    async def fetch(url):
+        if mode == "blocking":
+            time.sleep(latency)
+        else:
+            await asyncio.sleep(latency)
+        return ARTICLE
+
+    async def summarize(content, length="medium"):
+        if mode == "blocking":
+            time.sleep(latency)
+        else:
+            await asyncio.sleep(latency)
+        return {"summary": "ok", "model": "fake"}
+
+    return fetch, summarize
+
+
+async def _timed(client, started, method, url, **kwargs):
+    # Measured from the start of the burst, so time spent queued behind a
+    # blocked event loop counts towards latency.
+    response = await getattr(client, method)(url, **kwargs)
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _run(mode, n_requests, latency):
+    fetch, summarize = _fakes(mode, latency)
+    transport = httpx.ASGITransport(app=app)
+    with patch("app.services.wikipedia_service.fetch_article_sections", fetch), patch(
+        "app.services.llm_groq_service.summarize_article", summarize
+    ):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            summaries = [
+                _timed(
+                    client,
+                    started,
+                    "post",
+                    "/api/v1/articles/summary/url",
+                    json={"url": f"https://en.wikipedia.org/wiki/Benchmark_{i}", "length": "short"},
+                )
+                for i in range(n_requests)
+            ]
+            probes = [_timed(client, started, "get", "/api/v1/health") for _ in range(n_requests // 5 or 1)]
+            results = await asyncio.gather(*summaries, *probes)
+            wall = time.perf_counter() - started
+
+    summary_latencies = results[:n_requests]
+    probe_latencies = results[n_requests:]
+    return {
+        "mode": mode,
+        "wall_s": wall,
+        "summary_p50_ms": statistics.median(summary_latencies) * 1000,
+        "summary_p99_ms": _percentile(summary_latencies, 99) * 1000,
+        "health_p99_ms": _percentile(probe_latencies, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated upstream latency per call (s)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'wall (s)':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}{'health p99 (ms)':>18}")
+    for mode in ("blocking", "async"):
+        row = asyncio.run(_run(mode, args.requests, args.latency))
+        print(
+            f"{row['mode']:<10}{row['wall_s']:>10.2f}{row['summary_p50_ms']:>12.1f}"
+            f"{row['summary_p99_ms']:>12.1f}{row['health_p99_ms']:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Open-answer grading throughput for a class's submissions.
+
+Grades ``--students`` attempts of ``--questions`` open answers each with
+``grading_service.similarities`` in one batch, and compares it with scoring
+every answer one call at a time (the per-request path an LLM grader would
+take, minus the network). Reports milliseconds per batch and per answer.
+
+Usage (from backend/):
+    python -m benchmarks.bench_grading --students 30 --questions 3
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from app.services import grading_service
+
+
+WORDS = (
+    "python language guido rossum released interpreted dynamic typing garbage collection "
+    "web development data science automation scripting library module syntax readability"
+).split()
+
+
+def submissions(students: int, questions: int, seed: int = 0) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    references = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) for _ in range(questions)]
+    pairs = []
+    for _ in range(students):
+        for reference in references:
+            words = reference.split()
+            # Drop, misspell and add words to imitate students' answers
+            answer = [word[:-1] if rng.random() < 0.1 else word for word in words if rng.random() > 0.3]
+            answer += [rng.choice(WORDS) for _ in range(rng.randint(0, 5))]
+            pairs.append((reference, " ".join(answer)))
+    return pairs
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pairs = submissions(args.students, args.questions)
+    batched = _time(lambda: grading_service.similarities(pairs), args.repeat)
+    one_by_one = _time(lambda: [grading_service.similarities([pair]) for pair in pairs], args.repeat)
+
+    print(f"{len(pairs)} answers ({args.students} students x {args.questions} questions)")
+    for name, ms in (("batched", batched), ("one-by-one", one_by_one)):
+        print(f"{name:>12}: {ms:8.2f} ms/batch  {ms / len(pairs) * 1000:8.1f} us/answer")
+
+
+if __name__ == "__main__":
+    main()
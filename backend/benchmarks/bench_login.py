@@ -0,0 +1,142 @@
+"""Login storm benchmark: logins/sec and event-loop responsiveness.
+
+Fires ``--logins`` concurrent logins at ``/auth/login`` (SQLite database,
+one user) together with health probes, at ``--rounds`` pbkdf2 rounds:
+
+- ``inline``: password check runs on the event loop (the previous behaviour)
+- ``pool-N``: password check runs on the hashing pool with N threads
+
+Reports logins/sec, logins/sec per hashing worker and health-probe p99, which
+shows whether other requests stall during the storm.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --logins 200 --rounds 100000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("GROQ_API_KEY", "")
+os.environ.setdefault("GEMINI_API_KEY", "")
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.api.v1.routes_auth import get_db
+from app.core import security
+from app.models.base import Base
+from app.models.user import Role, User
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _setup(database_url, rounds):
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add(
+        User(
+            username="bench",
+            email="bench@example.com",
+            hashed_password=security.password_context.hash("bench-password"),
+            role=Role.USER,
+        )
+    )
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return engine, override_get_db
+
+
+async def _inline_hasher(func, *args):
+    return func(*args)
+
+
+async def _timed(client, started, method, url, **kwargs):
+    response = await getattr(client, method)(url, **kwargs)
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _storm(n_logins):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        logins = [
+            _timed(
+                client,
+                started,
+                "post",
+                "/api/v1/auth/login",
+                data={"username": "bench", "password": "bench-password"},
+            )
+            for _ in range(n_logins)
+        ]
+        probes = [_timed(client, started, "get", "/api/v1/health") for _ in range(n_logins // 5 or 1)]
+        results = await asyncio.gather(*logins, *probes)
+        wall = time.perf_counter() - started
+    return wall, results[n_logins:]
+
+
+def _run(mode, workers, n_logins):
+    if mode == "inline":
+        ctx = patch.object(security, "_run_hasher", _inline_hasher)
+        executor = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        ctx = patch.object(security, "_hash_executor", executor)
+    with ctx:
+        wall, probes = asyncio.run(_storm(n_logins))
+    if executor is not None:
+        executor.shutdown()
+    return n_logins / wall, _percentile(probes, 99) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=100000, help="pbkdf2 rounds of the stored hash")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    security.password_context.update(
+        pbkdf2_sha256__default_rounds=args.rounds,
+        pbkdf2_sha256__min_rounds=args.rounds,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, override_get_db = _setup(f"sqlite:///{os.path.join(tmp, 'bench_login.sqlite3')}", args.rounds)
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            print(f"{'mode':<10}{'logins/s':>10}{'per worker':>12}{'health p99 (ms)':>18}")
+            runs = [("inline", 1)] + [(f"pool-{workers}", workers) for workers in args.workers]
+            for mode, workers in runs:
+                rate, health_p99 = _run("inline" if mode == "inline" else "pool", workers, args.logins)
+                print(f"{mode:<10}{rate:>10.1f}{rate / workers:>12.1f}{health_p99:>18.1f}")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
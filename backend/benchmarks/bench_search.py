@@ -0,0 +1,90 @@
+"""Full-text search latency over a synthetic corpus.
+
+Indexes ``--docs`` documents of ``--words`` words drawn from a Zipf-like
+vocabulary (so common terms have huge posting lists, as in real text)
+into a temporary FTS5 index, then times ``SearchIndex.search`` for one-,
+two- and three-word queries plus prefix queries and reports p50/p99
+milliseconds per query (ranked top 10 with snippets).
+
+Usage (from backend/):
+    python -m benchmarks.bench_search --docs 100000 --queries 500
+    python -m benchmarks.bench_search --docs 1000000   # ~10 minutes to build
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.search_service import SearchIndex
+
+
+_VOCABULARY = 50_000
+
+
+def _words(count: int) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ("".join(letters[int(c)] for c in f"{n:05d}") + "ion" for n in range(count))
+    return list(words)
+
+
+def _documents(count: int, length: int, words: list):
+    rng = random.Random(1)
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    for number in range(count):
+        title = " ".join(rng.choices(words, cum_weights=weights, k=3))
+        body = " ".join(rng.choices(words, cum_weights=weights, k=length))
+        yield (f"https://en.wikipedia.org/wiki/Doc_{number}", title, body, number)
+
+
+def _report(name: str, samples: list) -> None:
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:>8}: p50 {statistics.median(samples):7.2f} ms   p99 {p99:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    words = _words(_VOCABULARY)
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(os.path.join(directory, "search.sqlite3"))
+        start = time.perf_counter()
+        batch = []
+        for document in _documents(args.docs, args.words, words):
+            batch.append(document)
+            if len(batch) == 1000:
+                index.add_many(batch)
+                batch.clear()
+        index.add_many(batch)
+        index.optimize()
+        print(f"indexed {args.docs} documents in {time.perf_counter() - start:.1f} s")
+
+        rng = random.Random(2)
+        # Mid-frequency terms: rare enough to discriminate, common enough to match
+        pool = words[50:5000]
+        for name, make in (
+            ("1 word", lambda: rng.choice(pool)),
+            ("2 words", lambda: " ".join(rng.sample(pool[:500], 2))),
+            ("3 words", lambda: " ".join(rng.sample(pool[:200], 3))),
+            ("prefix", lambda: rng.choice(pool)[:4]),
+        ):
+            samples = []
+            for _ in range(args.queries):
+                query = make()
+                started = time.perf_counter()
+                index.search(query, 10)
+                samples.append((time.perf_counter() - started) * 1e3)
+            _report(name, samples)
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
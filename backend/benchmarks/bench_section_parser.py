@@ -0,0 +1,100 @@
+"""Section parsing + cleaning cost for a large article.
+
+Compares the previous path (line-by-line ``=== ... ===`` split, re-join of
+all sections, then two whole-text ``re.sub`` passes) with
+``section_service.parse_sections`` (one heading scan, per-section cleaning)
+plus the final join, and reports milliseconds per article.
+
+By default a synthetic article roughly the size of "World War II" (~400KB,
+mixed heading levels, ``[n]`` reference markers) is used; ``--file`` loads a
+real plain-text extract instead.
+
+Usage (from backend/):
+    python -m benchmarks.bench_section_parser --repeat 50
+    python -m benchmarks.bench_section_parser --file world_war_ii.txt
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from app.services import section_service
+
+
+def _legacy_split_sections(content: str) -> Dict[str, str]:
+    sections: Dict[str, List[str]] = {"Introduction": []}
+    current_section = "Introduction"
+    for line in content.splitlines():
+        line = line.strip()
+        if line.startswith("===") and line.endswith("==="):
+            current_section = line.strip("=").strip()
+            sections[current_section] = []
+        elif line:
+            sections[current_section].append(line)
+    return {key: "\n".join(lines) for key, lines in sections.items()}
+
+
+def legacy(content: str) -> str:
+    sections = _legacy_split_sections(content)
+    full_text = "\n\n".join(text for text in sections.values() if text)
+    cleaned = re.sub(r"\[\d+\]", "", full_text)
+    return re.sub(r"\s+", " ", cleaned).strip()
+
+
+def single_scan(content: str) -> str:
+    sections = section_service.parse_sections(content).to_dict()
+    return " ".join(text for text in sections.values() if text)
+
+
+def synthetic_article(target_chars: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = "the war army front allied axis forces campaign battle offensive navy invasion".split()
+    parts: List[str] = []
+    size = 0
+    ref = 1
+    while size < target_chars:
+        level = rng.choice([2, 3, 3, 4])
+        marks = "=" * level
+        parts.append(f"\n{marks} Section {len(parts)} {marks}\n")
+        for _ in range(rng.randint(2, 6)):
+            sentence = " ".join(rng.choice(words) for _ in range(rng.randint(12, 30)))
+            if rng.random() < 0.4:
+                sentence += f"[{ref}]"
+                ref += 1
+            parts.append(sentence.capitalize() + ".  " + ("\n" if rng.random() < 0.3 else ""))
+        parts.append("\n")
+        size = sum(len(part) for part in parts)
+    return "".join(parts)
+
+
+def _time(fn, content: str, repeat: int) -> float:
+    fn(content)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="plain-text article extract to parse")
+    parser.add_argument("--chars", type=int, default=400_000, help="size of the synthetic article")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            content = f.read()
+    else:
+        content = synthetic_article(args.chars)
+
+    headings = len(section_service.parse_sections(content, clean=False).sections) - 1
+    print(f"article: {len(content) / 1024:.0f} KB, {headings} headings")
+    for name, fn in (("legacy", legacy), ("single-scan", single_scan)):
+        print(f"{name:>12}: {_time(fn, content, args.repeat):8.2f} ms/article")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Baseline: users, articles and quiz attempts
+
+The schema ``create_all`` built before the job queue, stored quizzes and
+statistics counters. A database created by a release without migrations is
+marked with the revision matching its newest table (``alembic stamp 0001``;
+``0002`` with ``jobs``, ``0003`` with ``quizzes``, ``0004`` with
+``statcounters``) and then upgraded with ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("role", sa.Enum("USER", "ADMIN", name="role"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=500), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("createdat", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_articles_id", "articles", ["id"])
+
+    op.create_table(
+        "quizattempts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("userid", sa.Integer(), nullable=False),
+        sa.Column("articleid", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("submittedat", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["userid"], ["users.id"]),
+        sa.ForeignKeyConstraint(["articleid"], ["articles.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_quizattempts_id", "quizattempts", ["id"])
+
+
+def downgrade() -> None:
+    for table in ("quizattempts", "articles", "users"):
+        op.drop_table(table)
+    sa.Enum(name="role").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""Background job queue
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("userid", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column(
+            "status", sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="jobstatus"), nullable=False
+        ),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("createdat", sa.DateTime(), nullable=True),
+        sa.Column("startedat", sa.DateTime(), nullable=True),
+        sa.Column("finishedat", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["userid"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_userid", "jobs", ["userid"])
+    op.create_index("ix_jobs_status_priority_id", "jobs", ["status", "priority", "id"])
+
+
+def downgrade() -> None:
+    op.drop_table("jobs")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,54 @@
+"""Stored quizzes; attempts scored against them
+
+Existing attempts keep their score, get no quiz and count as graded. ``batch_alter_table``
+recreates ``quizattempts`` on SQLite, which cannot add a foreign key to an
+existing table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quizzes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("articleid", sa.Integer(), nullable=False),
+        sa.Column("questions", sa.JSON(), nullable=False),
+        sa.Column("answerkey", sa.LargeBinary(), nullable=False),
+        sa.Column("opencount", sa.Integer(), nullable=False),
+        sa.Column("digest", sa.String(length=64), nullable=False),
+        sa.Column("createdat", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["articleid"], ["articles.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_quizzes_id", "quizzes", ["id"])
+    op.create_index("ix_quizzes_articleid_id", "quizzes", ["articleid", "id"])
+
+    with op.batch_alter_table("quizattempts") as batch:
+        batch.add_column(sa.Column("quizid", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("mcqcorrect", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("openanswers", sa.JSON(), nullable=True))
+        batch.add_column(sa.Column("openscore", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("gradedat", sa.DateTime(), nullable=True))
+        batch.create_foreign_key("fk_quizattempts_quizid", "quizzes", ["quizid"], ["id"])
+    # Existing attempts are final: nothing of theirs awaits grading
+    op.execute("UPDATE quizattempts SET gradedat = COALESCE(submittedat, CURRENT_TIMESTAMP)")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("quizattempts") as batch:
+        batch.drop_constraint("fk_quizattempts_quizid", type_="foreignkey")
+        for column in ("gradedat", "openscore", "openanswers", "mcqcorrect", "quizid"):
+            batch.drop_column(column)
+    op.drop_table("quizzes")
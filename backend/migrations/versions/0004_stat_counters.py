@@ -0,0 +1,40 @@
+"""Statistics counters, built from the existing rows
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.db import counters
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "statcounters",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("name", "key"),
+    )
+    if op.get_context().as_sql:
+        # No rows to read; POST /admin/stats/rebuild builds them afterwards
+        return
+
+    db = Session(bind=op.get_bind(), join_transaction_mode="create_savepoint")
+    counters.rebuild(db)
+    db.close()
+
+
+def downgrade() -> None:
+    op.drop_table("statcounters")
@@ -0,0 +1,64 @@
+"""One article row per identity; article and quiz attempt indexes
+
+Adds ``articles.articlekey``, fills it and merges duplicate articles (see
+``app.db.article_identity``), then builds the indexes. On PostgreSQL they are
+built ``CONCURRENTLY`` outside the migration transaction, so the tables
+stay writable while they build; if a build fails, drop the INVALID index
+and run the upgrade again.
+
+The column stays nullable: the previous release does not write it and must
+keep inserting articles while both run during a rolling deploy. Its rows
+get no key, so once it is retired, a later migration runs the backfill and
+merge again and makes the column NOT NULL.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.db import article_identity, counters
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, unique)
+_INDEXES = [
+    ("ix_articles_articlekey", "articles", ["articlekey"], True),
+    ("ix_articles_title", "articles", ["title"], False),
+    ("ix_articles_createdat", "articles", ["createdat"], False),
+    ("ix_quizattempts_userid_submittedat", "quizattempts", ["userid", "submittedat"], False),
+    ("ix_quizattempts_articleid", "quizattempts", ["articleid"], False),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().as_sql:
+        raise RuntimeError("Revision 0005 migrates data in Python and cannot be rendered with --sql")
+
+    bind = op.get_bind()
+    op.add_column("articles", sa.Column("articlekey", sa.String(length=300), nullable=True))
+    article_identity.backfill_keys(bind)
+    article_identity.merge_duplicates(bind)
+
+    # Merged rows change the article and per-article attempt counters
+    db = Session(bind=bind, join_transaction_mode="create_savepoint")
+    counters.rebuild(db)
+    db.close()
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in _INDEXES:
+            op.create_index(name, table, columns, unique=unique, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    op.drop_column("articles", "articlekey")
@@ -0,0 +1,30 @@
+"""Record who uploaded a PDF article
+
+Uploads from before this revision have no uploader and are readable by
+admins only.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("articles") as batch:
+        batch.add_column(sa.Column("uploadedby", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_articles_uploadedby", "users", ["uploadedby"], ["id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("articles") as batch:
+        batch.drop_constraint("fk_articles_uploadedby", type_="foreignkey")
+        batch.drop_column("uploadedby")
@@ -1,11 +1,45 @@
 """
 Shared test fixtures and configuration for pytest
 """
+import os
+
+# Settings are read at import time; keep the test run self-contained.
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("GROQ_API_KEY", "")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("ARTICLE_CACHE_PATH", "")
+os.environ.setdefault("ARTICLE_STORE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 
 from app.main import app
+from app.core import rate_limit
+from app.services import llm_router_service, user_service
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    """Tests recreate users with the same ids; never reuse cached identities."""
+    user_service._principals.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiters():
+    """Each test starts with full LLM rate-limit buckets."""
+    rate_limit.reset_limiters()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_router():
+    """Provider latency and failures do not leak between tests."""
+    llm_router_service.reset()
+    yield
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article, article_key
+from app.models.base import Base
+from app.models.stat_counter import StatCounter
+from app.services import article_service
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'articles.sqlite3'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _plan(db, statement, **params):
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {statement}"), params).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://en.wikipedia.org/wiki/Machine_learning",
+        "https://en.m.wikipedia.org/wiki/Machine_learning",
+        "https://en.wikipedia.org/wiki/machine%20learning?oldid=1#History",
+        "https://en.wikipedia.org/wiki/Machine__learning",
+    ],
+)
+def test_wikipedia_urls_share_one_key(url):
+    assert article_key(url) == "en.wikipedia.org:Machine learning"
+
+
+def test_upsert_reuses_the_row_for_the_same_article(db):
+    first = article_service.upsert_article(db, "https://en.wikipedia.org/wiki/Python", "Python", "INGEST")
+    again = article_service.upsert_article(db, "https://en.m.wikipedia.org/wiki/Python", "Python", "QUIZ")
+    other = article_service.upsert_article(db, "https://fr.wikipedia.org/wiki/Python", "Python", "QUIZ")
+    db.commit()
+
+    assert first == again != other
+    article = db.get(Article, first)
+    assert (article.action, article.articlekey) == ("INGEST", "en.wikipedia.org:Python")
+    counter = db.execute(select(StatCounter.count).where(StatCounter.name == "articles")).scalar_one()
+    assert counter == 2
+
+
+def test_lookups_use_indexes(db):
+    assert "INDEX ix_articles_articlekey" in _plan(
+        db, "SELECT id FROM articles WHERE articlekey = :key", key="en.wikipedia.org:Python"
+    )
+    assert "INDEX ix_articles_title" in _plan(db, "SELECT id FROM articles WHERE title = :title", title="Python")
+    assert "INDEX ix_articles_createdat" in _plan(
+        db, "SELECT id FROM articles WHERE createdat >= :since", since=datetime(2024, 1, 1)
+    )
+
+    history = _plan(
+        db, "SELECT * FROM quizattempts WHERE userid = :user ORDER BY submittedat DESC LIMIT 20", user=1
+    )
+    assert "INDEX ix_quizattempts_userid_submittedat" in history
+    assert "TEMP B-TREE" not in history  # the index already returns them in order
+    assert "INDEX ix_quizattempts_articleid" in _plan(
+        db, "SELECT COUNT(*) FROM quizattempts WHERE articleid = :article", article=1
+    )
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
@@ -24,7 +26,7 @@ def mock_auth_user():
     
     app.dependency_overrides[get_current_active_user] = override_get_current_user
     yield mock_user
-    app.dependency_overrides.clear()
+    app.dependency_overrides.pop(get_current_active_user, None)
 
 
 @pytest.fixture
@@ -112,3 +114,72 @@ class TestTranslationEndpoint:
                 json={"url": "https://en.wikipedia.org/wiki/Test", "target_language": "FR"},
             )
             assert response.status_code in [401, 500]  # Authentication error
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamingEndpoints:
+    @patch("app.services.wikipedia_service.fetch_article_sections")
+    def test_stream_summary_emits_deltas_then_metadata(self, mock_fetch, mock_wikipedia_data):
+        mock_fetch.return_value = mock_wikipedia_data
+
+        async def fake_stream(content, length="medium"):
+            for token in ["Python ", "is ", "popular."]:
+                yield token
+
+        with patch("app.services.llm_groq_service.stream_summary", new=fake_stream):
+            response = client.post(
+                "/api/v1/articles/summary/url/stream",
+                json={"url": "https://en.wikipedia.org/wiki/Python_(programming_language)", "length": "short"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        assert [data["text"] for event, data in events if event == "delta"] == ["Python ", "is ", "popular."]
+        event, done = events[-1]
+        assert event == "done"
+        assert done["summary"] == "Python is popular."
+        assert done["title"] == "Python (programming language)"
+        assert done["length"] == "short"
+        assert done["cached"] is False
+
+    @patch("app.services.wikipedia_service.fetch_article_sections")
+    def test_stream_translation_emits_deltas_then_metadata(self, mock_fetch, mock_auth_user, mock_wikipedia_data):
+        mock_fetch.return_value = mock_wikipedia_data
+
+        async def fake_stream(content, target_language):
+            yield "Python est "
+            yield "populaire."
+
+        with patch("app.services.llm_gemini_service.stream_translation", new=fake_stream):
+            response = client.post(
+                "/api/v1/articles/translate/url/stream",
+                json={"url": "https://en.wikipedia.org/wiki/Python_(programming_language)", "target_language": "FR"},
+            )
+
+        events = _parse_sse(response.text)
+        event, done = events[-1]
+        assert event == "done"
+        assert done["translated_text"] == "Python est populaire."
+        assert done["target_language"] == "FR"
+
+    @patch("app.services.wikipedia_service.fetch_article_sections")
+    def test_stream_reports_upstream_failure_in_band(self, mock_fetch):
+        mock_fetch.side_effect = LookupError("Wikipedia page not found: Nope")
+
+        response = client.post(
+            "/api/v1/articles/summary/url/stream",
+            json={"url": "https://en.wikipedia.org/wiki/Nope", "length": "short"},
+        )
+
+        assert response.status_code == 200
+        assert _parse_sse(response.text) == [
+            ("error", {"detail": "Internal server error", "error": "Wikipedia page not found: Nope"})
+        ]
@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from unittest.mock import patch
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -8,7 +9,10 @@ from app.main import app
 from app.models.base import Base
 from app.api.v1.routes_auth import get_db
 from app.models.user import User, Role
-from app.core.security import get_password_hash
+from app.core import security
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.services import user_service
 
 
 # Create in-memory SQLite database for testing
@@ -29,15 +33,16 @@ def override_get_db():
         db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
 client = TestClient(app)
 
 
 @pytest.fixture(autouse=True)
 def setup_database():
+    app.dependency_overrides[get_db] = override_get_db
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.fixture
@@ -113,3 +118,86 @@ def test_login_wrong_password(test_user):
         data={"username": "testuser", "password": "wrongpass"},
     )
     assert response.status_code == 401
+
+
+def _admin_metrics(user_id, role="USER"):
+    token = create_access_token({"sub": str(user_id), "role": role}, 5)
+    return client.get("/api/v1/admin/metrics", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_principal_is_cached_between_requests(test_user):
+    db = TestingSessionLocal()
+    try:
+        assert user_service.get_principal(db, test_user.id).role == Role.USER
+        with patch.object(db, "get", side_effect=AssertionError("should be served from cache")):
+            assert user_service.get_principal(db, test_user.id).id == test_user.id
+    finally:
+        db.close()
+
+
+def test_role_change_invalidates_cached_principal(test_user):
+    assert _admin_metrics(test_user.id).status_code == 403
+
+    db = TestingSessionLocal()
+    user = db.get(User, test_user.id)
+    user.role = Role.ADMIN
+    db.commit()
+    db.close()
+
+    assert _admin_metrics(test_user.id).status_code == 200
+
+
+def test_deleted_user_is_rejected(test_user):
+    assert _admin_metrics(test_user.id).status_code == 403
+
+    db = TestingSessionLocal()
+    db.delete(db.get(User, test_user.id))
+    db.commit()
+    db.close()
+
+    assert _admin_metrics(test_user.id).status_code == 401
+
+
+def test_trusted_token_claims_skip_user_lookup(monkeypatch):
+    # No such user in the database: only the signed claims are used.
+    assert _admin_metrics(999, role="ADMIN").status_code == 401
+
+    monkeypatch.setattr(settings, "auth_trust_token_claims", True)
+    assert _admin_metrics(999, role="ADMIN").status_code == 200
+    assert _admin_metrics(999, role="USER").status_code == 403
+
+
+def test_login_upgrades_outdated_password_hash(test_user, monkeypatch):
+    assert test_user.hashed_password.startswith("$pbkdf2-sha256$29000$")
+    monkeypatch.setattr(
+        security,
+        "password_context",
+        security.password_context.copy(pbkdf2_sha256__default_rounds=40000, pbkdf2_sha256__min_rounds=40000),
+    )
+
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "testpass123"},
+    )
+    assert response.status_code == 200
+
+    db = TestingSessionLocal()
+    upgraded = db.get(User, test_user.id).hashed_password
+    db.close()
+    assert upgraded.startswith("$pbkdf2-sha256$40000$")
+    assert security.verify_password("testpass123", upgraded)
+
+
+def test_configure_password_hashing_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(security, "password_context", security.password_context.copy())
+    monkeypatch.setattr(settings, "password_hash_rounds", 35000)
+
+    assert security.configure_password_hashing() == 35000
+    assert security.password_context.hash("secret-password").startswith("$pbkdf2-sha256$35000$")
+
+
+def test_calibrated_rounds_respect_minimum(monkeypatch):
+    monkeypatch.setattr(settings, "password_hash_min_rounds", 29000)
+
+    assert security.calibrate_rounds(target_ms=0.001) == 29000
+    assert security.calibrate_rounds(target_ms=200) % 10000 == 0
@@ -0,0 +1,180 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.api.v1.routes_auth import get_current_active_user, get_db
+from app.core.config import settings
+from app.models.article import Article
+from app.models.base import Base
+from app.models.user import User, Role
+from app.services import batch_service, job_service, quiz_service
+
+
+client = TestClient(app)
+
+URLS = [f"https://en.wikipedia.org/wiki/Topic_{i}" for i in range(3)]
+
+
+@pytest.fixture
+def mock_auth_user():
+    mock_user = MagicMock(spec=User)
+    mock_user.id = 1
+    mock_user.role = Role.USER
+
+    async def override_get_current_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_active_user] = override_get_current_user
+    yield mock_user
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture
+def wikipedia(monkeypatch):
+    """Fake Wikipedia: "Topic 1" does not exist, other titles do."""
+
+    async def get_page(title):
+        if title.endswith("1"):
+            raise LookupError(f"Wikipedia page not found: {title}")
+
+    async def fetch_by_title(title):
+        return {"title": title, "url": "", "sections": {"Introduction": f"About {title}."}}
+
+    monkeypatch.setattr("app.services.wikipedia_service.get_page", get_page)
+    monkeypatch.setattr("app.services.wikipedia_service.fetch_article_sections_by_title", fetch_by_title)
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestBatchEndpoints:
+    def test_summary_batch_reports_each_item(self, mock_auth_user, wikipedia):
+        with patch(
+            "app.services.llm_groq_service.summarize_article",
+            new=AsyncMock(side_effect=lambda text, length: {"summary": f"Summary of: {text}"}),
+        ):
+            response = client.post("/api/v1/articles/summary/batch", json={"urls": URLS, "length": "short"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        items = {data["index"]: data for event, data in events if event == "item"}
+        assert items[0]["status"] == "succeeded"
+        assert items[0]["result"]["summary"] == "Summary of: About Topic 0."
+        assert items[0]["result"]["length"] == "short"
+        assert items[1]["status"] == "failed"
+        assert items[1]["error"] == "Wikipedia page not found: Topic 1"
+        assert items[1]["url"] == URLS[1]
+        assert items[2]["status"] == "succeeded"
+        assert events[-1] == ("done", {"total": 3, "succeeded": 2, "failed": 1})
+
+    def test_translation_batch_by_article_id(self, mock_auth_user, wikipedia, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'batch.sqlite3'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        monkeypatch.setattr(job_service, "SessionLocal", factory)
+        monkeypatch.setattr(settings, "processed_content_dir", str(tmp_path / "processed"))
+        monkeypatch.setitem(app.dependency_overrides, get_db, lambda: factory())
+        db = factory()
+        db.add(Article(id=7, url=URLS[0], title="Topic 0", action="SEED"))
+        db.commit()
+        db.close()
+
+        with patch(
+            "app.services.llm_gemini_service.translate_content",
+            new=AsyncMock(return_value="Au sujet de Topic 0."),
+        ):
+            response = client.post(
+                "/api/v1/articles/translate/batch",
+                json={"article_ids": [7, 8], "target_language": "FR"},
+            )
+        engine.dispose()
+
+        items = {data["article_id"]: data for event, data in _parse_sse(response.text) if event == "item"}
+        assert items[7]["status"] == "succeeded"
+        assert items[7]["result"]["translated_text"] == "Au sujet de Topic 0."
+        assert items[8] == {
+            "index": 1,
+            "url": None,
+            "article_id": 8,
+            "status": "failed",
+            "result": None,
+            "error": "Article 8 not found",
+        }
+
+    def test_quiz_batch(self, mock_auth_user, wikipedia, sample_quiz, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'batch.sqlite3'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        monkeypatch.setattr(quiz_service, "SessionLocal", sessionmaker(bind=engine))
+
+        with patch("app.services.llm_gemini_service.generate_quiz", new=AsyncMock(return_value=sample_quiz)):
+            response = client.post("/api/v1/quiz/generate/batch", json={"urls": [URLS[0]]})
+
+        engine.dispose()
+
+        events = _parse_sse(response.text)
+        assert events[0][1]["result"]["multiple_choice"][0]["question"] == "What does AI stand for?"
+        assert events[0][1]["result"]["quiz_id"] is not None
+        assert events[-1] == ("done", {"total": 1, "succeeded": 1, "failed": 0})
+
+    def test_rejects_empty_and_oversized_batches(self, mock_auth_user, monkeypatch):
+        monkeypatch.setattr(settings, "batch_max_items", 2)
+
+        assert client.post("/api/v1/articles/summary/batch", json={"urls": []}).status_code == 422
+        assert client.post("/api/v1/articles/summary/batch", json={"urls": URLS}).status_code == 422
+        assert client.post("/api/v1/quiz/generate/batch", json={"urls": URLS}).status_code == 422
+
+
+class TestRunBatch:
+    def _collect(self, items):
+        async def run():
+            return [event async for event in batch_service.run_batch(items)]
+
+        return asyncio.run(run())
+
+    def test_yields_in_completion_order(self, wikipedia):
+        delays = {"About Topic 0.": 0.05, "About Topic 2.": 0.0}
+
+        async def summarize(text, length):
+            await asyncio.sleep(delays[text])
+            return {"summary": text}
+
+        items = batch_service.article_items([URLS[0], URLS[2]], [], "summary_url", "summary", length="short")
+        with patch("app.services.llm_groq_service.summarize_article", new=summarize):
+            results = self._collect(items)
+
+        assert [index for index, _, _ in results] == [1, 0]
+
+    def test_respects_global_budget(self, wikipedia, monkeypatch):
+        monkeypatch.setattr(settings, "batch_concurrency", 10)
+        monkeypatch.setattr(settings, "batch_max_concurrency", 2)
+        monkeypatch.setattr(batch_service, "_budgets", batch_service.weakref.WeakKeyDictionary())
+        running = peak = 0
+
+        async def summarize(text, length):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"summary": text}
+
+        urls = [f"https://en.wikipedia.org/wiki/Topic_{i}" for i in (0, 2, 3, 4, 5, 6)]
+        items = batch_service.article_items(urls, [], "summary_url", "summary", length="short")
+        with patch("app.services.llm_groq_service.summarize_article", new=summarize):
+            results = self._collect(items)
+
+        assert len(results) == 6
+        assert all(error is None for _, _, error in results)
+        assert peak == 2
@@ -0,0 +1,64 @@
+import asyncio
+
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services import chunking_service, pipeline_service
+
+
+def test_chunk_sections_packs_whole_sections():
+    chunks = chunking_service.chunk_sections(["a" * 40, "b" * 40, "c" * 40], max_size=100)
+
+    assert chunks == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+
+
+def test_chunk_sections_splits_oversized_section_on_sentences():
+    section = "First sentence here. Second sentence here. Third sentence here."
+
+    chunks = chunking_service.chunk_sections([section], max_size=45)
+
+    assert chunks == ["First sentence here. Second sentence here.", "Third sentence here."]
+    assert all(len(chunk) <= 45 for chunk in chunks)
+
+
+def test_split_text_hard_splits_long_sentences():
+    assert chunking_service.split_text("x" * 25, max_size=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+@patch("app.services.llm_groq_service.summarize_article")
+def test_long_article_summary_is_map_reduced(mock_summarize, monkeypatch):
+    monkeypatch.setattr(settings, "groq_max_input_tokens", 15)
+    sections = {"Intro": "i" * 50, "History": "h" * 50, "Legacy": "l" * 50}
+    text = "\n\n".join(sections.values())
+
+    async def fake_summary(content, length="medium"):
+        return {"summary": f"{content[0]}-summary"}
+
+    mock_summarize.side_effect = fake_summary
+
+    result, cached = asyncio.run(pipeline_service.summarize_text(text, "short", sections=sections))
+
+    assert cached is False
+    assert mock_summarize.await_count == 4  # three chunks + one reduce
+    reduce_call = mock_summarize.await_args_list[-1]
+    assert reduce_call.args[0] == "i-summary\n\nh-summary\n\nl-summary"
+    assert reduce_call.kwargs["length"] == "short"
+    assert result == {"summary": "i-summary"}
+
+
+@patch("app.services.llm_gemini_service.translate_content")
+def test_long_article_translation_is_reassembled_in_order(mock_translate, monkeypatch):
+    monkeypatch.setattr(settings, "gemini_translation_max_input_tokens", 15)
+    sections = {"Intro": "i" * 50, "History": "h" * 50}
+
+    async def fake_translate(content, target_language):
+        await asyncio.sleep(0.01 if content.startswith("i") else 0)
+        return content[0].upper() * 3
+
+    mock_translate.side_effect = fake_translate
+
+    translated, _ = asyncio.run(
+        pipeline_service.translate_text("\n\n".join(sections.values()), "FR", sections=sections)
+    )
+
+    assert translated == "III\n\nHHH"
@@ -0,0 +1,68 @@
+import asyncio
+
+from unittest.mock import patch
+
+from app.core.concurrency import SingleFlight
+from app.services import pipeline_service
+
+
+def test_single_flight_coalesces_identical_keys():
+    group = SingleFlight("test")
+    calls = []
+
+    async def job():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"value": 42}
+
+    async def burst():
+        return await asyncio.gather(*(group.do(("summary", "A"), job) for _ in range(10)))
+
+    results = asyncio.run(burst())
+
+    assert len(calls) == 1
+    assert all(result == {"value": 42} for result in results)
+    assert group.stats()["coalesced"] == 9
+    assert group.stats()["coalesced_by_group"] == {"summary": 9}
+    assert group.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    group = SingleFlight("test")
+
+    async def job():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.ensure_future(group.do("key", job))
+        follower = asyncio.ensure_future(group.do("key", job))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "done"
+
+
+@patch("app.services.llm_groq_service.summarize_article")
+@patch("app.services.wikipedia_service.fetch_article_sections")
+def test_pipeline_coalesces_identical_summary_jobs(mock_fetch, mock_summarize, sample_wikipedia_article):
+    async def slow_fetch(url):
+        await asyncio.sleep(0.02)
+        return sample_wikipedia_article
+
+    mock_fetch.side_effect = slow_fetch
+    mock_summarize.return_value = {"summary": "AI summary"}
+
+    async def burst():
+        return await asyncio.gather(
+            pipeline_service.summarize_url("https://en.wikipedia.org/wiki/Artificial_intelligence", "short"),
+            pipeline_service.summarize_url("https://en.wikipedia.org/wiki/artificial_intelligence", "short"),
+            pipeline_service.summarize_url("https://en.wikipedia.org/wiki/Artificial_intelligence", "medium"),
+        )
+
+    results = asyncio.run(burst())
+
+    assert [result["summary"] for result in results] == ["AI summary"] * 3
+    assert mock_fetch.await_count == 2  # short (coalesced) + medium
+    assert mock_summarize.await_count == 2
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.main import app
+from app.api.v1.routes_auth import get_db
+from app.core.security import create_access_token
+from app.db.pool import InstrumentedQueuePool
+from app.models.user import User, Role
+
+
+client = TestClient(app)
+
+
+class _RecordingSession:
+    """Stands in for a Session and records what the request did with it."""
+
+    instances = []
+
+    def __init__(self):
+        self.closed = 0
+        self.user = User(id=1, username="admin", email="admin@example.com", hashed_password="x", role=Role.ADMIN)
+        _RecordingSession.instances.append(self)
+
+    def get(self, model, ident):
+        return self.user if model is User and ident == 1 else None
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def recording_db():
+    _RecordingSession.instances = []
+
+    def override_get_db():
+        db = _RecordingSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield _RecordingSession.instances
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_auth_and_route_share_one_session_per_request(recording_db):
+    token = create_access_token({"sub": "1", "role": "ADMIN"}, 60)
+
+    response = client.get("/api/v1/admin/metrics", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
+    # One session for the whole request, released after authentication.
+    assert len(recording_db) == 1
+    assert recording_db[0].closed >= 1
+
+
+def test_instrumented_pool_reports_checkouts_and_waits():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+
+    first = pool.connect()
+    stats = pool.stats()
+    assert stats["checked_out"] == 1
+    assert stats["checkouts"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    assert pool.stats()["timeouts"] == 1
+    assert pool.stats()["wait_max_ms"] >= 40
+
+    first.close()
+    assert pool.stats()["checked_out"] == 0
+
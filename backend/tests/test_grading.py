@@ -0,0 +1,86 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import grading_service, llm_prompt_service, llm_router_service
+from app.services.llm_fake_service import FakeProvider
+
+
+REFERENCE = "Guido van Rossum created Python in 1991."
+
+
+def test_similarity_ranks_answers_by_closeness_to_reference():
+    answers = [
+        "Guido van Rossum created Python in 1991.",
+        "guido van rosum created it",
+        "It was Dennis Ritchie.",
+        "",
+    ]
+
+    similarity = grading_service.similarities([(REFERENCE, answer) for answer in answers])
+
+    assert similarity[0] == pytest.approx(1.0)
+    assert similarity[0] > similarity[1] > similarity[2] >= similarity[3] == 0.0
+
+
+def test_batch_pairs_are_graded_independently():
+    pairs = [(REFERENCE, "Guido van Rossum"), ("Water boils at 100 degrees.", "Guido van Rossum")]
+
+    similarity = grading_service.similarities(pairs)
+
+    assert similarity[0] > 0.3
+    assert similarity[1] < 0.05
+
+
+def test_credit_is_linear_between_thresholds(monkeypatch):
+    monkeypatch.setattr(settings, "grading_reject_similarity", 0.2)
+    monkeypatch.setattr(settings, "grading_accept_similarity", 0.6)
+
+    grades = grading_service.credit(np.array([0.1, 0.2, 0.4, 0.6, 0.9]))
+
+    assert grades.tolist() == pytest.approx([0.0, 0.0, 0.5, 1.0, 1.0])
+
+
+def test_borderline_answers_are_escalated_in_one_call(monkeypatch):
+    monkeypatch.setattr(settings, "grading_llm_escalation", True)
+    monkeypatch.setattr(settings, "llm_route_grading", ["judge"])
+    judge = FakeProvider("judge")
+    llm_router_service.register_provider("judge", judge)
+    items = [
+        ("Who created Python?", REFERENCE, REFERENCE),
+        ("Who created Python?", REFERENCE, "Python was made by Guido in the nineties"),
+        ("Who created Python?", REFERENCE, "Dennis Ritchie"),
+        ("Who created Python?", REFERENCE, "Guido created Python, I think"),
+    ]
+    _, borderline = grading_service.grade_locally(items)
+
+    grades = asyncio.run(grading_service.grade_answers(items))
+
+    assert borderline.tolist() == [False, True, False, True]
+    assert len(judge.calls) == 1
+    assert grades[0] == 1.0
+    assert grades[2] == 0.0
+    # FakeProvider grades by the share of reference words in the answer
+    assert grades[1] == pytest.approx(3 / 7, abs=0.001)
+    assert grades[3] == pytest.approx(3 / 7, abs=0.001)
+
+
+def test_local_grades_stand_when_escalation_fails(monkeypatch):
+    monkeypatch.setattr(settings, "grading_llm_escalation", True)
+    monkeypatch.setattr(settings, "llm_route_grading", ["down"])
+    llm_router_service.register_provider("down", FakeProvider("down", error=RuntimeError("down")))
+    items = [("Who created Python?", REFERENCE, "Python was made by Guido in the nineties")]
+    local, _ = grading_service.grade_locally(items)
+
+    grades = asyncio.run(grading_service.grade_answers(items))
+
+    assert grades == [round(float(local[0]), 3)]
+
+
+def test_parse_grades_keeps_valid_grades_in_order():
+    text = 'Sure: {"grades": [1, 0.5, "high", 3]}'
+
+    assert llm_prompt_service.parse_grades(text, 5) == [1.0, 0.5, None, None, None]
+    assert llm_prompt_service.parse_grades("no json", 2) == [None, None]
@@ -0,0 +1,210 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.api.v1.routes_auth import get_current_active_user, get_db
+from app.core.config import settings
+from app.models.base import Base
+from app.models.job import Job, JobStatus
+from app.models.user import User, Role
+from app.services import job_service
+
+
+client = TestClient(app)
+
+SUMMARY_PAYLOAD = {"url": "https://en.wikipedia.org/wiki/Artificial_intelligence"}
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    # A file database, because workers use sessions from several threads.
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.sqlite3'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(job_service, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def current_user(session_factory):
+    mock_user = MagicMock(spec=User)
+    mock_user.id = 1
+    mock_user.role = Role.USER
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_current_user():
+        return mock_user
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = override_get_current_user
+    yield mock_user
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def _submit(factory, user_id=1, priority=0, kind="summary_url", payload=None):
+    db = factory()
+    try:
+        job = job_service.submit_job(db, user_id, kind, payload or SUMMARY_PAYLOAD, priority)
+        return job.id
+    finally:
+        db.close()
+
+
+def _load(factory, job_id):
+    db = factory()
+    try:
+        return db.get(Job, job_id)
+    finally:
+        db.close()
+
+
+class TestClaiming:
+    def test_claims_by_priority_then_fifo(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_running_per_user", 10)
+        low = _submit(session_factory, priority=0)
+        high = _submit(session_factory, priority=5)
+        later_low = _submit(session_factory, priority=0)
+
+        claimed = [job_service._claim_next()[0] for _ in range(3)]
+
+        assert claimed == [high, low, later_low]
+        assert job_service._claim_next() is None
+
+    def test_respects_per_user_running_cap(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_running_per_user", 1)
+        first = _submit(session_factory, user_id=1, priority=5)
+        _submit(session_factory, user_id=1, priority=5)
+        other_user = _submit(session_factory, user_id=2)
+
+        assert job_service._claim_next()[0] == first
+        # User 1 is at the cap, so user 2's lower-priority job goes next.
+        assert job_service._claim_next()[0] == other_user
+        assert job_service._claim_next() is None
+
+    def test_pending_cap_rejects_submissions(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_pending_per_user", 2)
+        _submit(session_factory)
+        _submit(session_factory)
+
+        with pytest.raises(job_service.JobQueueFullError):
+            _submit(session_factory)
+
+    def test_requeues_stale_running_jobs(self, session_factory, monkeypatch):
+        job_id = _submit(session_factory)
+        job_service._claim_next()
+        monkeypatch.setattr(settings, "job_timeout_seconds", -10)
+
+        assert job_service.requeue_stale_jobs() == 1
+        assert _load(session_factory, job_id).status == JobStatus.QUEUED
+
+
+class TestWorkers:
+    def _run_until_done(self, factory, job_id):
+        async def run():
+            await job_service.start_workers()
+            try:
+                return [snapshot async for snapshot in job_service.watch(job_id)]
+            finally:
+                await job_service.stop_workers()
+
+        return asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+    def test_cancelled_job_is_requeued(self, session_factory):
+        job_id = _submit(session_factory)
+
+        async def run():
+            claimed_id, kind, payload = job_service._claim_next()
+            never = asyncio.Event()
+            with patch("app.services.job_service.run_request", new=lambda *args: never.wait()):
+                task = asyncio.ensure_future(job_service._execute(claimed_id, kind, payload))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(run())
+
+        job = _load(session_factory, job_id)
+        assert (job.status, job.startedat) == (JobStatus.QUEUED, None)
+
+    def test_worker_runs_job_and_stores_result(self, session_factory):
+        job_id = _submit(session_factory)
+        result = {"title": "Artificial intelligence", "summary": "AI summary", "cached": False}
+
+        with patch("app.services.job_service.pipeline_service.summarize_url", new=AsyncMock(return_value=result)):
+            snapshots = self._run_until_done(session_factory, job_id)
+
+        assert snapshots[-1]["status"] == "SUCCEEDED"
+        job = _load(session_factory, job_id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result["summary"] == "AI summary"
+        assert job.result["title"] == "Artificial intelligence"
+
+    def test_worker_records_failure(self, session_factory):
+        job_id = _submit(session_factory)
+
+        with patch(
+            "app.services.job_service.pipeline_service.summarize_url",
+            new=AsyncMock(side_effect=RuntimeError("Groq unavailable")),
+        ):
+            snapshots = self._run_until_done(session_factory, job_id)
+
+        assert snapshots[-1]["status"] == "FAILED"
+        assert snapshots[-1]["error"] == "Groq unavailable"
+
+
+class TestJobEndpoints:
+    def test_submit_returns_job_id(self, current_user):
+        response = client.post("/api/v1/jobs", json={"kind": "summary_url", "payload": SUMMARY_PAYLOAD})
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "QUEUED"
+
+        status_response = client.get(f"/api/v1/jobs/{data['id']}")
+        assert status_response.status_code == 200
+        assert status_response.json()["kind"] == "summary_url"
+
+    def test_submit_validates_payload(self, current_user):
+        response = client.post("/api/v1/jobs", json={"kind": "translation_url", "payload": SUMMARY_PAYLOAD})
+
+        assert response.status_code == 422
+
+    def test_submit_over_pending_cap(self, current_user, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_pending_per_user", 1)
+        client.post("/api/v1/jobs", json={"kind": "summary_url", "payload": SUMMARY_PAYLOAD})
+
+        response = client.post("/api/v1/jobs", json={"kind": "summary_url", "payload": SUMMARY_PAYLOAD})
+
+        assert response.status_code == 429
+
+    def test_other_users_job_is_not_found(self, current_user, session_factory):
+        job_id = _submit(session_factory, user_id=2)
+
+        response = client.get(f"/api/v1/jobs/{job_id}")
+
+        assert response.status_code == 404
+
+    def test_only_admins_raise_priority(self, current_user, session_factory):
+        def submitted_priority(priority):
+            response = client.post(
+                "/api/v1/jobs", json={"kind": "summary_url", "payload": SUMMARY_PAYLOAD, "priority": priority}
+            )
+            return response.json()["priority"]
+
+        assert (submitted_priority(10), submitted_priority(-5)) == (0, -5)
+        current_user.role = Role.ADMIN
+        assert submitted_priority(10) == 10
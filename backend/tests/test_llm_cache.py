@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services import llm_cache_service
+
+
+@pytest.fixture
+def result_store(tmp_path):
+    store = llm_cache_service._ResultStore(str(tmp_path / "llm.sqlite3"), max_bytes=10_000)
+    with patch.object(llm_cache_service, "_store", store):
+        yield store
+
+
+def _summarize(compute, content="Article text", variant="medium", refresh=False):
+    return asyncio.run(
+        llm_cache_service.get_or_compute(
+            "summary",
+            content,
+            model="test-model",
+            variant=variant,
+            prompt_version="1",
+            compute=compute,
+            refresh=refresh,
+        )
+    )
+
+
+def test_second_call_is_served_from_cache(result_store):
+    compute = AsyncMock(return_value={"summary": "Short summary"})
+
+    first = _summarize(compute)
+    second = _summarize(compute)
+
+    assert first == ({"summary": "Short summary"}, False)
+    assert second == ({"summary": "Short summary"}, True)
+    compute.assert_awaited_once()
+
+
+def test_refresh_bypasses_and_overwrites_cache(result_store):
+    _summarize(AsyncMock(return_value={"summary": "Old"}))
+
+    refreshed = _summarize(AsyncMock(return_value={"summary": "New"}), refresh=True)
+    cached = _summarize(AsyncMock(return_value={"summary": "Unused"}))
+
+    assert refreshed == ({"summary": "New"}, False)
+    assert cached == ({"summary": "New"}, True)
+
+
+def test_variant_is_part_of_the_key(result_store):
+    compute = AsyncMock(return_value={"summary": "Summary"})
+
+    _summarize(compute, variant="short")
+    _summarize(compute, variant="medium")
+
+    assert compute.await_count == 2
+
+
+def test_empty_results_are_not_cached(result_store):
+    compute = AsyncMock(return_value="")
+
+    _summarize(compute)
+    _summarize(compute)
+
+    assert compute.await_count == 2
+
+
+def test_store_evicts_least_recently_used_rows(result_store):
+    for i in range(5):
+        _summarize(AsyncMock(return_value={"summary": "x" * 3000}), content=f"Article {i}")
+
+    assert result_store.evictions >= 2
+    assert _summarize(AsyncMock(return_value={"summary": "fresh"}), content="Article 0")[1] is False
+    assert _summarize(AsyncMock(return_value={"summary": "fresh"}), content="Article 4")[1] is True
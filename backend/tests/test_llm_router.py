@@ -0,0 +1,200 @@
+import asyncio
+import gc
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import LLMRateLimitError
+from app.services import llm_router_service
+from app.services.llm_fake_service import FakeProvider
+
+
+ARTICLE = "Python is a programming language that lets you work quickly."
+
+
+def route(monkeypatch, operation, providers, policy="fallback", **names):
+    for name, provider in names.items():
+        llm_router_service.register_provider(name, provider)
+    monkeypatch.setattr(settings, f"llm_route_{operation}", providers)
+    monkeypatch.setattr(settings, f"llm_policy_{operation}", policy)
+
+
+def test_fallback_uses_next_provider_when_primary_fails(monkeypatch):
+    primary = FakeProvider("primary", error=RuntimeError("down"))
+    secondary = FakeProvider("secondary")
+    route(monkeypatch, "summary", ["primary", "secondary"], primary=primary, secondary=secondary)
+
+    result = asyncio.run(llm_router_service.summarize_article(ARTICLE, length="short"))
+
+    assert result["model"] == "secondary"
+    assert len(primary.calls) == 1
+    stats = llm_router_service.get_stats()["providers"]
+    assert stats["primary.summarize_article"]["failures"] == 1
+    assert stats["primary.summarize_article"]["cooling_down"] is True
+
+
+def test_failed_provider_is_tried_last_during_cooldown(monkeypatch):
+    primary = FakeProvider("primary", error=RuntimeError("down"))
+    secondary = FakeProvider("secondary")
+    route(monkeypatch, "quiz", ["primary", "secondary"], primary=primary, secondary=secondary)
+
+    asyncio.run(llm_router_service.generate_quiz(ARTICLE))
+    asyncio.run(llm_router_service.generate_quiz(ARTICLE))
+
+    assert len(primary.calls) == 1
+    assert len(secondary.calls) == 2
+
+
+def test_invalid_input_is_not_retried_elsewhere(monkeypatch):
+    primary = FakeProvider("primary")
+    secondary = FakeProvider("secondary")
+    route(monkeypatch, "translation", ["primary", "secondary"], primary=primary, secondary=secondary)
+
+    with pytest.raises(ValueError):
+        asyncio.run(llm_router_service.translate_content(ARTICLE, " "))
+
+    assert secondary.calls == []
+
+
+def test_all_providers_failing_prefers_rate_limit_error(monkeypatch):
+    primary = FakeProvider("primary", error=RuntimeError("down"))
+    secondary = FakeProvider("secondary", error=LLMRateLimitError("busy", retry_after=7))
+    route(monkeypatch, "summary", ["primary", "secondary"], primary=primary, secondary=secondary)
+
+    with pytest.raises(LLMRateLimitError) as excinfo:
+        asyncio.run(llm_router_service.summarize_article(ARTICLE))
+
+    assert excinfo.value.retry_after == 7
+
+
+def test_hedged_request_bounds_latency_of_slow_primary(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_delay_seconds", 0.05)
+    slow = FakeProvider("slow", latency=2.0)
+    fast = FakeProvider("fast", latency=0.01)
+    route(monkeypatch, "summary", ["slow", "fast"], policy="hedged", slow=slow, fast=fast)
+
+    started = time.monotonic()
+    result = asyncio.run(llm_router_service.summarize_article(ARTICLE))
+    elapsed = time.monotonic() - started
+
+    assert result["model"] == "fast"
+    assert elapsed < 0.5
+    stats = llm_router_service.get_stats()
+    assert stats["hedges"]["summary"] == 1
+    assert stats["providers"]["fast.summarize_article"]["hedge_wins"] == 1
+
+
+def test_failures_finishing_with_the_winner_are_retrieved(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_delay_seconds", 0.01)
+    route(
+        monkeypatch,
+        "summary",
+        ["primary", "secondary"],
+        policy="hedged",
+        primary=FakeProvider("primary"),
+        secondary=FakeProvider("secondary"),
+    )
+    wait, ensure_future = asyncio.wait, asyncio.ensure_future
+    launched = []
+
+    def recording_ensure_future(call):
+        launched.append(ensure_future(call))
+        return launched[-1]
+
+    async def winner_first_wait(*args, **kwargs):
+        # The second call wins; look at it before the failed first one
+        done, pending = await wait(*args, **kwargs)
+        return sorted(done, key=launched.index, reverse=True), pending
+
+    async def run():
+        unretrieved = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context))
+        both_started = asyncio.Event()
+        started = []
+
+        async def call(provider):
+            started.append(provider)
+            if len(started) == 2:
+                both_started.set()
+            # Both calls finish in the same event-loop round
+            await both_started.wait()
+            if provider is started[0]:
+                raise RuntimeError("down")
+            return "ok"
+
+        result = await llm_router_service._race("summary", "summarize_article", call)
+        launched.clear()
+        gc.collect()
+        return result, unretrieved
+
+    monkeypatch.setattr(asyncio, "wait", winner_first_wait)
+    monkeypatch.setattr(asyncio, "ensure_future", recording_ensure_future)
+
+    assert asyncio.run(run()) == ("ok", [])
+    assert llm_router_service.get_stats()["providers"]["primary.summarize_article"]["failures"] == 1
+
+
+def test_hedged_request_does_not_hedge_fast_primary(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_delay_seconds", 0.5)
+    primary = FakeProvider("primary")
+    secondary = FakeProvider("secondary")
+    route(monkeypatch, "summary", ["primary", "secondary"], policy="hedged", primary=primary, secondary=secondary)
+
+    asyncio.run(llm_router_service.summarize_article(ARTICLE))
+
+    assert secondary.calls == []
+
+
+def test_fastest_policy_prefers_lowest_observed_latency(monkeypatch):
+    slow = FakeProvider("slow", latency=0.05)
+    fast = FakeProvider("fast", latency=0.0)
+    route(monkeypatch, "translation", ["slow", "fast"], policy="fastest", slow=slow, fast=fast)
+
+    async def run():
+        # Unmeasured providers go first, so each one gets probed once.
+        await llm_router_service.translate_content(ARTICLE, "FR")
+        assert llm_router_service.candidates("translation", "translate_content") == ["fast", "slow"]
+        await llm_router_service.translate_content(ARTICLE, "FR")
+        for _ in range(3):
+            await llm_router_service.translate_content(ARTICLE, "FR")
+
+    asyncio.run(run())
+
+    assert len(slow.calls) == 1
+    assert len(fast.calls) == 4
+
+
+def test_stream_falls_back_before_first_chunk(monkeypatch):
+    primary = FakeProvider("primary", error=RuntimeError("down"))
+    secondary = FakeProvider("secondary")
+    route(monkeypatch, "translation", ["primary", "secondary"], primary=primary, secondary=secondary)
+
+    async def collect():
+        return [delta async for delta in llm_router_service.stream_translation(ARTICLE, "FR")]
+
+    assert "".join(asyncio.run(collect())) == f"[FR] {ARTICLE}"
+
+
+def test_hedged_stream_races_to_first_chunk(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_delay_seconds", 0.05)
+    slow = FakeProvider("slow", latency=2.0)
+    fast = FakeProvider("fast")
+    route(monkeypatch, "summary", ["slow", "fast"], policy="hedged", slow=slow, fast=fast)
+
+    async def collect():
+        return [delta async for delta in llm_router_service.stream_summary(ARTICLE, length="short")]
+
+    started = time.monotonic()
+    text = "".join(asyncio.run(collect()))
+
+    assert text == " ".join(ARTICLE.split()[:12])
+    assert time.monotonic() - started < 0.5
+
+
+def test_budget_follows_first_provider_in_route(monkeypatch):
+    small = FakeProvider("small", max_input_tokens=100)
+    large = FakeProvider("large", max_input_tokens=9000)
+    route(monkeypatch, "summary", ["small", "large"], small=small, large=large)
+
+    assert llm_router_service.budget("summary") == ("small", 100)
@@ -0,0 +1,143 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import article_identity, init_db
+from app.models.article import Article
+from app.models.base import Base
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.stat_counter import StatCounter
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.sqlite3'}")
+    monkeypatch.setattr(init_db, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def _migrate(engine, command_name, revision):
+    config = Config(init_db.ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    # Not in a transaction: migrations manage their own (and commit between steps)
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        getattr(command, command_name)(config, revision)
+
+
+def test_migrations_build_the_model_schema(engine):
+    _migrate(engine, "upgrade", "head")
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == []
+
+
+def test_original_database_upgrades_with_its_rows(engine):
+    _migrate(engine, "upgrade", "0001")
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO users (id, username, email, hashed_password, role) VALUES (1, 'u', 'u@x', 'x', 'USER')")
+        )
+        connection.execute(
+            text("INSERT INTO articles (id, url, title, action) VALUES (1, 'https://en.wikipedia.org/wiki/AI', 'AI', 'QUIZ')")
+        )
+        connection.execute(
+            text("INSERT INTO quizattempts (userid, articleid, score, submittedat) VALUES (1, 1, 80.0, '2024-05-01')")
+        )
+
+    _migrate(engine, "upgrade", "head")
+
+    db = sessionmaker(bind=engine)()
+    attempt = db.execute(select(QuizAttempt)).scalar_one()
+    assert (attempt.score, attempt.quizid, attempt.mcqcorrect) == (80.0, None, None)
+    assert attempt.gradedat == attempt.submittedat
+    counts = dict(db.execute(select(StatCounter.name, StatCounter.count).where(StatCounter.key == "")).all())
+    assert (counts["users"], counts["articles"], counts["attempts"]) == (1, 1, 1)
+    db.close()
+    with engine.begin() as connection:
+        # The previous release inserts articles without a key
+        connection.execute(text("INSERT INTO articles (url, title, action) VALUES ('https://x.org/a', 'A', 'SUMMARY')"))
+
+
+def test_identity_migration_merges_duplicate_articles(engine):
+    _migrate(engine, "upgrade", "0004")
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO articles (id, url, title, action) VALUES (:id, :url, 'AI', :action)"),
+            [
+                {"id": 1, "url": "https://en.wikipedia.org/wiki/Artificial_intelligence", "action": "SUMMARY"},
+                {"id": 2, "url": "https://en.wikipedia.org/wiki/Artificial_intelligence", "action": "QUIZ"},
+                {"id": 3, "url": "https://en.m.wikipedia.org/wiki/artificial_intelligence", "action": "QUIZ"},
+                {"id": 4, "url": "upload://notes.pdf", "action": "PDF"},
+                {"id": 5, "url": "upload://notes.pdf", "action": "PDF"},
+            ],
+        )
+        connection.execute(
+            text("INSERT INTO users (id, username, email, hashed_password, role) VALUES (1, 'u', 'u@x', 'x', 'USER')")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO quizzes (id, articleid, questions, answerkey, opencount, digest)"
+                " VALUES (1, 3, '{}', x'', 0, 'x')"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO quizattempts (userid, articleid, score) VALUES (1, :article, 50.0)"),
+            [{"article": article_id} for article_id in (1, 2, 3)],
+        )
+
+    _migrate(engine, "upgrade", "head")
+
+    db = sessionmaker(bind=engine)()
+    assert db.execute(select(Article.id).order_by(Article.id)).scalars().all() == [1, 4, 5]
+    assert set(db.execute(select(QuizAttempt.articleid)).scalars()) == {1}
+    assert db.get(Quiz, 1).articleid == 1
+    counts = dict(db.execute(select(StatCounter.name, StatCounter.count).where(StatCounter.key.in_(["", "1"]))).all())
+    assert (counts["articles"], counts["attempts_by_article"]) == (3, 3)
+    db.close()
+    with engine.begin() as connection:
+        # The data steps are idempotent
+        assert (article_identity.backfill_keys(connection), article_identity.merge_duplicates(connection)) == (0, 0)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("quizattempts")}
+    assert {"ix_quizattempts_userid_submittedat", "ix_quizattempts_articleid"} <= indexes
+
+
+def test_downgrade_removes_identity_key(engine):
+    _migrate(engine, "upgrade", "head")
+    _migrate(engine, "downgrade", "0004")
+
+    assert "articlekey" not in {column["name"] for column in inspect(engine).get_columns("articles")}
+
+
+def test_startup_check_requires_current_schema(engine):
+    with pytest.raises(init_db.SchemaVersionError, match="alembic upgrade head"):
+        init_db.check_schema()
+
+    _migrate(engine, "upgrade", "0001")
+    with pytest.raises(init_db.SchemaVersionError):
+        init_db.check_schema()
+
+    _migrate(engine, "upgrade", "head")
+    init_db.check_schema()
+
+    # A newer release already migrated the database (rolling deploy)
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE alembic_version SET version_num = 'ffff_future'"))
+    init_db.check_schema()
+
+
+def test_startup_check_does_no_ddl(engine):
+    _migrate(engine, "upgrade", "head")
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE statcounters"))
+
+    init_db.check_schema()
+
+    assert "statcounters" not in inspect(engine).get_table_names()
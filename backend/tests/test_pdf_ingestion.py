@@ -0,0 +1,220 @@
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from unittest.mock import MagicMock
+
+from app.main import app
+from app.api.v1.routes_auth import get_current_active_user, get_db
+from app.core.config import settings
+from app.models.article import Article
+from app.models.base import Base
+from app.models.user import User, Role
+from app.services import article_service, content_store_service, pdf_service
+
+
+client = TestClient(app)
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Build a minimal text-only PDF with one line of text per page."""
+
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            "<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (" ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages))
+        ).encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i, text in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(out)
+        out += f"{object_id} 0 obj\n".encode() + objects[object_id] + b"\nendobj\n"
+
+    xref_offset = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for object_id in range(1, size):
+        out += f"{offsets[object_id]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return out
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "course.pdf"
+    path.write_bytes(make_pdf([f"Chapter {i} text" for i in range(1, 7)]))
+    return str(path)
+
+
+@pytest.fixture
+def ingest_env(tmp_path, monkeypatch):
+    """In-memory database, authenticated user and a temp content store."""
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    mock_user = MagicMock(spec=User)
+    mock_user.id = 1
+    mock_user.role = Role.USER
+
+    async def override_get_current_user():
+        return mock_user
+
+    monkeypatch.setattr(settings, "processed_content_dir", str(tmp_path / "processed"))
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = override_get_current_user
+    yield mock_user
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def test_extract_text_from_pdf_builds_page_sections(pdf_file):
+    article_data = pdf_service.extract_text_from_pdf(pdf_file)
+
+    assert article_data["page_count"] == 6
+    assert list(article_data["sections"]) == [f"Page {i}" for i in range(1, 7)]
+    assert article_data["sections"]["Page 3"] == "Chapter 3 text"
+
+
+def test_parallel_extraction_matches_sequential(pdf_file, monkeypatch):
+    sequential = pdf_service.extract_text_from_pdf(pdf_file)
+
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 2)
+    monkeypatch.setattr(settings, "pdf_max_workers", 2)
+    try:
+        parallel = pdf_service.extract_text_from_pdf(pdf_file)
+    finally:
+        pdf_service.shutdown_process_pool()
+
+    assert parallel == sequential
+
+
+def test_page_cap_is_enforced(pdf_file, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_max_pages", 5)
+
+    with pytest.raises(pdf_service.PdfTooLargeError):
+        pdf_service.extract_text_from_pdf(pdf_file)
+
+
+def test_ingest_pdf_registers_article_and_stores_sections(ingest_env, pdf_file):
+    with open(pdf_file, "rb") as handle:
+        response = client.post(
+            "/api/v1/articles/ingest/pdf",
+            files={"file": ("course.pdf", handle, "application/pdf")},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["title"] == "course"
+    assert data["action"] == "PDF"
+    assert data["metadata"] == {"page_count": 6, "section_count": 6}
+
+    stored = content_store_service._read(data["id"])
+    assert stored["sections"]["Page 1"] == "Chapter 1 text"
+
+
+def test_ingest_pdf_rejects_oversized_upload(ingest_env, pdf_file, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_max_bytes", 100)
+
+    with open(pdf_file, "rb") as handle:
+        response = client.post(
+            "/api/v1/articles/ingest/pdf",
+            files={"file": ("course.pdf", handle, "application/pdf")},
+        )
+
+    assert response.status_code == 413
+
+
+def test_ingest_pdf_rejects_invalid_file(ingest_env):
+    response = client.post(
+        "/api/v1/articles/ingest/pdf",
+        files={"file": ("notes.pdf", b"not a pdf", "application/pdf")},
+    )
+
+    assert response.status_code == 400
+
+
+def test_ingest_pdf_ignores_malformed_content_length(ingest_env, pdf_file):
+    with open(pdf_file, "rb") as handle:
+        request = client.build_request(
+            "POST",
+            "/api/v1/articles/ingest/pdf",
+            files={"file": ("course.pdf", handle.read(), "application/pdf")},
+        )
+    request.headers["content-length"] = "abc"
+
+    # Only the early check reads the header; the spooled upload is still capped
+    assert client.send(request).status_code == 200
+
+
+def _upload(pdf_file):
+    with open(pdf_file, "rb") as handle:
+        response = client.post(
+            "/api/v1/articles/ingest/pdf",
+            files={"file": ("course.pdf", handle, "application/pdf")},
+        )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_uploads_are_private_to_their_uploader(ingest_env, pdf_file):
+    article_id = _upload(pdf_file)
+    ingest_env.id = 2
+
+    requests = [
+        ("/api/v1/articles/summary", {"article_id": article_id}),
+        ("/api/v1/articles/translate", {"article_id": article_id, "target_language": "FR"}),
+        ("/api/v1/articles/translate/stream", {"article_id": article_id, "target_language": "FR"}),
+        ("/api/v1/articles/summary/batch", {"article_ids": [article_id]}),
+        ("/api/v1/articles/translate/batch", {"article_ids": [article_id], "target_language": "FR"}),
+        ("/api/v1/jobs", {"kind": "summary", "payload": {"article_id": article_id}}),
+    ]
+    for path, body in requests:
+        assert client.post(path, json=body).status_code == 404, path
+
+    # The same file uploaded by another user is their own article
+    assert _upload(pdf_file) != article_id
+
+
+def test_upload_access_rules():
+    upload = Article(url="upload://notes.pdf", title="notes", action="PDF", uploadedby=1)
+    legacy_upload = Article(url="upload://old.pdf", title="old", action="PDF")
+    wikipedia = Article(url="https://en.wikipedia.org/wiki/Python", title="Python", action="INGEST")
+    owner, other, admin = (MagicMock(id=1, role=Role.USER), MagicMock(id=2, role=Role.USER), MagicMock(id=3, role=Role.ADMIN))
+
+    assert [article_service.can_read(article, owner) for article in (upload, legacy_upload, wikipedia)] == [
+        True,
+        False,
+        True,
+    ]
+    assert not article_service.can_read(upload, other)
+    assert article_service.can_read(upload, admin) and article_service.can_read(legacy_upload, admin)
+
+
+def test_translate_requires_login():
+    response = client.post("/api/v1/articles/translate", json={"article_id": 1, "target_language": "FR"})
+
+    assert response.status_code == 401
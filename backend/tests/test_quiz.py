@@ -1,10 +1,21 @@
+import asyncio
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from unittest.mock import patch, MagicMock
 
 from app.main import app
-from app.api.v1.routes_auth import get_current_active_user
+from app.api.v1.routes_auth import get_current_active_user, get_db
+from app.models.base import Base
+from app.models.job import Job
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.core.config import settings
 from app.models.user import User, Role
+from app.services import quiz_service
 
 
 client = TestClient(app)
@@ -24,7 +35,28 @@ def mock_auth_user():
     
     app.dependency_overrides[get_current_active_user] = override_get_current_user
     yield mock_user
-    app.dependency_overrides.clear()
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture
+def quiz_db(tmp_path, monkeypatch):
+    """File-backed SQLite shared by the request session and quiz_service."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'quiz.sqlite3'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(quiz_service, "SessionLocal", factory)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield factory
+    app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
 
 
 @pytest.fixture
@@ -65,7 +97,7 @@ class TestQuizGeneration:
     @patch("app.services.wikipedia_service.clean_wikipedia_text")
     @patch("app.services.wikipedia_service.fetch_article_sections")
     def test_generate_quiz_success(
-        self, mock_fetch, mock_clean, mock_generate, mock_auth_user, mock_wikipedia_data, mock_quiz_data
+        self, mock_fetch, mock_clean, mock_generate, mock_auth_user, quiz_db, mock_wikipedia_data, mock_quiz_data
     ):
         mock_fetch.return_value = mock_wikipedia_data
         mock_clean.return_value = "Cleaned text content"
@@ -86,6 +118,54 @@ class TestQuizGeneration:
         mock_fetch.assert_called_once()
         mock_generate.assert_called_once()
 
+        db = quiz_db()
+        stored = db.get(Quiz, data["quiz_id"])
+        assert stored.articleid == data["article_id"]
+        assert stored.answerkey == bytes([0, 1])
+        assert stored.opencount == 1
+        db.close()
+
+        # Serving the same quiz again reuses the stored row.
+        again = client.post(
+            "/api/v1/quiz/generate",
+            json={"url": "https://en.wikipedia.org/wiki/Python_(programming_language)"},
+        ).json()
+        assert (again["quiz_id"], again["article_id"]) == (data["quiz_id"], data["article_id"])
+
+    @patch("app.services.wikipedia_service.fetch_article_sections")
+    def test_stream_quiz_emits_questions_then_quiz(
+        self, mock_fetch, mock_auth_user, quiz_db, mock_wikipedia_data, mock_quiz_data
+    ):
+        mock_fetch.return_value = mock_wikipedia_data
+
+        async def fake_stream(content):
+            for kind in ("multiple_choice", "open_questions"):
+                for question in mock_quiz_data[kind]:
+                    yield kind, question
+
+        with patch("app.services.llm_gemini_service.stream_quiz", new=fake_stream):
+            response = client.post(
+                "/api/v1/quiz/generate/stream",
+                json={"url": "https://en.wikipedia.org/wiki/Python_(programming_language)"},
+            )
+
+        assert response.status_code == 200
+        events = []
+        for block in response.text.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+        questions = [data for event, data in events if event == "question"]
+        assert [(data["type"], data["index"]) for data in questions] == [
+            ("multiple_choice", 0),
+            ("multiple_choice", 1),
+            ("open_questions", 0),
+        ]
+        event, done = events[-1]
+        assert event == "done"
+        assert done["multiple_choice"] == mock_quiz_data["multiple_choice"]
+        assert done["open_questions"] == mock_quiz_data["open_questions"]
+        assert done["quiz_id"] is not None
+
     def test_generate_quiz_invalid_url(self, mock_auth_user):
         response = client.post(
             "/api/v1/quiz/generate",
@@ -102,11 +182,157 @@ class TestQuizGeneration:
             assert response.status_code in [401, 500]
 
 
+@pytest.fixture
+def stored_quiz(quiz_db, mock_quiz_data):
+    db = quiz_db()
+    quiz = quiz_service.save_quiz(db, "https://en.wikipedia.org/wiki/Python", "Python", mock_quiz_data)
+    ids = quiz.id, quiz.articleid
+    db.close()
+    return ids
+
+
+class TestScoring:
+    def test_compute_score_compares_answers_with_key(self):
+        key = bytes([0, 1, 3, 2])
+
+        assert quiz_service.compute_score(key, {0: 0, 1: 2, 2: 3, 3: 2}) == 3
+        assert quiz_service.compute_score(key, {}) == 0
+        # Unknown question indexes are ignored.
+        assert quiz_service.compute_score(key, {7: 0, -1: 2, 0: 0}) == 1
+
+    def test_answer_key_never_matches_unusable_index(self):
+        quiz = {"multiple_choice": [{"question": "?", "options": ["a", "b"], "correct_index": 5}]}
+
+        assert quiz_service.compute_score(quiz_service.build_answer_key(quiz), {0: 5}) == 0
+
+
 class TestQuizAttempt:
-    def test_submit_quiz_attempt_not_implemented(self, mock_auth_user):
+    def test_submit_scores_mcq_and_queues_grading(self, mock_auth_user, quiz_db, stored_quiz):
+        quiz_id, article_id = stored_quiz
+
+        response = client.post(
+            "/api/v1/quiz/attempt",
+            json={"article_id": article_id, "answers_mcq": {0: 0, 1: 0}, "answers_open": {0: "Web development"}},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["quiz_id"] == quiz_id
+        assert (data["mcq_correct"], data["mcq_total"], data["open_total"]) == (1, 2, 1)
+        assert data["score"] == pytest.approx(100 / 3, abs=0.01)
+        assert data["grading_pending"] is True
+
+        db = quiz_db()
+        job = db.query(Job).one()
+        assert (job.kind, job.payload) == ("grade_attempt", {"attempt_id": data["attempt_id"]})
+        db.close()
+
+        result = asyncio.run(quiz_service.grade_attempt(data["attempt_id"]))
+
+        assert result["open_score"] > 0
+        db = quiz_db()
+        attempt = db.get(QuizAttempt, data["attempt_id"])
+        assert attempt.gradedat is not None
+        assert attempt.score == pytest.approx(100 * (1 + attempt.openscore) / 3, abs=0.01)
+        db.close()
+
+    def test_grading_job_grades_waiting_attempts_in_one_batch(self, mock_auth_user, quiz_db, stored_quiz):
+        _, article_id = stored_quiz
+        attempt_ids = [
+            client.post(
+                "/api/v1/quiz/attempt",
+                json={"article_id": article_id, "answers_mcq": {}, "answers_open": {0: answer}},
+            ).json()["attempt_id"]
+            for answer in (
+                "Web development, data science and automation applications",
+                "web developmnt",
+                "cooking",
+            )
+        ]
+
+        first = asyncio.run(quiz_service.grade_attempt(attempt_ids[0]))
+        later = asyncio.run(quiz_service.grade_attempt(attempt_ids[2]))
+
+        assert first["batch"] == 3
+        assert later["batch"] == 0
+        db = quiz_db()
+        open_scores = [db.get(QuizAttempt, attempt_id).openscore for attempt_id in attempt_ids]
+        db.close()
+        assert open_scores[0] == 1.0
+        assert 0 < open_scores[1] <= 1.0
+        assert open_scores[2] == 0.0
+        assert later["open_score"] == 0.0
+
+    def test_grading_skips_legacy_attempts_without_quiz(self, mock_auth_user, quiz_db, stored_quiz):
+        _, article_id = stored_quiz
+        db = quiz_db()
+        # Seeded or pre-quiz attempt: no quiz, never graded
+        db.add(QuizAttempt(userid=1, articleid=article_id, score=50.0))
+        db.commit()
+        db.close()
+        attempt_id = client.post(
+            "/api/v1/quiz/attempt",
+            json={"article_id": article_id, "answers_mcq": {}, "answers_open": {0: "Web development"}},
+        ).json()["attempt_id"]
+
+        result = asyncio.run(quiz_service.grade_attempt(attempt_id))
+
+        assert result["batch"] == 1
+        assert result["open_score"] > 0
+
+    def test_grading_jobs_count_toward_pending_limit(self, mock_auth_user, quiz_db, stored_quiz, monkeypatch):
+        _, article_id = stored_quiz
+        monkeypatch.setattr(settings, "job_max_pending_per_user", 1)
+
+        def submit(answers_open):
+            return client.post(
+                "/api/v1/quiz/attempt",
+                json={"article_id": article_id, "answers_mcq": {0: 0}, "answers_open": answers_open},
+            ).status_code
+
+        assert submit({0: "Web development"}) == 200
+        assert submit({0: "Data science"}) == 429
+        # Nothing to grade, nothing queued
+        assert submit({}) == 200
+
+    def test_submit_without_open_answers_is_graded_immediately(self, mock_auth_user, quiz_db, stored_quiz):
+        _, article_id = stored_quiz
+
+        response = client.post(
+            "/api/v1/quiz/attempt",
+            json={"article_id": article_id, "answers_mcq": {0: 0, 1: 1}, "answers_open": {}},
+        )
+
+        data = response.json()
+        assert data["grading_pending"] is False
+        assert data["score"] == pytest.approx(200 / 3, abs=0.01)
+        db = quiz_db()
+        assert db.query(Job).count() == 0
+        db.close()
+
+    def test_submit_for_article_without_quiz_returns_404(self, mock_auth_user, quiz_db):
         response = client.post(
             "/api/v1/quiz/attempt",
             json={"article_id": 1, "answers_mcq": {0: 0, 1: 1}, "answers_open": {0: "test answer"}},
         )
-        # Endpoint returns 500 with NotImplementedError
-        assert response.status_code == 500
+
+        assert response.status_code == 404
+
+
+    def test_submit_rejects_out_of_range_indexes(self, mock_auth_user, quiz_db, stored_quiz):
+        _, article_id = stored_quiz
+
+        for answers_mcq in ({0: 10**30}, {10**30: 0}, {-1: 0}, {0: 255}):
+            response = client.post(
+                "/api/v1/quiz/attempt",
+                json={"article_id": article_id, "answers_mcq": answers_mcq, "answers_open": {}},
+            )
+            assert response.status_code == 422
+
+    def test_quiz_without_questions_is_not_stored(self, mock_auth_user, quiz_db):
+        db = quiz_db()
+        empty = {"multiple_choice": [], "open_questions": []}
+
+        assert quiz_service.save_quiz(db, "https://en.wikipedia.org/wiki/Python", "Python", empty) is None
+        assert db.query(Quiz).count() == 0
+        db.close()
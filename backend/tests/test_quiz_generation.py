@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+from app.core.config import settings
+from app.services import quiz_generation_service
+from app.services.quiz_generation_service import QuizStreamParser
+
+
+MCQ = {"question": "Who created Python?", "options": ["Guido", "Dennis", "Bjarne", "James"], "correct_index": 0}
+OPEN = {"question": "What is Python?", "answer": "A programming language."}
+
+
+def quiz_json(multiple_choice, open_questions):
+    return json.dumps({"multiple_choice": multiple_choice, "open_questions": open_questions})
+
+
+def scripted(*answers):
+    """A QuizStream returning ``answers`` in order, recording the prompts."""
+
+    prompts = []
+
+    async def stream(prompt):
+        prompts.append(prompt)
+        text = answers[len(prompts) - 1]
+        for start in range(0, len(text), 7):
+            yield text[start:start + 7]
+
+    return stream, prompts
+
+
+def test_parser_emits_questions_as_their_objects_close():
+    text = "```json\n" + quiz_json([MCQ, MCQ], [OPEN]) + "\n```"
+    parser = QuizStreamParser()
+
+    emitted = []
+    for position, char in enumerate(text):
+        for item in parser.feed(char):
+            emitted.append((position, item))
+
+    assert [item for _, item in emitted] == [("multiple_choice", MCQ), ("multiple_choice", MCQ), ("open_questions", OPEN)]
+    # The first question is available long before the answer is complete.
+    assert emitted[0][0] < len(text) // 2
+
+
+def test_parser_ignores_braces_and_quotes_inside_strings():
+    tricky = {"question": 'Is "{x}" a set in [math]?', "answer": "Yes \\ {x} is."}
+    parser = QuizStreamParser()
+
+    assert parser.feed(quiz_json([], [tricky])) == [("open_questions", tricky)]
+
+
+def test_parser_keeps_complete_questions_of_a_truncated_answer():
+    text = quiz_json([MCQ, MCQ], [OPEN])
+    parser = QuizStreamParser()
+
+    items = parser.feed(text[: text.index(json.dumps(MCQ)) + len(json.dumps(MCQ)) + 20])
+
+    assert items == [("multiple_choice", MCQ)]
+
+
+def test_parser_returns_malformed_items_as_raw_text():
+    parser = QuizStreamParser()
+
+    items = parser.feed('{"open_questions": [{"question": "Why?", "answer": oops}]}')
+
+    assert items == [("open_questions", '{"question": "Why?", "answer": oops}')]
+
+
+def test_validate_question_rejects_unusable_questions():
+    assert quiz_generation_service.validate_question("multiple_choice", MCQ) == MCQ
+    assert quiz_generation_service.validate_question("multiple_choice", {**MCQ, "correct_index": 4}) is None
+    assert quiz_generation_service.validate_question("multiple_choice", {**MCQ, "options": ["a", "a", "b", "c"]}) is None
+    assert quiz_generation_service.validate_question("multiple_choice", {**MCQ, "options": ["a", "b"]}) is None
+    assert quiz_generation_service.validate_question("open_questions", {**OPEN, "answer": " "}) is None
+
+
+def test_generate_quiz_does_not_reask_a_valid_quiz(monkeypatch):
+    monkeypatch.setattr(settings, "quiz_mcq_count", 2)
+    monkeypatch.setattr(settings, "quiz_open_count", 1)
+    stream, prompts = scripted(quiz_json([MCQ, MCQ], [OPEN]))
+
+    quiz = asyncio.run(quiz_generation_service.generate_quiz("Python article", stream))
+
+    assert quiz == {"multiple_choice": [MCQ, MCQ], "open_questions": [OPEN]}
+    assert len(prompts) == 1
+
+
+def test_generate_quiz_reasks_only_invalid_questions(monkeypatch):
+    monkeypatch.setattr(settings, "quiz_mcq_count", 2)
+    monkeypatch.setattr(settings, "quiz_open_count", 1)
+    broken = {**MCQ, "question": "Broken?", "correct_index": 7}
+    replacement = {**MCQ, "question": "When was Python released?"}
+    stream, prompts = scripted(quiz_json([MCQ, broken], [OPEN]), quiz_json([replacement], []))
+
+    quiz = asyncio.run(quiz_generation_service.generate_quiz("Python article", stream))
+
+    assert quiz == {"multiple_choice": [MCQ, replacement], "open_questions": [OPEN]}
+    assert len(prompts) == 2
+    reask = prompts[1][1]
+    assert "exactly 1 multiple-choice questions and 0 open questions" in reask
+    assert "Broken?" in reask
+    assert "- Who created Python?" in reask
+
+
+def test_generate_quiz_gives_up_after_max_reasks(monkeypatch):
+    monkeypatch.setattr(settings, "quiz_mcq_count", 1)
+    monkeypatch.setattr(settings, "quiz_open_count", 1)
+    monkeypatch.setattr(settings, "quiz_max_reasks", 1)
+    stream, prompts = scripted(quiz_json([], [OPEN]), "not json at all")
+
+    quiz = asyncio.run(quiz_generation_service.generate_quiz("Python article", stream))
+
+    assert quiz == {"multiple_choice": [], "open_questions": [OPEN]}
+    assert len(prompts) == 2
@@ -0,0 +1,179 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import LLMRateLimitError, RateLimiter
+
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class UpstreamError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(rate_limit, "_sleep", fake_sleep)
+    return delays
+
+
+def test_requests_beyond_rpm_wait_for_their_slot():
+    clock = FakeClock()
+    limiter = RateLimiter("test", requests_per_minute=2, tokens_per_minute=10000, clock=clock)
+
+    assert limiter.reserve(10, deadline=clock.now + 60) == 0
+    assert limiter.reserve(10, deadline=clock.now + 60) == 0
+    assert limiter.reserve(10, deadline=clock.now + 60) == pytest.approx(30)
+    # Reservations queue up behind each other.
+    assert limiter.reserve(10, deadline=clock.now + 120) == pytest.approx(60)
+
+
+def test_token_budget_is_shared_and_settled():
+    clock = FakeClock()
+    limiter = RateLimiter("test", requests_per_minute=100, tokens_per_minute=1200, clock=clock)
+
+    assert limiter.reserve(1000, deadline=clock.now) == 0
+    assert limiter.reserve(400, deadline=clock.now + 60) == pytest.approx(10)  # 200 missing at 20/s
+
+    # The first call used far fewer tokens than reserved.
+    limiter.settle(1000, 200)
+    assert limiter.reserve(400, deadline=clock.now) == 0
+
+
+def test_reservation_past_deadline_is_rejected_without_reserving():
+    clock = FakeClock()
+    limiter = RateLimiter("test", requests_per_minute=1, tokens_per_minute=10000, clock=clock)
+    limiter.reserve(1, deadline=clock.now)
+
+    with pytest.raises(LLMRateLimitError) as exc_info:
+        limiter.reserve(1, deadline=clock.now + 5)
+
+    assert exc_info.value.retry_after == pytest.approx(60)
+    assert limiter.stats()["rejected"] == 1
+    clock.now += 60
+    assert limiter.reserve(1, deadline=clock.now) == 0
+
+
+def test_waiting_callers_are_counted_as_queued(monkeypatch):
+    limiter = RateLimiter("test", requests_per_minute=1, tokens_per_minute=10000)
+    observed = []
+
+    async def fake_sleep(delay):
+        observed.append((round(delay), limiter.queued))
+
+    monkeypatch.setattr(rate_limit, "_sleep", fake_sleep)
+
+    async def run():
+        await limiter.acquire(1, deadline=float("inf"))
+        await limiter.acquire(1, deadline=float("inf"))
+
+    asyncio.run(run())
+
+    assert observed == [(60, 1)]
+    stats = limiter.stats()
+    assert stats["queued"] == 0
+    assert stats["throttled"] == 1
+    assert stats["throttle_seconds"] == pytest.approx(60, abs=0.1)
+
+
+def test_caller_cancelled_while_waiting_gives_its_slot_back():
+    clock = FakeClock()
+    limiter = RateLimiter("test", requests_per_minute=1, tokens_per_minute=1000, clock=clock)
+    limiter.reserve(500, deadline=clock.now)
+
+    async def run():
+        waiting = asyncio.ensure_future(limiter.acquire(500, deadline=float("inf")))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(run())
+
+    # Only the first reservation still holds capacity
+    assert limiter.reserve(500, deadline=clock.now + 60) == pytest.approx(60)
+    assert limiter.stats()["queued"] == 0
+
+
+def test_call_retries_and_honors_retry_after(sleeps):
+    limiter = rate_limit.get_limiter("fake", "model", 100, 100000)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise UpstreamError(429, retry_after="3")
+        if len(attempts) == 2:
+            raise UpstreamError(503)
+        return "ok"
+
+    assert asyncio.run(rate_limit.call(limiter, 10, flaky)) == "ok"
+
+    assert len(attempts) == 3
+    assert sleeps[0] >= 3  # never earlier than Retry-After
+    stats = limiter.stats()
+    assert stats["retries"] == 2
+    assert stats["upstream_throttled"] == 1
+
+
+def test_call_does_not_retry_client_errors(sleeps):
+    limiter = rate_limit.get_limiter("fake", "model", 100, 100000)
+
+    async def bad_request():
+        raise UpstreamError(400)
+
+    with pytest.raises(UpstreamError):
+        asyncio.run(rate_limit.call(limiter, 10, bad_request))
+    assert sleeps == []
+
+
+def test_persistent_throttling_becomes_rate_limit_error(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "llm_retry_max_attempts", 2)
+    limiter = rate_limit.get_limiter("fake", "model", 100, 100000)
+
+    async def throttled():
+        raise UpstreamError(429, retry_after="7")
+
+    with pytest.raises(LLMRateLimitError) as exc_info:
+        asyncio.run(rate_limit.call(limiter, 10, throttled))
+
+    assert exc_info.value.retry_after == 7
+
+
+def test_rate_limit_error_maps_to_429_with_retry_after():
+    with patch(
+        "app.services.pipeline_service.summarize_url",
+        side_effect=LLMRateLimitError("groq:llama is rate limiting requests", 7.2),
+    ):
+        response = client.post(
+            "/api/v1/articles/summary/url",
+            json={"url": "https://en.wikipedia.org/wiki/Python_(programming_language)"},
+        )
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "8"
+    assert response.json()["detail"] == "groq:llama is rate limiting requests"
@@ -0,0 +1,137 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.api.v1.routes_auth import get_current_active_user, get_db
+from app.core.config import settings
+from app.models.base import Base
+from app.models.user import Role, User
+from app.services import search_service, wikipedia_dump_service
+from tests.test_pdf_ingestion import make_pdf
+
+
+client = TestClient(app)
+
+PYTHON = {
+    "title": "Python (programming language)",
+    "url": "https://en.wikipedia.org/wiki/Python_(programming_language)",
+    "sections": {
+        "Introduction": "Python is a high-level programming language.",
+        "History": "Guido van Rossum began working on Python in the late 1980s.",
+    },
+    "cleaned": True,
+}
+
+
+@pytest.fixture
+def search_env(tmp_path, monkeypatch):
+    """Temp search index, content store and database, authenticated user."""
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    mock_user = MagicMock(spec=User)
+    mock_user.id = 1
+    mock_user.role = Role.USER
+
+    async def override_get_current_user():
+        return mock_user
+
+    index_path = str(tmp_path / "search.sqlite3")
+    monkeypatch.setattr(settings, "search_index_path", index_path)
+    monkeypatch.setattr(settings, "processed_content_dir", str(tmp_path / "processed"))
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = override_get_current_user
+    yield index_path
+    search_service.close()
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def _search(q, **params):
+    response = client.get("/api/v1/articles/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_ingested_article_is_searchable_with_snippet(search_env):
+    with patch("app.services.wikipedia_service.fetch_article_sections", AsyncMock(return_value=PYTHON)):
+        client.post("/api/v1/articles/ingest/url", json={"url": PYTHON["url"]})
+        # Re-ingesting a URL replaces its document
+        response = client.post("/api/v1/articles/ingest/url", json={"url": PYTHON["url"]})
+
+    assert response.status_code == 200
+    article = response.json()
+    assert (article["action"], article["title"]) == ("INGEST", PYTHON["title"])
+
+    results = _search("rossum")
+    assert len(results) == 1
+    assert results[0]["article_id"] == article["id"]
+    assert results[0]["url"] == PYTHON["url"]
+    assert "<mark>Rossum</mark>" in results[0]["snippet"]
+    assert search_service.get_index().count() == 1
+
+
+def test_ranking_prefixes_and_operator_input(search_env):
+    index = search_service.get_index()
+    index.add_many(
+        [
+            ("https://example.org/snakes", "Snakes", "Pythons are large snakes found in Africa and Asia.", None),
+            ("https://example.org/python", "Python", "A programming language.", 1),
+            ("https://example.org/monty", "Monty Python", "A comedy group; one sketch mentions a python.", 2),
+        ]
+    )
+
+    assert [result["title"] for result in _search("python")][:2] == ["Python", "Monty Python"]
+    assert {result["title"] for result in _search("large sna")} == {"Snakes"}
+    # FTS5 syntax in user input is matched as plain words, never parsed
+    assert _search('python" OR NEAR(') == []
+    assert _search("!!!") == []
+    assert len(_search("python", limit=1)) == 1
+
+
+def test_dump_import_builds_search_index(tmp_path, search_env):
+    dump = tmp_path / "articles.jsonl"
+    records = [
+        {"title": "Alpha", "text": "Alpha is the first letter.\n\n== Usage ==\nUsed in mathematics."},
+        {"title": "Beta", "text": "Beta is the second letter."},
+    ]
+    dump.write_text("\n".join(json.dumps(record) for record in records))
+
+    wikipedia_dump_service.import_dump(str(dump), str(tmp_path / "store"), index_path=search_env)
+
+    results = _search("mathematics")
+    assert [(result["title"], result["article_id"]) for result in results] == [("Alpha", None)]
+    # Headings are not part of the indexed text
+    assert _search("usage") == []
+
+
+def test_search_requires_login(search_env):
+    app.dependency_overrides.pop(get_current_active_user)
+    assert client.get("/api/v1/articles/search", params={"q": "python"}).status_code == 401
+
+
+def test_pdf_uploads_are_not_searchable(search_env):
+    response = client.post(
+        "/api/v1/articles/ingest/pdf",
+        files={"file": ("notes.pdf", make_pdf(["Confidential grading rubric"]), "application/pdf")},
+    )
+    assert response.status_code == 200
+    # An upload indexed by an earlier version
+    search_service.get_index().add_many([("upload://old.pdf", "Old", "Confidential salaries", 9)])
+
+    assert _search("confidential") == []
@@ -0,0 +1,98 @@
+import re
+
+from app.services import section_service
+
+
+ARTICLE = """World War II was a global conflict.[1] It lasted
+from 1939 to 1945.
+
+== Background ==
+Tensions rose in Europe.[2][3]
+
+=== Europe ===
+Germany   rearmed.
+
+==== Rhineland ====
+Remilitarised in 1936.
+
+=== Asia ===
+Japan invaded Manchuria.
+
+== Course of the war ==
+The war began in 1939.
+
+== Notes ==
+
+=== Notes ===
+Nested duplicate title.
+"""
+
+
+def _legacy_clean(text):
+    return re.sub(r"\s+", " ", re.sub(r"\[\d+\]", "", text)).strip()
+
+
+def test_all_heading_levels_start_sections():
+    parsed = section_service.parse_sections(ARTICLE)
+
+    assert [(section.title, section.level) for section in parsed.sections] == [
+        ("Introduction", 1),
+        ("Background", 2),
+        ("Europe", 3),
+        ("Rhineland", 4),
+        ("Asia", 3),
+        ("Course of the war", 2),
+        ("Notes", 2),
+        ("Notes", 3),
+    ]
+
+
+def test_top_level_sections_are_not_merged():
+    sections = section_service.parse_sections(ARTICLE).to_dict()
+
+    assert sections["Background"] == "Tensions rose in Europe."
+    assert sections["Course of the war"] == "The war began in 1939."
+    assert "Background" not in sections["Introduction"]
+
+
+def test_section_tree_follows_heading_levels():
+    root = section_service.parse_sections(ARTICLE).root
+
+    assert [child.title for child in root.children] == ["Introduction", "Background", "Course of the war", "Notes"]
+    background = root.children[1]
+    assert [child.title for child in background.children] == ["Europe", "Asia"]
+    assert [child.title for child in background.children[0].children] == ["Rhineland"]
+
+
+def test_sections_keep_offsets_into_source():
+    parsed = section_service.parse_sections(ARTICLE, clean=False)
+    europe = parsed.sections[2]
+
+    assert europe.cleaned is None
+    assert ARTICLE[europe.start:europe.end].strip() == "Germany   rearmed."
+    assert parsed.body(europe) == "Germany   rearmed."
+
+
+def test_cleaning_matches_legacy_two_pass_cleaning():
+    parsed = section_service.parse_sections(ARTICLE)
+
+    for section in parsed.sections:
+        assert section.cleaned == _legacy_clean(parsed.body(section))
+    assert parsed.sections[0].cleaned == "World War II was a global conflict. It lasted from 1939 to 1945."
+
+
+def test_clean_text_drops_references_without_leaving_gaps():
+    assert section_service.clean_text("Paris[1]. Lyon [2] [3] and\n\nNice[4]") == "Paris. Lyon and Nice"
+
+
+def test_repeated_titles_are_kept_apart():
+    sections = section_service.parse_sections(ARTICLE).to_dict()
+
+    assert sections["Notes"] == ""
+    assert sections["Notes (2)"] == "Nested duplicate title."
+
+
+def test_article_starting_with_heading_has_empty_introduction():
+    sections = section_service.parse_sections("== Only ==\nBody text.").to_dict()
+
+    assert sections == {"Introduction": "", "Only": "Body text."}
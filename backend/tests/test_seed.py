@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.security import get_password_hash, verify_password
+from app.factories import BulkSizes, seed_bulk
+from app.factories.bulk_data import DEFAULT_PASSWORD
+from app.models.article import Article, article_key
+from app.models.base import Base
+from app.models.quiz_attempt import QuizAttempt
+from app.models.stat_counter import StatCounter
+from app.models.user import User
+
+
+END = datetime(2024, 6, 1)
+SIZES = BulkSizes(users=50, articles=20, attempts=500, days=30)
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    return get_password_hash(DEFAULT_PASSWORD)
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def make(name="seed"):
+        engine = create_engine(f"sqlite:///{tmp_path / f'{name}.sqlite3'}")
+        Base.metadata.create_all(bind=engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+def _seed(engine, password_hash, sizes=SIZES, seed=0):
+    with engine.begin() as connection:
+        return seed_bulk(connection, sizes, password_hash, seed=seed, end=END, batch_size=64)
+
+
+def _attempts(engine):
+    with engine.connect() as connection:
+        return connection.execute(
+            select(QuizAttempt.userid, QuizAttempt.articleid, QuizAttempt.score, QuizAttempt.submittedat).order_by(
+                QuizAttempt.id
+            )
+        ).all()
+
+
+def test_generated_rows_are_valid_and_counted(make_engine, password_hash):
+    engine = make_engine()
+
+    result = _seed(engine, password_hash)
+
+    assert (result["users"], result["articles"], result["attempts"]) == (50, 20, 500)
+    db = sessionmaker(bind=engine)()
+    user = db.execute(select(User).where(User.username == "user7")).scalar_one()
+    assert verify_password(DEFAULT_PASSWORD, user.hashed_password)
+    article = db.get(Article, 3)
+    assert article.articlekey == article_key(article.url)
+    low, high = db.execute(select(func.min(QuizAttempt.submittedat), func.max(QuizAttempt.submittedat))).one()
+    assert datetime(2024, 5, 2) <= low and high <= END
+    assert db.execute(select(func.count()).where(QuizAttempt.gradedat.is_(None))).scalar() == 0
+    counters = dict(db.execute(select(StatCounter.name, StatCounter.count).where(StatCounter.key == "")).all())
+    assert (counters["users"], counters["articles"], counters["attempts"]) == (50, 20, 500)
+    db.close()
+
+
+def test_same_seed_reproduces_the_dataset(make_engine, password_hash):
+    first, second, other = make_engine("first"), make_engine("second"), make_engine("other")
+    _seed(first, password_hash, seed=7)
+    _seed(second, password_hash, seed=7)
+    _seed(other, password_hash, seed=8)
+
+    assert _attempts(first) == _attempts(second)
+    assert _attempts(first) != _attempts(other)
+
+
+def test_runs_append_and_reuse_existing_rows(make_engine, password_hash):
+    engine = make_engine()
+    _seed(engine, password_hash)
+
+    result = _seed(engine, password_hash, sizes=BulkSizes(users=10, attempts=100, days=30))
+
+    assert (result["users"], result["articles"], result["attempts"]) == (10, 0, 100)
+    with engine.connect() as connection:
+        assert connection.execute(select(func.max(User.id))).scalar() == 60
+        # New attempts are spread over the existing articles
+        assert connection.execute(select(func.max(QuizAttempt.articleid))).scalar() <= 20
+
+
+def test_seed_endpoint_is_gone():
+    assert TestClient(app).get("/seed").status_code == 404
@@ -0,0 +1,178 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.api.v1.routes_auth import get_current_admin, get_db
+from app.core.config import settings
+from app.models.article import Article
+from app.models.base import Base
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.stat_counter import StatCounter
+from app.models.user import Role, User
+from app.services import llm_router_service, stats_service
+from app.services.llm_fake_service import FakeProvider
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def stats_db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.sqlite3'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(stats_service, "SessionLocal", factory)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_current_admin():
+        return User(id=1, username="admin", email="admin@example.com", hashed_password="x", role=Role.ADMIN)
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin] = override_get_current_admin
+    stats_service.clear_cache()
+    yield engine, factory
+    stats_service.clear_cache()
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_current_admin, None)
+    engine.dispose()
+
+
+def _populate(db):
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x") for i in range(3)]
+    articles = [Article(url=f"https://en.wikipedia.org/wiki/Topic_{i}", title=f"Topic {i}", action="QUIZ") for i in range(2)]
+    db.add_all(users + articles)
+    db.flush()
+    db.add(Quiz(articleid=articles[0].id, questions={}, answerkey=b"", opencount=0, digest="x"))
+    db.add_all(
+        [
+            QuizAttempt(userid=users[0].id, articleid=articles[0].id, score=80.0, submittedat=datetime(2024, 5, 1, 9)),
+            QuizAttempt(userid=users[1].id, articleid=articles[0].id, score=60.0, submittedat=datetime(2024, 5, 1, 17)),
+            QuizAttempt(userid=users[2].id, articleid=articles[1].id, score=90.0, submittedat=datetime(2024, 5, 2, 8)),
+        ]
+    )
+    db.commit()
+    return [article.id for article in articles]
+
+
+def _stats():
+    response = client.get("/api/v1/admin/stats")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stats_come_from_counters_kept_on_insert(stats_db, monkeypatch):
+    _, factory = stats_db
+    monkeypatch.setattr(settings, "admin_stats_days", 100000)
+    db = factory()
+    article_ids = _populate(db)
+    db.close()
+
+    stats = _stats()
+
+    assert stats["total_users"] == 3
+    assert stats["total_articles"] == 2
+    assert stats["total_quizzes_generated"] == 1
+    assert stats["total_quiz_attempts"] == 3
+    assert stats["average_score"] == pytest.approx(76.67)
+    assert stats["attempts_per_day"] == [
+        {"day": "2024-05-01", "attempts": 2, "average_score": 70.0},
+        {"day": "2024-05-02", "attempts": 1, "average_score": 90.0},
+    ]
+    assert stats["article_scores"] == [
+        {"article_id": article_ids[0], "attempts": 2, "average_score": 70.0},
+        {"article_id": article_ids[1], "attempts": 1, "average_score": 90.0},
+    ]
+
+
+def test_reading_stats_does_not_scan_counted_tables(stats_db):
+    engine, factory = stats_db
+    db = factory()
+    _populate(db)
+    db.close()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    _stats()
+
+    assert statements
+    assert all("statcounters" in statement for statement in statements)
+
+
+def test_rolled_back_and_rescored_rows_keep_counters_exact(stats_db):
+    _, factory = stats_db
+    db = factory()
+    article_ids = _populate(db)
+    db.add(User(username="ghost", email="ghost@example.com", hashed_password="x"))
+    db.flush()
+    db.rollback()
+
+    attempt = db.query(QuizAttempt).filter(QuizAttempt.score == 60.0).one()
+    attempt.score = 70.0  # graded open answers raise the score
+    db.commit()
+    db.delete(db.query(QuizAttempt).filter(QuizAttempt.score == 90.0).one())
+    db.commit()
+    db.close()
+
+    stats = _stats()
+
+    assert stats["total_users"] == 3
+    assert stats["total_quiz_attempts"] == 2
+    assert stats["article_scores"] == [{"article_id": article_ids[0], "attempts": 2, "average_score": 75.0}]
+
+
+def test_responses_are_cached_briefly(stats_db):
+    _, factory = stats_db
+    first = _stats()
+    db = factory()
+    db.add(User(username="late", email="late@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+
+    assert _stats() == first
+    stats_service.clear_cache()
+    assert _stats()["total_users"] == first["total_users"] + 1
+
+
+def test_llm_calls_are_counted_per_operation_and_day(stats_db, monkeypatch):
+    llm_router_service.register_provider("local", FakeProvider("local"))
+    monkeypatch.setattr(settings, "llm_route_summary", ["local"])
+    monkeypatch.setattr(settings, "llm_route_quiz", ["local"])
+
+    async def run():
+        await llm_router_service.summarize_article("Python is a language.")
+        await llm_router_service.summarize_article("Python is a language.")
+        await llm_router_service.generate_quiz("Python is a language.")
+
+    asyncio.run(run())
+
+    calls = _stats()["llm_calls"]
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    assert calls == {"quiz": [{"day": today, "count": 1}], "summary": [{"day": today, "count": 2}]}
+
+
+def test_rebuild_recomputes_counters_from_tables(stats_db):
+    _, factory = stats_db
+    db = factory()
+    _populate(db)
+    before = {(c.name, c.key): (c.count, c.total) for c in db.query(StatCounter)}
+    db.query(StatCounter).delete()
+    db.commit()
+    db.close()
+
+    stats_service.rebuild_counters()
+
+    db = factory()
+    assert {(c.name, c.key): (c.count, c.total) for c in db.query(StatCounter)} == before
+    db.close()
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.config import settings
+from app.services import chunking_service, llm_groq_service, token_service
+
+
+LLAMA = "llama-3.1-8b-instant"
+
+ENGLISH = "The history of the city goes back to Roman times. " * 20
+ARABIC = "يعود تاريخ المدينة إلى العصر الروماني. " * 20
+CHINESE = "这座城市的历史可以追溯到罗马时代。" * 20
+
+
+@pytest.fixture(autouse=True)
+def fresh_calibration():
+    token_service.reset()
+    yield
+    token_service.reset()
+
+
+def test_non_latin_scripts_cost_more_tokens_per_character():
+    def per_char(text):
+        return token_service.estimate_tokens(text, LLAMA) / len(text)
+
+    assert per_char(ENGLISH) == pytest.approx(0.25, abs=0.01)
+    assert per_char(ENGLISH) < per_char(ARABIC) < per_char(CHINESE)
+
+
+def test_truncate_fits_budget_on_a_word_boundary():
+    truncated = token_service.truncate(ENGLISH, 100, LLAMA)
+
+    assert token_service.estimate_tokens(truncated, LLAMA) <= 100
+    assert len(truncated) > 350  # close to the budget, not a blunt cut
+    assert ENGLISH.startswith(truncated)
+    assert ENGLISH[len(truncated)] == " "
+
+
+def test_same_budget_packs_more_latin_than_cjk_text():
+    english = token_service.truncate(ENGLISH, 100, LLAMA)
+    chinese = token_service.truncate(CHINESE, 100, LLAMA)
+
+    assert len(english) > 3 * len(chinese)
+    assert token_service.estimate_tokens(chinese, LLAMA) <= 100
+
+
+def test_reported_usage_calibrates_estimates():
+    estimated = token_service.estimate_tokens(ENGLISH, LLAMA)
+
+    for _ in range(20):
+        token_service.record_usage(LLAMA, token_service.estimate_tokens(ENGLISH, LLAMA), actual_input=2 * estimated)
+
+    assert token_service.estimate_tokens(ENGLISH, LLAMA) == pytest.approx(2 * estimated, rel=0.05)
+    stats = token_service.get_stats()[LLAMA]
+    assert stats["calls"] == 20
+    assert stats["actual_input_tokens"] == 40 * estimated
+    assert stats["correction"] == pytest.approx(2.0, rel=0.05)
+
+
+def test_chunking_by_tokens_keeps_chunks_within_budget():
+    def size(text):
+        return token_service.estimate_tokens(text, LLAMA)
+
+    chunks = chunking_service.chunk_sections([ENGLISH, CHINESE, ARABIC], 200, size=size)
+
+    assert all(size(chunk) <= 200 for chunk in chunks)
+    assert "".join(chunks).replace("\n\n", "").replace(" ", "") == (ENGLISH + CHINESE + ARABIC).replace(" ", "")
+
+
+def test_groq_summary_uses_token_budget_and_records_usage(monkeypatch):
+    monkeypatch.setattr(settings, "groq_max_input_tokens", 50)
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="A summary."))],
+        usage=SimpleNamespace(prompt_tokens=120, completion_tokens=7),
+    )
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=completion)
+    monkeypatch.setattr(llm_groq_service, "_get_client", lambda: client)
+    expected_content = token_service.truncate(ENGLISH, 50, settings.groq_model_name)
+
+    result = asyncio.run(llm_groq_service.summarize_article(ENGLISH, length="short"))
+
+    assert result["summary"] == "A summary."
+    prompt = client.chat.completions.create.await_args.kwargs["messages"][1]["content"]
+    assert prompt.endswith("Article content:\n" + expected_content)
+    stats = token_service.get_stats()[settings.groq_model_name]
+    assert stats["calls"] == 1
+    assert stats["actual_input_tokens"] == 120
+    assert stats["output_tokens"] == 7
+    assert stats["estimated_input_tokens"] > 50  # prompt instructions included
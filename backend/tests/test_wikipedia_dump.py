@@ -0,0 +1,134 @@
+import asyncio
+import bz2
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.services import article_store_service, wikipedia_dump_service, wikipedia_service
+
+
+WIKITEXT = """{{Short description|Programming language}}
+{{Infobox programming language
+| name = Python
+| designer = {{plainlist|Guido van Rossum}}
+}}
+'''Python''' is a [[high-level programming language|high-level]], [[Interpreted language|interpreted]] language.<ref name="faq">{{cite web|url=https://docs.python.org}}</ref>
+Its design emphasizes [[code readability]].<ref name="zen" /> See [https://www.python.org the website].
+[[File:Python logo.svg|thumb|The [[Python logo]]]]
+
+== History ==
+Python was conceived in the late 1980s<!-- need source --> by &quot;Guido&quot;.
+{| class="wikitable"
+|-
+| 1991 || 0.9.0
+|}
+* Released in [[1991]]
+=== Versions ===
+Python 3.0 was released in 2008.
+
+[[Category:Programming languages]]
+[[fr:Python (langage)]]
+"""
+
+XML_DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" version="0.10">
+  <siteinfo><base>https://en.wikipedia.org/wiki/Main_Page</base></siteinfo>
+  <page>
+    <title>Python (programming language)</title><ns>0</ns><id>23862</id>
+    <revision><id>1200</id><text xml:space="preserve">{text}</text></revision>
+  </page>
+  <page>
+    <title>Python language</title><ns>0</ns><id>2</id>
+    <redirect title="Python (programming language)" />
+    <revision><id>7</id><text>#REDIRECT [[Python (programming language)]]</text></revision>
+  </page>
+  <page>
+    <title>Talk:Python</title><ns>1</ns><id>3</id>
+    <revision><id>8</id><text>Discussion</text></revision>
+  </page>
+</mediawiki>
+"""
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    path = str(tmp_path / "store")
+    monkeypatch.setattr(settings, "article_store_path", path)
+    yield path
+    article_store_service.close()
+
+
+def _write_xml_dump(tmp_path):
+    dump = tmp_path / "dump.xml.bz2"
+    escaped = WIKITEXT.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    dump.write_bytes(bz2.compress(XML_DUMP.format(text=escaped).encode("utf-8")))
+    return str(dump)
+
+
+def test_strip_markup_keeps_prose_and_headings():
+    text = wikipedia_dump_service.strip_markup(WIKITEXT)
+
+    assert text.startswith("Python is a high-level, interpreted language.")
+    assert "Its design emphasizes code readability. See the website." in text
+    assert "== History ==" in text
+    assert "=== Versions ===" in text
+    assert 'conceived in the late 1980s by "Guido".' in text
+    assert "Released in 1991" in text
+    for leftover in ("{{", "}}", "[[", "<ref", "wikitable", "Category", "Python logo", "langage", "need source"):
+        assert leftover not in text
+
+
+def test_import_xml_dump_and_serve_sections_from_store(tmp_path, store):
+    result = wikipedia_dump_service.import_dump(_write_xml_dump(tmp_path), store)
+
+    assert (result["pages"], result["redirects"]) == (1, 1)
+    with patch("app.services.wikipedia_service._download_page") as download:
+        article = asyncio.run(wikipedia_service.fetch_article_sections_by_title("python_(programming_language)"))
+        via_redirect = asyncio.run(wikipedia_service.get_page("Python language"))
+
+    download.assert_not_called()
+    assert article["url"] == "https://en.wikipedia.org/wiki/Python_(programming_language)"
+    assert article["sections"]["Versions"] == "Python 3.0 was released in 2008."
+    assert via_redirect.title == "Python (programming language)"
+    assert via_redirect.revision_id == 1200
+    assert asyncio.run(article_store_service.get("Talk:Python")) is None
+
+
+def test_import_jsonl_dump(tmp_path, store):
+    dump = tmp_path / "articles.jsonl.bz2"
+    records = [
+        {"title": "Plain", "text": "Already plain text.", "revision_id": 5},
+        {"title": "Marked up", "wikitext": "'''Bold''' [[link|text]]."},
+        {"title": "Empty", "text": ""},
+    ]
+    dump.write_bytes(bz2.compress("\n".join(json.dumps(record) for record in records).encode("utf-8")))
+
+    result = wikipedia_dump_service.import_dump(str(dump), store)
+
+    assert (result["pages"], result["skipped"]) == (2, 1)
+    plain = asyncio.run(article_store_service.get("Plain"))
+    assert (plain.content, plain.revision_id) == ("Already plain text.", 5)
+    assert asyncio.run(article_store_service.get("Marked up")).content == "Bold text."
+
+
+def test_reimport_points_index_at_new_copy(tmp_path, store):
+    with article_store_service.ArticleStoreWriter(store) as writer:
+        writer.add("Topic", "https://en.wikipedia.org/wiki/Topic", 1, "Old text.")
+    with article_store_service.ArticleStoreWriter(store) as writer:
+        writer.add("Topic", "https://en.wikipedia.org/wiki/Topic", 2, "New text.")
+
+    page = asyncio.run(article_store_service.get("Topic"))
+
+    assert (page.revision_id, page.content) == (2, "New text.")
+
+
+def test_missing_title_fails_fast_without_live_fallback(tmp_path, store, monkeypatch):
+    wikipedia_dump_service.import_dump(_write_xml_dump(tmp_path), store)
+    monkeypatch.setattr(settings, "wikipedia_live_fallback", False)
+
+    with patch("app.services.wikipedia_service._download_page") as download:
+        with pytest.raises(LookupError):
+            asyncio.run(wikipedia_service.get_page("Not imported"))
+
+    download.assert_not_called()
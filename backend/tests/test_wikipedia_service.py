@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.services import article_cache_service, wikipedia_service
+from app.services.article_cache_service import CachedPage
+
+
+@pytest.fixture(autouse=True)
+def clear_article_cache():
+    article_cache_service.clear()
+    yield
+    article_cache_service.clear()
+
+
+@pytest.fixture
+def mock_page():
+    return CachedPage(
+        title="Python (programming language)",
+        url="https://en.wikipedia.org/wiki/Python_(programming_language)",
+        revision_id=123,
+        content="Python is a language.\n=== History ===\nCreated in 1991.",
+        fetched_at=time.time(),
+    )
+
+
+def test_normalize_title():
+    assert article_cache_service.normalize_title("python_(programming%20language)") == "Python (programming language)"
+    assert article_cache_service.normalize_title("  machine   learning ") == "Machine learning"
+
+
+@patch("app.services.wikipedia_service._download_page")
+def test_fetch_article_sections_uses_memory_cache(mock_wiki_page, mock_page):
+    mock_wiki_page.return_value = mock_page
+
+    async def fetch_twice():
+        first = await wikipedia_service.fetch_article_sections("https://en.wikipedia.org/wiki/Python_(programming_language)")
+        second = await wikipedia_service.fetch_article_sections_by_title("Python (programming language)")
+        return first, second
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first == second
+    assert first["sections"]["History"] == "Created in 1991."
+    mock_wiki_page.assert_called_once()
+    assert article_cache_service.get_stats()["memory"]["hits"] >= 1
+
+
+@patch("app.services.wikipedia_service._download_page")
+def test_concurrent_fetches_are_deduplicated(mock_wiki_page, mock_page):
+    async def slow_page(title):
+        await asyncio.sleep(0.05)
+        return mock_page
+
+    mock_wiki_page.side_effect = slow_page
+
+    async def fetch_concurrently():
+        return await asyncio.gather(
+            *(wikipedia_service.get_page("Python (programming language)") for _ in range(5))
+        )
+
+    pages = asyncio.run(fetch_concurrently())
+
+    assert all(page is mock_page for page in pages)
+    mock_wiki_page.assert_called_once()
+
+
+@patch("app.services.wikipedia_service._download_page")
+def test_failed_fetch_propagates_to_waiters(mock_wiki_page):
+    async def missing_page(title):
+        await asyncio.sleep(0.01)
+        raise LookupError(f"Wikipedia page not found: {title}")
+
+    mock_wiki_page.side_effect = missing_page
+
+    async def fetch_concurrently():
+        return await asyncio.gather(
+            *(wikipedia_service.get_page("Nope") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(fetch_concurrently())
+
+    assert all(isinstance(result, LookupError) for result in results)
+    mock_wiki_page.assert_called_once()
+
+
+def test_persistent_store_survives_memory_eviction(tmp_path):
+    store = article_cache_service._PersistentStore(str(tmp_path / "pages.sqlite3"), ttl=60, max_entries=2)
+
+    async def fill_and_read():
+        for revision, title in enumerate(["Alpha", "Beta", "Gamma"]):
+            page = CachedPage(title=title, url=f"https://x/{title}", revision_id=revision, content=title * 3, fetched_at=time.time() + revision)
+            await article_cache_service.put(title, page)
+
+        article_cache_service._memory.clear()
+        return await article_cache_service.get("Gamma"), await article_cache_service.get("Alpha")
+
+    with patch.object(article_cache_service, "_store", store):
+        gamma, alpha = asyncio.run(fill_and_read())
+
+    assert gamma.content == "GammaGammaGamma"
+    assert alpha is None
+    assert store.evictions == 1
+
+
+def test_download_page_parses_mediawiki_response():
+    def handler(request):
+        assert request.url.params["titles"] == "Python (programming language)"
+        return httpx.Response(
+            200,
+            json={
+                "query": {
+                    "pages": [
+                        {
+                            "title": "Python (programming language)",
+                            "fullurl": "https://en.wikipedia.org/wiki/Python_(programming_language)",
+                            "revisions": [{"revid": 42}],
+                            "extract": "Python is a language.",
+                        }
+                    ]
+                }
+            },
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch.object(wikipedia_service, "_client", client):
+        page = asyncio.run(wikipedia_service._download_page("Python (programming language)"))
+
+    assert page.revision_id == 42
+    assert page.content == "Python is a language."